@@ -1,18 +1,28 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
+from typing import Any, Dict
 from jose import jwt, JWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from loguru import logger
+from app.core.cache import LRUCache
 from app.core.config import config
+from app.core.utils import get_redis_client
 
 
 security = HTTPBearer()
 
+# Verified token payloads keyed by token digest; each entry expires at the token's exp
+_verified_tokens = LRUCache(config.AUTH_CACHE_MAX_ITEMS, ttl=0)
+
 
 def create_access_token(data: dict):
     """Generate JWT access token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})  # jti: handle for the denylist
     encoded_jwt = jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
     return encoded_jwt
 
@@ -29,11 +39,68 @@ def verify_token(token: str):
         )
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+# -----------------------
+# Denylist (optional revocation of access tokens)
+# -----------------------
+def denylist_key(jti: str) -> str:
+    return f"jwt_denylist:{jti}"
+
+
+async def revoke_access_token(payload: Dict[str, Any]) -> None:
+    """Deny a token until it would have expired anyway (no-op without a jti or denylist)."""
+    jti = payload.get("jti")
+    if not config.AUTH_DENYLIST_ENABLED or not jti:
+        return
+    remaining = int(payload["exp"] - time.time())
+    if remaining <= 0:
+        return
+    try:
+        redis_client = await get_redis_client()
+        await redis_client.setex(denylist_key(jti), remaining, 1)
+    except Exception as e:
+        logger.warning(f"Failed to deny token {jti}: {e}")
+
+
+async def _is_denied(payload: Dict[str, Any]) -> bool:
+    jti = payload.get("jti")
+    if not config.AUTH_DENYLIST_ENABLED or not jti:
+        return False
+    try:
+        redis_client = await get_redis_client()
+        return bool(await redis_client.exists(denylist_key(jti)))
+    except Exception as e:
+        # Fail open: an unreachable denylist shouldn't lock every user out
+        logger.warning(f"Token denylist check failed: {e}")
+        return False
+
+
+# -----------------------
+# Shared auth dependency
+# -----------------------
+def _verify_cached(token: str) -> Dict[str, Any]:
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = _verified_tokens.get(digest)
+    if payload is None:
+        payload = verify_token(token)
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            _verified_tokens.set(digest, payload, ttl=ttl)
+    return dict(payload)
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     FastAPI dependency to extract and validate the JWT token
     from Authorization header (Bearer token)
     """
-    token = credentials.credentials
-    payload = verify_token(token)
+    payload = _verify_cached(credentials.credentials)
+    if await _is_denied(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
     return payload
+
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {"denylist_enabled": config.AUTH_DENYLIST_ENABLED, **_verified_tokens.stats()}
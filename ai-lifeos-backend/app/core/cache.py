@@ -0,0 +1,475 @@
+import asyncio
+import hashlib
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from redis.exceptions import WatchError
+
+from app.core import codec
+from app.core.metrics import cache_counter
+from app.core.utils import get_redis_client
+
+
+# ---------------------------
+# Key Normalization
+# ---------------------------
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so equivalent inputs share a key."""
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
+
+
+def make_cache_key(namespace: str, text: str) -> str:
+    """Build a fixed-length Redis key from normalized text."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# ---------------------------
+# Single-flight
+# ---------------------------
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight coroutine (per worker)."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return (result, shared); shared is True when another caller started the work."""
+        call = self._calls.get(key)
+        if call is not None:
+            return await asyncio.shield(call), True
+
+        call = asyncio.ensure_future(fn())
+        self._calls[key] = call
+        call.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shield so a disconnecting caller doesn't cancel the work for everyone else
+        return await asyncio.shield(call), False
+
+
+# ---------------------------
+# Stale-while-revalidate Cache
+# ---------------------------
+class SWRCache:
+    """
+    Redis-backed result cache with stale-while-revalidate and single-flight generation.
+
+    Entries are fresh for `ttl` seconds and may be served stale for another
+    `stale_ttl` seconds while one background task refreshes them.
+    """
+
+    def __init__(self, namespace: str, ttl: int, stale_ttl: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._flight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+        self._metrics = {name: cache_counter(namespace, "redis", name) for name in self._stats}
+
+    def _count(self, name: str) -> None:
+        self._stats[name] += 1
+        self._metrics[name].inc()
+
+    async def _redis(self):
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.warning(f"Redis connection failed: {e}. Proceeding without cache.")
+            return None
+
+    async def _read(self, redis_client, key: str) -> Optional[Dict[str, Any]]:
+        if not redis_client:
+            return None
+        try:
+            cached = await redis_client.get(key)
+            return codec.loads(cached) if cached else None
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Redis cache read failed: {e}")
+            return None
+
+    async def _write(self, redis_client, key: str, value: Any) -> None:
+        if not redis_client:
+            return
+        try:
+            entry = codec.dumps({"value": value, "fresh_until": time.time() + self.ttl})
+            await redis_client.setex(key, self.ttl + self.stale_ttl, entry)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Redis cache write failed: {e}")
+
+    async def _compute_and_store(
+        self,
+        redis_client,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool],
+    ) -> Any:
+        value = await compute()
+        if should_cache(value):
+            await self._write(redis_client, key, value)
+        return value
+
+    def _refresh_in_background(self, redis_client, key: str, compute, should_cache) -> None:
+        if self._flight.in_flight(key):
+            return
+
+        async def refresh():
+            try:
+                await self._flight.do(key, lambda: self._compute_and_store(redis_client, key, compute, should_cache))
+                self._count("refreshes")
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Background refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return the cached value for `text`, computing it at most once per worker on a miss."""
+        key = make_cache_key(self.namespace, text)
+        redis_client = await self._redis()
+
+        entry = await self._read(redis_client, key)
+        if entry is not None:
+            if time.time() < entry["fresh_until"]:
+                self._count("hits")
+            else:
+                self._count("stale_hits")
+                self._refresh_in_background(redis_client, key, compute, should_cache)
+            return entry["value"]
+
+        value, shared = await self._flight.do(
+            key, lambda: self._compute_and_store(redis_client, key, compute, should_cache)
+        )
+        self._count("coalesced" if shared else "misses")
+        return value
+
+    async def lookup(self, text: str) -> Optional[Any]:
+        """Return the cached value (fresh or stale) without computing anything on a miss."""
+        entry = await self._read(await self._redis(), make_cache_key(self.namespace, text))
+        if entry is None:
+            self._count("misses")
+            return None
+        self._count("hits" if time.time() < entry["fresh_until"] else "stale_hits")
+        return entry["value"]
+
+    async def store(self, text: str, value: Any) -> None:
+        """Write a value computed outside get_or_compute (e.g. by a streaming response)."""
+        await self._write(await self._redis(), make_cache_key(self.namespace, text), value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the TTL; hit_ratio counts stale hits as hits."""
+        served = self._stats["hits"] + self._stats["stale_hits"]
+        total = served + self._stats["misses"] + self._stats["coalesced"]
+        return {
+            "namespace": self.namespace,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            **self._stats,
+            "hit_ratio": round(served / total, 4) if total else 0.0,
+        }
+
+
+# ---------------------------
+# In-process LRU
+# ---------------------------
+class LRUCache:
+    """Bounded in-process LRU; entries expire after `ttl` seconds unless set() overrides it."""
+
+    def __init__(self, max_items: int, ttl: float):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "size": len(self._entries),
+            "max_items": self.max_items,
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ---------------------------
+# Cross-worker Invalidation
+# ---------------------------
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations over Redis pub/sub so every worker drops its local
+    copy. Messages from this worker are ignored since it already invalidated locally.
+    Other per-worker state (e.g. a search index) can subscribe() to a namespace.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex
+        self._caches: Dict[str, "TwoTierCache"] = {}
+        self._listeners: Dict[str, List[Callable[[List[str]], None]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"published": 0, "received": 0, "errors": 0}
+
+    def register(self, cache: "TwoTierCache") -> None:
+        self._caches[cache.namespace] = cache
+
+    def subscribe(self, namespace: str, listener: Callable[[List[str]], None]) -> None:
+        """Call `listener(keys)` for every batch of keys another worker publishes under `namespace`."""
+        self._listeners.setdefault(namespace, []).append(listener)
+
+    async def publish(self, namespace: str, keys: List[str]) -> None:
+        """One message per batch, so bulk writes don't fan out into one publish per key."""
+        if not keys:
+            return
+        try:
+            redis_client = await get_redis_client()
+            message = codec.dumps({"worker": self.worker_id, "namespace": namespace, "keys": keys})
+            await redis_client.publish(self.channel, message)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    def _handle(self, data: Any) -> None:
+        message = codec.loads(data)
+        if message["worker"] == self.worker_id:
+            return
+        cache = self._caches.get(message["namespace"])
+        if cache:
+            cache.drop_local(message["keys"])
+        for listener in self._listeners.get(message["namespace"], []):
+            listener(message["keys"])
+        self._stats["received"] += 1
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis_client = await get_redis_client()
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(self.channel)
+                try:
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._handle(message["data"])
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                # Entries may have been missed while disconnected; TTLs bound the staleness
+                for cache in self._caches.values():
+                    cache.drop_local()
+                logger.warning(f"Cache invalidation listener failed: {e}. Reconnecting...")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"channel": self.channel, "listening": self._task is not None, **self._stats}
+
+
+# ---------------------------
+# Two-tier Read-through Cache
+# ---------------------------
+class TwoTierCache:
+    """
+    Read-through cache: in-process LRU in front of Redis in front of the loader.
+    Writers call invalidate(), which clears both tiers here and the LRU on other workers.
+
+    A loader can read a document just before a write invalidates it, so a loaded value
+    is only written back if its key wasn't invalidated meanwhile: each key has a version
+    in Redis that invalidation bumps (the Redis write is WATCHed against it), and loads
+    in flight on a worker are marked stale when it drops the key locally.
+    """
+
+    def __init__(self, namespace: str, local: LRUCache, redis_ttl: int, bus: InvalidationBus):
+        self.namespace = namespace
+        self.local = local
+        self.redis_ttl = redis_ttl
+        self.bus = bus
+        self._redis_stats = {"hits": 0, "misses": 0, "errors": 0, "stale": 0}
+        self._loading: Dict[str, List[Dict[str, bool]]] = {}
+        self._metrics = {name: cache_counter(namespace, "redis", name) for name in self._redis_stats}
+        self._local_hit = cache_counter(namespace, "local", "hits")
+        self._local_miss = cache_counter(namespace, "local", "misses")
+        bus.register(self)
+
+    def _count(self, name: str) -> None:
+        self._redis_stats[name] += 1
+        self._metrics[name].inc()
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}:v"
+
+    def drop_local(self, keys: Optional[List[str]] = None) -> None:
+        """Drop keys (all when None) from the LRU and discard loads of them still in flight."""
+        if keys is None:
+            self.local.clear()
+            loads = [load for pending in self._loading.values() for load in pending]
+        else:
+            for key in keys:
+                self.local.delete(key)
+            loads = [load for key in keys for load in self._loading.get(key, [])]
+        for load in loads:
+            load["stale"] = True
+
+    async def _write_back(self, redis_client, key: str, value: Dict[str, Any], version: Optional[str]) -> None:
+        """SETEX unless the key's version moved since it was read (WATCH makes it atomic)."""
+        version_key = self._version_key(key)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(version_key)
+                if await pipe.get(version_key) != version:
+                    self._count("stale")
+                    return
+                pipe.multi()
+                pipe.setex(self._redis_key(key), self.redis_ttl, codec.dumps(value))
+                await pipe.execute()
+            except WatchError:
+                self._count("stale")
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]):
+        """Return a copy of the cached document, loading it on a miss (None is not cached)."""
+        value = self.local.get(key)
+        if value is not None:
+            self._local_hit.inc()
+            return dict(value)
+        self._local_miss.inc()
+
+        # Registered before the Redis read, so an invalidation during either await marks it stale
+        load = {"stale": False}
+        self._loading.setdefault(key, []).append(load)
+        try:
+            return await self._load(key, loader, load)
+        finally:
+            pending = self._loading[key]
+            pending.remove(load)
+            if not pending:
+                del self._loading[key]
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]], load: Dict[str, bool]):
+        redis_client = version = None
+        try:
+            redis_client = await get_redis_client()
+            cached, version = await redis_client.mget(self._redis_key(key), self._version_key(key))
+            if cached:
+                self._count("hits")
+                value = codec.loads(cached)
+                if load["stale"]:
+                    self._count("stale")
+                else:
+                    self.local.set(key, value)
+                return dict(value)
+            self._count("misses")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Redis cache read failed: {e}")
+
+        value = await loader()
+        if value is None:
+            return None
+        if load["stale"]:
+            self._count("stale")
+            return dict(value)
+        self.local.set(key, value)
+        if redis_client:
+            try:
+                await self._write_back(redis_client, key, value, version)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Redis cache write failed: {e}")
+        return dict(value)
+
+    async def invalidate(self, key: str) -> None:
+        await self.invalidate_many([key])
+
+    async def invalidate_many(self, keys: List[str]) -> None:
+        """Drop `keys` from both tiers here and from every other worker's LRU."""
+        if not keys:
+            return
+        self.drop_local(keys)
+        try:
+            redis_client = await get_redis_client()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(*(self._redis_key(key) for key in keys))
+                for key in keys:
+                    # Outlives any cached copy, so a load that read before this write can't store it
+                    pipe.incr(self._version_key(key))
+                    pipe.expire(self._version_key(key), self.redis_ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Redis cache delete failed: {e}")
+        await self.bus.publish(self.namespace, keys)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._redis_stats["hits"] + self._redis_stats["misses"]
+        return {
+            "namespace": self.namespace,
+            "local": self.local.stats(),
+            "redis": {
+                "ttl": self.redis_ttl,
+                **self._redis_stats,
+                "hit_ratio": round(self._redis_stats["hits"] / lookups, 4) if lookups else 0.0,
+            },
+            "invalidation": self.bus.stats(),
+        }
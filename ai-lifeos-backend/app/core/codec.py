@@ -0,0 +1,44 @@
+from typing import Any, Generic, Type, TypeVar, Union
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+
+# ---------------------------
+# Cache Codec
+# ---------------------------
+def _default(value: Any) -> Any:
+    """Types orjson doesn't know natively (datetime, UUID and dataclasses it already handles)."""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a cache value to compact JSON bytes."""
+    return orjson.dumps(value, default=_default)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize a cache value written by dumps()."""
+    return orjson.loads(data)
+
+
+class ModelCodec(Generic[T]):
+    """Typed codec for one pydantic model, e.g. ModelCodec(TranscriptResponse)."""
+
+    def __init__(self, model: Type[T]):
+        self.model = model
+
+    def encode(self, value: T) -> bytes:
+        return dumps(value)
+
+    def decode(self, data: Union[bytes, str]) -> T:
+        return self.model(**loads(data))
@@ -1,26 +1,132 @@
-from pydantic import BaseSettings
+from typing import Dict, List
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    
-    MONGO_URI: str
-    REDIS_URL: str
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    MONGO_URI: str = "mongodb://localhost:27017/lifeos"
+    MONGO_INDEX_CHECK: bool = False  # fail startup if a hot query would COLLSCAN
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
 
     
-    JWT_SECRET: str
+    JWT_SECRET: str = ""  # required; startup refuses to run without it
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_MAX_ITEMS: int = 10000  # verified access tokens cached per worker
+    AUTH_DENYLIST_ENABLED: bool = False  # check revoked jti in Redis on every request
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 10  # concurrent refreshes with one token aren't treated as theft
+
+    # Logging: records are queued and rendered/written by a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" (one object per line) or "text"
+    LOG_FILE: str = "logs/app.log"  # empty to disable; rotated daily
+    LOG_STDOUT: bool = True
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped (and counted), never block
+    LOG_SAMPLE_RATES: Dict[str, float] = {"DEBUG": 0.1}  # per-level keep probability
+    REQUEST_ID_HEADER: str = "X-Request-ID"
+
+    # On-demand request profiling (pyinstrument); the middleware is only added when enabled
+    PROFILING_ENABLED: bool = False
+    PROFILE_HEADER: str = "X-Profile"  # send it to profile one request
+    PROFILE_TOKEN: str = ""  # if set, the header value must match
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of all requests to profile
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+    PROFILE_FORMAT: str = "speedscope"  # "speedscope" (JSON) or "collapsed" (flamegraph.pl)
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_FILES: int = 200  # ring: older profiles are deleted
+
+    # External API Keys: optional; a provider without its key has its routes disabled
+    ASSEMBLYAI_API_KEY: str = ""
+    GEMINI_API_KEY: str = ""
+    GOOGLE_CLOUD_PROJECT_ID: str = ""
+    GOOGLE_CLOUD_CREDENTIALS_PATH: str = ""  # empty: application default credentials
+
+    # Clients are created on first use; these are created during startup instead
+    WARM_SERVICES: List[str] = ["mongo", "http"]
+
+    # Shared outbound HTTP client (one per worker; AssemblyAI and other REST providers)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50  # idle connections kept; below per-host concurrency means churn
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 10.0  # waiting for a free pooled connection
+    HTTP2_ENABLED: bool = False  # needs the h2 package (httpx[http2])
+    HTTP_HOST_MAX_CONCURRENCY: int = 32  # requests in flight per host
+    HTTP_HOST_CONCURRENCY: Dict[str, int] = {}  # per-host overrides, e.g. {"api.assemblyai.com": 16}
+    HTTP_RETRIES: int = 2  # extra attempts for idempotent requests
+    HTTP_RETRY_BACKOFF_SECONDS: float = 0.25  # full jitter: sleep uniform(0, backoff * 2**attempt)
+    HTTP_RETRY_MAX_BACKOFF_SECONDS: float = 5.0
+
+    # Gemini execution limits (per worker)
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_MAX_QUEUE: int = 32
+    GEMINI_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    GEMINI_CALL_TIMEOUT_SECONDS: float = 60.0
+
+    # Password hashing pool (bcrypt, per worker)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    PASSWORD_HASH_CALL_TIMEOUT_SECONDS: float = 10.0
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # AssemblyAI transcription jobs
+    ASSEMBLYAI_BASE_URL: str = "https://api.assemblyai.com/v2"
+    TRANSCRIPTION_POLL_INITIAL_SECONDS: float = 1.0
+    TRANSCRIPTION_POLL_MAX_SECONDS: float = 30.0
+    TRANSCRIPTION_POLL_BACKOFF: float = 1.5
+    TRANSCRIPTION_POLL_CONCURRENCY: int = 32
+    TRANSCRIPTION_LEASE_SECONDS: int = 120
+    TRANSCRIPTION_WAIT_SECONDS: float = 60.0  # upload-and-transcribe answers 202 + job id after this
+
+    # Audio uploads ("assemblyai" or "local" directory stand-in)
+    UPLOAD_BACKEND: str = "assemblyai"
+    UPLOAD_LOCAL_DIR: str = "uploads"
+    UPLOAD_CHUNK_BYTES: int = 256 * 1024
+    UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024  # matches client_max_body_size in nginx.conf
+
+    # Notes/tasks read cache (in-process LRU -> Redis -> Mongo)
+    READ_CACHE_LOCAL_MAX_ITEMS: int = 2048
+    READ_CACHE_LOCAL_TTL_SECONDS: float = 30.0
+    READ_CACHE_REDIS_TTL_SECONDS: int = 300
+    READ_CACHE_CHANNEL: str = "cache:invalidate"
+
+    # Note/task list pagination
+    LIST_PAGE_SIZE_DEFAULT: int = 50
+    LIST_PAGE_SIZE_MAX: int = 200
+
+    # Bulk note/task writes: operations accepted per request
+    BULK_MAX_OPERATIONS: int = 500
+
+    # Note search: "mongo" ($text index) or "memory" (per-worker inverted index)
+    NOTES_SEARCH_ENGINE: str = "mongo"
+    NOTES_SEARCH_REBUILD_SECONDS: float = 3600.0
+
+    # Text-to-speech audio cache (content-addressed files, LRU by total bytes)
+    TTS_CACHE_DIR: str = "tts_cache"
+    TTS_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    TTS_MAX_TEXT_BYTES: int = 5000  # Google's per-request input limit
+    TTS_LONG_TEXT_MAX_BYTES: int = 200 * 1024  # /synthesize/stream, split into chunks
+    TTS_CHUNK_MAX_BYTES: int = 1000
+    TTS_CHUNK_CONCURRENCY: int = 4  # chunks synthesized ahead of the one being streamed
 
-    # External API Keys
-    ASSEMBLYAI_API_KEY: str
-    GEMINI_API_KEY: str
-    GOOGLE_CLOUD_PROJECT_ID: str
-    GOOGLE_CLOUD_CREDENTIALS_PATH: str
+    # Background task interpretation (Redis Stream consumed by every worker)
+    TASK_INTERPRET_STREAM: str = "tasks:interpret"
+    TASK_INTERPRET_GROUP: str = "task-interpreters"
+    TASK_INTERPRET_STREAM_MAXLEN: int = 100_000
+    TASK_INTERPRET_CONCURRENCY: int = 4  # messages handled at once per worker
+    TASK_INTERPRET_CLAIM_IDLE_SECONDS: float = 120.0  # unacked this long -> retried (by any worker)
+    TASK_INTERPRET_MAX_ATTEMPTS: int = 3
+    TASK_INTERPRET_BUSY_RETRY_SECONDS: float = 5.0  # requeue delay when the Gemini executor is saturated
+    TASK_INTERPRET_CACHE_TTL_SECONDS: int = 86400
 
-    class Config:
-        env_file = ".env"  
-        env_file_encoding = "utf-8"
+    # Learning suggestion cache
+    LEARNING_CACHE_TTL_SECONDS: int = 86400
+    LEARNING_CACHE_STALE_SECONDS: int = 3600
 
 
 # Create a config instance
@@ -6,7 +6,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     logger.error(f"HTTP Error: {exc.detail} | Path: {request.url}")
     return JSONResponse(
         status_code=exc.status_code,
-        content={"error": exc.detail}
+        content={"error": exc.detail},
+        headers=getattr(exc, "headers", None),  # e.g. Retry-After on 503s
     )
 
 async def global_exception_handler(request: Request, exc: Exception):
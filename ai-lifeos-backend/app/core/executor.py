@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+from loguru import logger
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a call cannot get a worker slot within the queue limits."""
+
+
+class ExecutorTimeoutError(RuntimeError):
+    """Raised when a call exceeds its per-call timeout."""
+
+
+_STREAM_END = object()
+
+
+class BoundedExecutor:
+    """
+    Runs blocking SDK calls on a dedicated thread pool without blocking the event loop.
+
+    At most `max_concurrency` calls run at once per worker; up to `max_queue` callers
+    wait for a slot for at most `queue_timeout` seconds, anything beyond that is
+    rejected with ExecutorBusyError. A slot is only released once the underlying
+    thread has actually finished, so timed-out calls still count against the cap.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        call_timeout: float,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=name)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        # Seconds spent waiting for a slot / running on a thread (updated from pool threads)
+        self._timing_lock = threading.Lock()
+        self._acquired = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_run_seconds = 0.0
+        self._runs = 0
+
+    # -------------------
+    # Slot management
+    # -------------------
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _acquire(self) -> None:
+        if self._waiting >= self.max_queue and self._get_semaphore().locked():
+            self._rejected += 1
+            raise ExecutorBusyError(f"{self.name} executor queue is full")
+
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._get_semaphore().acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ExecutorBusyError(f"{self.name} executor: no slot within {self.queue_timeout}s")
+        finally:
+            self._waiting -= 1
+        self._acquired += 1
+        self._wait_seconds += time.perf_counter() - started
+        self._in_flight += 1
+
+    def _timed(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Runs on the pool thread so the measurement excludes queueing."""
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._timing_lock:
+                self._runs += 1
+                self._run_seconds += elapsed
+                self._max_run_seconds = max(self._max_run_seconds, elapsed)
+
+    def _release(self, _future: Any = None) -> None:
+        self._in_flight -= 1
+        self._get_semaphore().release()
+
+    # -------------------
+    # Public API
+    # -------------------
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` on the pool, honoring the queue and call limits."""
+        await self._acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool, partial(self._timed, fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=timeout or self.call_timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.warning(f"{self.name} call timed out after {time.perf_counter() - started:.2f}s")
+            raise ExecutorTimeoutError(f"{self.name} call timed out")
+        except Exception:
+            self._failed += 1
+            raise
+        self._completed += 1
+        return result
+
+    async def stream(
+        self, fn: Callable[..., Iterable[Any]], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate a blocking iterator returned by `fn(*args, **kwargs)` on the pool, yielding
+        items as they arrive. The slot is held for the whole stream; `timeout` bounds the
+        wait for each item. Closing the generator early stops the producer at its next item.
+        """
+        await self._acquire()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def push(item: Any, error: Optional[BaseException] = None) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                stop.set()  # event loop already closed
+
+        def produce() -> None:
+            try:
+                for item in fn(*args, **kwargs):
+                    if stop.is_set():
+                        return
+                    push(item)
+            except Exception as e:
+                push(_STREAM_END, e)
+                return
+            push(_STREAM_END)
+
+        try:
+            future = loop.run_in_executor(self._pool, produce)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            while True:
+                try:
+                    item, error = await asyncio.wait_for(queue.get(), timeout=timeout or self.call_timeout)
+                except asyncio.TimeoutError:
+                    self._timed_out += 1
+                    raise ExecutorTimeoutError(f"{self.name} stream stalled")
+                if item is _STREAM_END:
+                    if error is not None:
+                        self._failed += 1
+                        raise error
+                    break
+                yield item
+            self._completed += 1
+        finally:
+            stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage for diagnostics."""
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "failed": self._failed,
+            "avg_wait_ms": round(self._wait_seconds / self._acquired * 1000, 2) if self._acquired else 0.0,
+            "avg_run_ms": round(self._run_seconds / self._runs * 1000, 2) if self._runs else 0.0,
+            "max_run_ms": round(self._max_run_seconds * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running calls are left to finish on their own."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
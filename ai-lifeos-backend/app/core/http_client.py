@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from app.core.config import config
+from app.core.metrics import (
+    OUTBOUND_CONNECTIONS_OPENED,
+    OUTBOUND_IN_FLIGHT,
+    OUTBOUND_REQUESTS,
+    OUTBOUND_RETRIES,
+    OUTBOUND_WAIT,
+)
+from app.core.services import services
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+# ---------------------------
+# Shared client
+# ---------------------------
+def _create_client() -> httpx.AsyncClient:
+    http2 = config.HTTP2_ENABLED
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP2_ENABLED is set but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            config.HTTP_TIMEOUT_SECONDS,
+            connect=config.HTTP_CONNECT_TIMEOUT_SECONDS,
+            pool=config.HTTP_POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+async def _close_client(client: httpx.AsyncClient) -> None:
+    await client.aclose()
+
+
+services.register("http", _create_client, close=_close_client)
+
+
+# ---------------------------
+# Per-host limits and metrics
+# ---------------------------
+class _Host:
+    """Concurrency slot and pre-resolved metric children for one upstream host."""
+
+    def __init__(self, host: str, limit: int):
+        self.slots = asyncio.Semaphore(limit)
+        self.in_flight = OUTBOUND_IN_FLIGHT.labels(host=host)
+        self.slot_wait = OUTBOUND_WAIT.labels(host=host, stage="host_slot")
+        self.pool_wait = OUTBOUND_WAIT.labels(host=host, stage="connection")
+        self.connections_opened = OUTBOUND_CONNECTIONS_OPENED.labels(host=host)
+        self.name = host
+
+
+_hosts: Dict[str, _Host] = {}
+
+
+def _host(name: str) -> _Host:
+    host = _hosts.get(name)
+    if host is None:
+        limit = config.HTTP_HOST_CONCURRENCY.get(name, config.HTTP_HOST_MAX_CONCURRENCY)
+        host = _hosts[name] = _Host(name, limit)
+    return host
+
+
+def _tracer(host: _Host, started: float):
+    """
+    httpcore trace hook. A request either opens a new connection (connect_tcp) or sends
+    on a pooled one; whichever comes first ends its wait for the connection pool.
+    """
+    waiting = True
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:
+        nonlocal waiting
+        if event == "connection.connect_tcp.started":
+            host.connections_opened.inc()
+        elif not event.endswith("send_request_headers.started"):
+            return
+        if waiting:
+            waiting = False
+            host.pool_wait.observe(time.perf_counter() - started)
+
+    return trace
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Retry-After when the server sent one, else exponential backoff with full jitter."""
+    cap = config.HTTP_RETRY_MAX_BACKOFF_SECONDS
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(cap, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(cap, config.HTTP_RETRY_BACKOFF_SECONDS * 2 ** attempt))
+
+
+# ---------------------------
+# Requests
+# ---------------------------
+async def request(method: str, url: str, *, retry: Optional[bool] = None, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request on the worker's shared client, at most HTTP_HOST_MAX_CONCURRENCY
+    (or the host's HTTP_HOST_CONCURRENCY entry) at a time per host.
+
+    Idempotent methods are retried up to HTTP_RETRIES times on transport errors and
+    429/502/503/504; pass retry=True for a POST that is safe to repeat, or retry=False
+    to opt out. Streaming request bodies can't be replayed, so never retry those.
+    The final response is returned whatever its status; transport errors are raised.
+    """
+    client = services.get("http")
+    method = method.upper()
+    host = _host(httpx.URL(url).host)
+    retry = method in IDEMPOTENT_METHODS if retry is None else retry
+    attempts = 1 + (config.HTTP_RETRIES if retry else 0)
+
+    for attempt in range(attempts):
+        started = time.perf_counter()
+        async with host.slots:
+            sending = time.perf_counter()
+            host.slot_wait.observe(sending - started)
+            host.in_flight.inc()
+            try:
+                response = await client.request(
+                    method, url, extensions={"trace": _tracer(host, sending)}, **kwargs
+                )
+            except httpx.TransportError as e:
+                OUTBOUND_REQUESTS.labels(host=host.name, outcome=type(e).__name__).inc()
+                if attempt + 1 == attempts:
+                    raise
+                reason, response = type(e).__name__, None
+            else:
+                OUTBOUND_REQUESTS.labels(host=host.name, outcome=str(response.status_code)).inc()
+                if response.status_code not in RETRY_STATUSES or attempt + 1 == attempts:
+                    return response
+                reason = str(response.status_code)
+            finally:
+                host.in_flight.dec()
+
+        # Sleep outside the slot so other requests to the host can use it meanwhile
+        OUTBOUND_RETRIES.labels(host=host.name, reason=reason).inc()
+        delay = retry_delay(attempt, response)
+        logger.debug(f"Retrying {method} {url} in {delay:.2f}s after {reason}")
+        await asyncio.sleep(delay)
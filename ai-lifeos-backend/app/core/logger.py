@@ -1,19 +1,210 @@
-from loguru import logger
+import atexit
 import os
+import queue
+import random
+import sys
+import threading
+import traceback
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import orjson
+from loguru import logger
+
+from app.core.config import config
+
+# Correlation id of the request being handled; set by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+# ---------------------------
+# Queue-backed sink
+# ---------------------------
+class QueueSink:
+    """
+    Loguru sink that only puts the record on a bounded in-memory queue; a daemon thread
+    renders it (JSON or text) and writes it out in batches. The event loop pays for
+    building the record and one queue put, never for formatting or a blocking write.
+    When the queue is full the record is dropped and counted rather than blocking.
+    """
+
+    def __init__(self, path: str, stdout: bool, json_format: bool, max_queue: int):
+        self.path = path
+        self.stdout = stdout
+        self.json_format = json_format
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._file_day: Optional[str] = None
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "write_errors": 0}
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+            self._stats["queued"] += 1
+        except queue.Full:
+            self._stats["dropped"] += 1
+
+    # Writer thread ----------------------------------------------------------
+    def render(self, record: Dict[str, Any]) -> str:
+        extra = {k: v for k, v in record["extra"].items() if k not in ("request_id", "sample")}
+        exception = None
+        if record["exception"]:
+            type_, value, tb = record["exception"]
+            exception = "".join(traceback.format_exception(type_, value, tb))
+        if not self.json_format:
+            line = (
+                f"{record['time']:%Y-%m-%d %H:%M:%S.%f} | {record['level'].name:<8} | "
+                f"{record['extra'].get('request_id') or '-'} | {record['message']}"
+            )
+            return f"{line}\n{exception}" if exception else line + "\n"
+        entry = {
+            "ts": record["time"].isoformat(),
+            "level": record["level"].name,
+            "msg": record["message"],
+            "logger": f"{record['name']}:{record['function']}:{record['line']}",
+            "request_id": record["extra"].get("request_id"),
+        }
+        if extra:
+            entry["extra"] = extra
+        if exception:
+            entry["exception"] = exception
+        return orjson.dumps(entry, default=str).decode() + "\n"
+
+    def _open_file(self) -> None:
+        """
+        Daily rotation: yesterday's app.log becomes app.<date>.log. Every worker shares
+        the file, so only the first to see the new day moves it (link() fails once the
+        archive exists); the others just reopen app.log in append mode.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self._file is not None and today == self._file_day:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self._file is not None:
+            self._file.close()
+            root, ext = os.path.splitext(self.path)
+            try:
+                os.link(self.path, f"{root}.{self._file_day}{ext}")
+                os.unlink(self.path)
+            except (FileExistsError, FileNotFoundError):
+                pass  # another worker rotated already
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._file_day = today
+
+    def _write(self, records) -> None:
+        text = "".join(self.render(record) for record in records)
+        try:
+            if self.path:
+                self._open_file()
+                self._file.write(text)
+                self._file.flush()
+            if self.stdout:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            self._stats["written"] += len(records)
+        except Exception:
+            self._stats["write_errors"] += 1
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < 512:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in items if isinstance(item, dict)]
+            if records:
+                self._write(records)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()  # a flush() marker: everything before it is written
+            if any(item is None for item in items):
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far has been written."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush what's queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None, timeout=timeout)
+            self._thread.join(timeout)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "queue_depth": self._queue.qsize(), "queue_max": self._queue.maxsize}
+
+
+# ---------------------------
+# Sampling and correlation id
+# ---------------------------
+_sampled_out: Dict[str, int] = {}
+
+
+def _sample(record) -> bool:
+    """
+    Keep a record with probability LOG_SAMPLE_RATES[level], or the `sample` bound on
+    the logger for one hot call site: logger.bind(sample=0.01).info(...).
+    """
+    rate = record["extra"].get("sample", config.LOG_SAMPLE_RATES.get(record["level"].name))
+    if rate is None or rate >= 1 or random.random() < rate:
+        return True
+    _sampled_out[record["level"].name] = _sampled_out.get(record["level"].name, 0) + 1
+    return False
+
+
+def _add_request_id(record) -> None:
+    record["extra"].setdefault("request_id", request_id_var.get())
+
+
+# ---------------------------
+# Setup
+# ---------------------------
+sink: Optional[QueueSink] = None
+
+
+def configure_logging() -> None:
+    global sink
+    logger.remove()
+    if sink is not None:
+        sink.close()
+    logger.configure(patcher=_add_request_id)
+    sink = QueueSink(
+        path=config.LOG_FILE,
+        stdout=config.LOG_STDOUT,
+        json_format=config.LOG_FORMAT == "json",
+        max_queue=config.LOG_QUEUE_SIZE,
+    )
+    # "{message}" keeps loguru's own formatting trivial; the writer thread renders
+    logger.add(sink, level=config.LOG_LEVEL, format="{message}", filter=_sample, catch=True)
+
+
+def flush_logging() -> None:
+    if sink is not None:
+        sink.flush()
 
 
-os.makedirs("logs", exist_ok=True)
+def close_logging() -> None:
+    if sink is not None:
+        sink.close()
 
-logger.remove()  
-logger.add(
-    "logs/app.log",
-    rotation="1 day",  
-    level="INFO",
-    format="{time:YYYY-MM-DD at HH:mm:ss} | {level} | {message}",
-)
 
+def logging_stats() -> Dict[str, Any]:
+    return {**(sink.stats() if sink else {}), "sampled_out": dict(_sampled_out)}
 
-logger.add(lambda msg: print(msg, end=""), level="DEBUG")
 
+configure_logging()
+atexit.register(close_logging)
 
 app_logger = logger
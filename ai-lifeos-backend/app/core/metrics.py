@@ -0,0 +1,197 @@
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Multiprocess mode is picked up from PROMETHEUS_MULTIPROC_DIR when prometheus_client is
+# imported (see app/production/start.sh): every worker writes its samples to mmap'd files
+# in that directory and /metrics on any worker aggregates all of them.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+EXTERNAL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# ---------------------------
+# Metric definitions
+# ---------------------------
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled", multiprocess_mode="livesum"
+)
+DB_OPERATION_DURATION = Histogram(
+    "db_operation_duration_seconds", "DBService operation latency", ["operation"], buckets=DB_BUCKETS
+)
+DB_OPERATION_ERRORS = Counter("db_operation_errors_total", "DBService operations that raised", ["operation"])
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache, tier and result", ["cache", "tier", "result"]
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds", "Latency of calls to AI providers", ["service", "operation"],
+    buckets=EXTERNAL_BUCKETS,
+)
+EXTERNAL_CALL_ERRORS = Counter(
+    "external_call_errors_total", "Failed calls to AI providers", ["service", "operation", "error"]
+)
+OUTBOUND_REQUESTS = Counter(
+    "outbound_http_requests_total", "Shared HTTP client attempts by host and status (or error)", ["host", "outcome"]
+)
+OUTBOUND_CONNECTIONS_OPENED = Counter(
+    "outbound_http_connections_opened_total",
+    "New connections from the shared HTTP client; requests minus this were served by a reused one",
+    ["host"],
+)
+OUTBOUND_RETRIES = Counter("outbound_http_retries_total", "Retried outbound attempts", ["host", "reason"])
+OUTBOUND_WAIT = Histogram(
+    "outbound_http_wait_seconds",
+    "Time an outbound request waited before sending: per-host slot or pooled connection",
+    ["host", "stage"],
+    buckets=DB_BUCKETS,
+)
+OUTBOUND_IN_FLIGHT = Gauge(
+    "outbound_http_in_flight", "Outbound requests holding a per-host slot", ["host"], multiprocess_mode="livesum"
+)
+TASK_INTERPRETATIONS = Counter(
+    "task_interpretations_total", "Background task interpretations by outcome", ["outcome"]
+)
+
+
+# ---------------------------
+# Instrumentation helpers
+# ---------------------------
+def cache_counter(cache: str, tier: str, result: str):
+    """Pre-resolved child counter, so the lookup path only pays for inc()."""
+    return CACHE_REQUESTS.labels(cache=cache, tier=tier, result=result)
+
+
+def observe_db(fn: Callable) -> Callable:
+    """Time a DBService coroutine under its own name; exceptions are counted and re-raised."""
+    duration = DB_OPERATION_DURATION.labels(operation=fn.__name__)
+    errors = DB_OPERATION_ERRORS.labels(operation=fn.__name__)
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - started)
+    return wrapper
+
+
+@asynccontextmanager
+async def track_external(service: str, operation: str):
+    """Time a call to Gemini/AssemblyAI/TTS and count failures by exception type."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        EXTERNAL_CALL_ERRORS.labels(service=service, operation=operation, error=type(e).__name__).inc()
+        raise
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service=service, operation=operation).observe(time.perf_counter() - started)
+
+
+# ---------------------------
+# ASGI middleware
+# ---------------------------
+class MetricsMiddleware:
+    """
+    Request latency by method, route template and status, plus an in-flight gauge.
+    The route is the matched path template ("/api/notes/{note_id}"), looked up from the
+    endpoint the router stored in the scope, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, routes_app=None):
+        self.app = app
+        self.routes_app = routes_app
+        self._templates: Dict[Any, str] = {}
+        self._children: Dict[Tuple[str, str, int], Any] = {}
+
+    def _template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            for route in getattr(self.routes_app, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    self._templates[endpoint] = template = route.path
+                    break
+            else:
+                template = "unmatched"
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            key = (scope["method"], self._template(scope), status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_REQUEST_DURATION.labels(*key)
+            child.observe(time.perf_counter() - started)
+
+
+# ---------------------------
+# Per-worker component stats
+# ---------------------------
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Expose `provider()` (caches, pools, queues) under /metrics/stats, never on the public API."""
+    _stats_providers[name] = provider
+
+
+def collect_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters of this worker's components; unlike /metrics these are not aggregated."""
+    return {name: provider() for name, provider in sorted(_stats_providers.items())}
+
+
+# ---------------------------
+# Exposition
+# ---------------------------
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus text format, aggregated across workers in multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges (in-flight) from the aggregate on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
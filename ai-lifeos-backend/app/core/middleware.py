@@ -0,0 +1,46 @@
+import re
+import uuid
+
+from app.core.config import config
+from app.core.logger import request_id_var
+
+# Incoming ids are echoed into logs and headers, so only accept short, plain tokens
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Give every request a correlation id: the client's X-Request-ID if it looks sane,
+    otherwise a fresh one. It is set in a context variable (so every log record of the
+    request carries it) and echoed on the response.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which would wrap every response body
+    in an extra task and memory stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = config.REQUEST_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                candidate = value.decode("latin-1")
+                if VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(self.header, request_id.encode("latin-1"))]
+            await send(message)
+
+        # Not reset afterwards: the server runs each request in its own task (and context),
+        # and the unhandled-exception handler outside this middleware should still see it
+        request_id_var.set(request_id)
+        await self.app(scope, receive, send_with_id)
@@ -0,0 +1,75 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.core import codec
+
+
+# ---------------------------
+# Keyset Cursors
+# ---------------------------
+# Lists are ordered newest first on (created_at, _id); _id breaks ties between
+# documents created in the same millisecond.
+SORT_NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque token pointing just past `doc` in SORT_NEWEST_FIRST order."""
+    payload = codec.dumps({"c": doc["created_at"].isoformat(), "i": str(doc["_id"])})
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """Inverse of encode_cursor; raises ValueError for anything we didn't issue."""
+    try:
+        payload = codec.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(payload["c"]), ObjectId(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict `query` to documents after `cursor` in SORT_NEWEST_FIRST order."""
+    if not cursor:
+        return query
+    created_at, oid = decode_cursor(cursor)
+    after = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": oid}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+def date_range(created_after: Optional[datetime], created_before: Optional[datetime]) -> Dict[str, Any]:
+    """created_at filter for an optional [after, before) window."""
+    bounds = {}
+    if created_after:
+        bounds["$gte"] = created_after
+    if created_before:
+        bounds["$lt"] = created_before
+    return {"created_at": bounds} if bounds else {}
+
+
+def build_projection(fields: Optional[Iterable[str]], allowed: Iterable[str]) -> Optional[Dict[str, int]]:
+    """
+    Mongo projection for the requested fields. created_at is always included because
+    the next cursor is built from it; None means return whole documents.
+    """
+    if not fields:
+        return None
+    fields = set(fields)
+    unknown = fields - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return {field: 1 for field in fields | {"created_at"}}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated ?fields= query value."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
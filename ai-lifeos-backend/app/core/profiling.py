@@ -0,0 +1,126 @@
+import asyncio
+import os
+import random
+import re
+import time
+from typing import List, Optional
+
+from loguru import logger
+
+from app.core.config import config
+from app.core.logger import request_id_var
+
+UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+# ---------------------------
+# Output formats
+# ---------------------------
+def collapse_stacks(frame, prefix: str = "", lines: Optional[List[str]] = None) -> List[str]:
+    """
+    Brendan Gregg's collapsed format ("a;b;c <count>"), one line per stack, with each
+    frame's self time in microseconds as the count. Feed to flamegraph.pl or speedscope.
+    """
+    lines = [] if lines is None else lines
+    if frame is None:
+        return lines
+    name = f"{frame.function} ({frame.file_path_short}:{frame.line_no})".replace(";", ":")
+    stack = f"{prefix};{name}" if prefix else name
+    self_time = frame.time - sum(child.time for child in frame.children)
+    if self_time > 0:
+        lines.append(f"{stack} {round(self_time * 1e6)}")
+    for child in frame.children:
+        collapse_stacks(child, stack, lines)
+    return lines
+
+
+def render_profile(session, fmt: str) -> str:
+    if fmt == "speedscope":
+        from pyinstrument.renderers import SpeedscopeRenderer
+        return SpeedscopeRenderer().render(session)
+    return "\n".join(collapse_stacks(session.root_frame())) + "\n"
+
+
+# ---------------------------
+# Profile ring on disk
+# ---------------------------
+class ProfileRing:
+    """Keeps the newest `max_files` profiles in `directory` (file names sort by time)."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def write(self, name: str, body: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+        files = sorted(os.listdir(self.directory))
+        for old in files[: max(0, len(files) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except FileNotFoundError:
+                pass  # another worker trimmed it first
+        return path
+
+
+# ---------------------------
+# ASGI middleware
+# ---------------------------
+class ProfilingMiddleware:
+    """
+    Run pyinstrument's sampling profiler for selected requests and save the result to
+    a bounded ring of files. A request is profiled when it sends PROFILE_HEADER
+    (matching PROFILE_TOKEN, if one is set) or falls in PROFILE_SAMPLE_RATE. The
+    profiler runs in async mode, so time spent awaiting is attributed to the await
+    and blocking calls on the event loop stand out as wide frames. One request per
+    worker is profiled at a time; others are passed through untouched.
+
+    Only added to the app when PROFILING_ENABLED is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        from pyinstrument import Profiler  # optional dependency, only needed when enabled
+
+        self.app = app
+        self._profiler_class = Profiler
+        self.header = config.PROFILE_HEADER.lower().encode("latin-1")
+        self.ring = ProfileRing(config.PROFILE_DIR, config.PROFILE_MAX_FILES)
+        self._active = False
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                return not config.PROFILE_TOKEN or value.decode("latin-1") == config.PROFILE_TOKEN
+        return config.PROFILE_SAMPLE_RATE > 0 and random.random() < config.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._requested(scope):
+            return await self.app(scope, receive, send)
+
+        extension = "speedscope.json" if config.PROFILE_FORMAT == "speedscope" else "collapsed.txt"
+        label = UNSAFE_FILENAME.sub("_", f"{scope['method']}{scope['path']}")[:80]
+        name = f"{time.time_ns()}-{label}-{request_id_var.get() or 'none'}.{extension}"
+
+        async def send_with_name(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-file", name.encode("latin-1"))]
+            await send(message)
+
+        profiler = self._profiler_class(interval=config.PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        self._active = True
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_name)
+        finally:
+            session = profiler.stop()
+            self._active = False
+            try:
+                # Rendering a long session takes a while too; keep it off the event loop
+                path = await asyncio.to_thread(
+                    lambda: self.ring.write(name, render_profile(session, config.PROFILE_FORMAT))
+                )
+                logger.info(f"Profiled {scope['method']} {scope['path']} in {session.duration * 1000:.1f}ms -> {path}")
+            except Exception as e:
+                logger.warning(f"Failed to write profile: {e}")
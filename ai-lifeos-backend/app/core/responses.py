@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core import codec
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON rendered by orjson with the cache codec's fallbacks: ObjectId becomes its hex
+    string, datetimes are written natively as ISO 8601 and pydantic models as dicts.
+    This is the one place documents read from Mongo are converted for the wire.
+
+    It is the app's default response class. List and document endpoints also return it
+    directly, so FastAPI skips response_model validation and jsonable_encoder for data
+    we just read from our own database; their response_model only documents the shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import config
+
+
+class ServiceUnavailableError(RuntimeError):
+    """The service's settings are missing, so it can't be created."""
+
+
+class ServiceRegistry:
+    """
+    Process-wide clients for databases and external providers, created on first use.
+
+    Each service module registers a factory (plus the settings it needs and how to
+    close the client) at import time; nothing is imported, connected or authenticated
+    until get() is called or lifespan warms the service. Importing the app therefore
+    costs neither SDK imports nor credentials, and each worker builds its own clients
+    after the fork.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._requires: Dict[str, Tuple[str, ...]] = {}
+        self._closers: Dict[str, Callable[[Any], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()  # get() is also called from executor threads (Gemini)
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        requires: Iterable[str] = (),
+        close: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self._factories[name] = factory
+        self._requires[name] = tuple(requires)
+        if close is not None:
+            self._closers[name] = close
+
+    def missing_settings(self, name: str) -> List[str]:
+        return [key for key in self._requires[name] if not getattr(config, key, None)]
+
+    def configured(self, name: str) -> bool:
+        return name in self._instances or not self.missing_settings(name)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                missing = self.missing_settings(name)
+                if missing:
+                    raise ServiceUnavailableError(f"{name} is not configured (set {', '.join(missing)})")
+                started = time.perf_counter()
+                instance = self._factories[name]()
+                self._instances[name] = instance
+                logger.info(f"Initialized {name} in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return instance
+
+    def set(self, name: str, instance: Any) -> None:
+        """Install a ready-made client (tests and benchmarks use stand-ins)."""
+        self._instances[name] = instance
+
+    @contextmanager
+    def override(self, name: str, instance: Any):
+        previous = self._instances.get(name)
+        self._instances[name] = instance
+        try:
+            yield instance
+        finally:
+            if previous is None:
+                self._instances.pop(name, None)
+            else:
+                self._instances[name] = previous
+
+    def warm(self, names: Iterable[str]) -> None:
+        """Create the listed services now (from lifespan); unconfigured ones are skipped."""
+        for name in names:
+            if name not in self._factories:
+                logger.warning(f"Unknown service in WARM_SERVICES: {name}")
+            elif self.configured(name):
+                self.get(name)
+
+    async def close(self, name: Optional[str] = None) -> None:
+        """Close one service, or every service created so far."""
+        for service in [name] if name else list(self._instances):
+            instance = self._instances.pop(service, None)
+            closer = self._closers.get(service)
+            if instance is None or closer is None:
+                continue
+            try:
+                result = closer(instance)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Failed to close {service}: {e}")
+
+
+services = ServiceRegistry()
+
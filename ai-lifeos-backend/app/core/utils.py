@@ -2,15 +2,39 @@ import httpx
 from loguru import logger
 from typing import Any, Dict, Optional
 import redis.asyncio as redis
+from app.core import codec, http_client
 from app.core.config import config
 
 
 # ---------------------------
 # Redis Client
 # ---------------------------
+_redis_client: Optional[redis.Redis] = None
+
+
+async def init_redis() -> redis.Redis:
+    """Create the worker's pooled Redis client (called from lifespan)."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(
+            config.REDIS_URL,
+            decode_responses=True,
+            max_connections=config.REDIS_MAX_CONNECTIONS,
+        )
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the pooled Redis client and its connections."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
 async def get_redis_client() -> redis.Redis:
-    """Initialize and return an async Redis client."""
-    return redis.from_url(config.REDIS_URL, decode_responses=True)
+    """Return the shared async Redis client, creating it on first use outside lifespan."""
+    return _redis_client or await init_redis()
 
 
 # ---------------------------
@@ -22,27 +46,32 @@ async def call_external_api(
     json_data: Optional[Dict] = None,
     headers: Optional[Dict] = None,
 ) -> Dict[str, Any]:
-    """Make async HTTP requests with error handling."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method, url, json=json_data, headers=headers, timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as e:
-            logger.error(f"API call failed: {e}")
-            raise ValueError(f"External API error: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error in API call: {e}")
-            raise
+    """JSON request on the shared outbound client (pooled, per-host limited, retried if idempotent)."""
+    try:
+        response = await http_client.request(method, url, json=json_data, headers=headers)
+        response.raise_for_status()
+        return response.json()
+    except httpx.RequestError as e:
+        logger.error(f"API call failed: {e}")
+        raise ValueError(f"External API error: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error in API call: {e}")
+        raise
 
 
 # ---------------------------
 # Cache Helper
 # ---------------------------
 async def cache_result(
-    redis_client: redis.Redis, key: str, value: str, ttl: int = 3600
+    redis_client: redis.Redis, key: str, value: Any, ttl: int = 3600
 ) -> None:
-    """Cache a result with TTL."""
-    await redis_client.setex(key, ttl, value)
+    """Cache a result with TTL, encoded with the cache codec (read back with codec.loads)."""
+    await redis_client.setex(key, ttl, codec.dumps(value))
+
+
+# ---------------------------
+# Server-Sent Events
+# ---------------------------
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {codec.dumps(data).decode()}\n\n"
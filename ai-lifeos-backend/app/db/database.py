@@ -1,16 +1,66 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Any, Dict
 from app.core.config import config
+from app.core.services import services
 from loguru import logger
 
-client = AsyncIOMotorClient(config.MONGO_URI)
-db = client.get_default_database()
 
-notes_collection = db["notes"]
-tasks_collection = db["tasks"]
-transcripts_collection = db["transcripts"]
+def _create_client():
+    from motor.motor_asyncio import AsyncIOMotorClient  # motor + pymongo take ~0.2s to import
 
-logger.info("MongoDB connected successfully")
+    client = AsyncIOMotorClient(config.MONGO_URI)
+    logger.info("MongoDB client created")
+    return client
 
-async def close_db_connection():
+
+def _close_client(client) -> None:
     logger.info("Closing MongoDB connection...")
     client.close()
+
+
+services.register("mongo", _create_client, requires=("MONGO_URI",), close=_close_client)
+
+
+class LazyCollection:
+    """
+    Stands in for a motor collection until the Mongo client exists. Resolves to the
+    real collection on first attribute access, and again if the client is replaced.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._client = None
+        self._collection = None
+
+    def _resolve(self):
+        client = services.get("mongo")
+        if client is not self._client:
+            self._collection = client.get_default_database()[self.name]
+            self._client = client
+        return self._collection
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+
+class LazyDatabase:
+    """The default database from MONGO_URI; db["users"] works before the client exists."""
+
+    def __init__(self):
+        self._collections: Dict[str, LazyCollection] = {}
+
+    def __getitem__(self, name: str) -> LazyCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = LazyCollection(name)
+        return collection
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(services.get("mongo").get_default_database(), attr)
+
+
+db = LazyDatabase()
+
+notes_collection = db["notes"]
+tasks_collection = db["tasks"]
+transcripts_collection = db["transcripts"]
+transcription_jobs_collection = db["transcription_jobs"]
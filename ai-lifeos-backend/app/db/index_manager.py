@@ -0,0 +1,156 @@
+"""
+Applies the index registry in app/models/indexes.py.
+
+Usage (from ai-lifeos-backend/):
+    python -m app.db.index_manager           # create missing indexes, print the report
+    python -m app.db.index_manager --check   # also explain() the hot queries; exit 1 on COLLSCAN
+"""
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, Iterator, List
+
+from loguru import logger
+from pymongo import TEXT
+
+from app.core.config import config
+from app.db.database import db
+from app.models.indexes import INDEXES, QUERY_SHAPES, IndexSpec
+
+
+class IndexManager:
+
+    # -------------------
+    # Registry sync
+    # -------------------
+    @staticmethod
+    async def _existing(collection: str) -> Dict[str, Dict[str, Any]]:
+        indexes = {}
+        async for index in db[collection].list_indexes():
+            if index["name"] != "_id_":
+                indexes[index["name"]] = index
+        return indexes
+
+    @staticmethod
+    def _same_keys(spec: IndexSpec, existing: Dict[str, Any]) -> bool:
+        if any(direction == TEXT for _, direction in spec.keys):
+            # Text indexes are stored as {_fts, _ftsx}; the indexed fields live in "weights"
+            return set(existing.get("weights", {})) == {key for key, direction in spec.keys if direction == TEXT}
+        return [(key, int(direction)) for key, direction in existing["key"].items()] == spec.keys
+
+    @staticmethod
+    async def ensure_indexes(create: bool = True) -> Dict[str, List[str]]:
+        """
+        Create registry indexes that don't exist yet (create_index is idempotent, so
+        only missing ones are sent). Returns created/missing/conflicting/extra index names
+        as "collection.name"; extra indexes are reported, never dropped.
+        """
+        report = {"created": [], "missing": [], "conflicting": [], "extra": [], "failed": []}
+        by_collection: Dict[str, List[IndexSpec]] = {}
+        for spec in INDEXES:
+            by_collection.setdefault(spec.collection, []).append(spec)
+
+        for collection, specs in by_collection.items():
+            try:
+                existing = await IndexManager._existing(collection)
+            except Exception as e:
+                logger.error(f"Failed to list indexes on {collection}: {e}")
+                report["failed"].extend(f"{collection}.{spec.name}" for spec in specs)
+                continue
+
+            for spec in specs:
+                qualified = f"{collection}.{spec.name}"
+                if spec.name in existing:
+                    if not IndexManager._same_keys(spec, existing[spec.name]):
+                        report["conflicting"].append(qualified)
+                    continue
+                if not create:
+                    report["missing"].append(qualified)
+                    continue
+                try:
+                    await db[collection].create_index(spec.keys, name=spec.name, **spec.options)
+                    report["created"].append(qualified)
+                except Exception as e:
+                    # e.g. duplicate emails already stored prevent the unique index
+                    logger.error(f"Failed to create index {qualified}: {e}")
+                    report["failed"].append(qualified)
+
+            declared = {spec.name for spec in specs}
+            report["extra"].extend(f"{collection}.{name}" for name in existing if name not in declared)
+
+        if report["created"]:
+            logger.info(f"Created indexes: {', '.join(report['created'])}")
+        for kind in ("missing", "conflicting", "extra", "failed"):
+            if report[kind]:
+                logger.warning(f"Indexes {kind}: {', '.join(report[kind])}")
+        return report
+
+    # -------------------
+    # Query plan check
+    # -------------------
+    @staticmethod
+    def _stages(plan: Any) -> Iterator[str]:
+        """Every stage name in an explain() plan tree (classic and SBE layouts)."""
+        if isinstance(plan, dict):
+            if "stage" in plan:
+                yield plan["stage"]
+            for value in plan.values():
+                yield from IndexManager._stages(value)
+        elif isinstance(plan, list):
+            for item in plan:
+                yield from IndexManager._stages(item)
+
+    @staticmethod
+    async def check_query_plans() -> Dict[str, str]:
+        """explain() every registered hot query; returns {query name: problem} for COLLSCANs."""
+        problems = {}
+        for shape in QUERY_SHAPES:
+            cursor = db[shape.collection].find(shape.filter)
+            if shape.sort:
+                cursor = cursor.sort(shape.sort)
+            try:
+                explain = await cursor.explain()
+            except Exception as e:
+                problems[shape.name] = f"explain failed: {e}"
+                continue
+            if "COLLSCAN" in IndexManager._stages(explain["queryPlanner"]["winningPlan"]):
+                problems[shape.name] = f"COLLSCAN on {shape.collection}"
+
+        for name, problem in problems.items():
+            logger.error(f"Query plan check failed for '{name}': {problem}")
+        return problems
+
+    @staticmethod
+    async def startup() -> None:
+        """Lifespan hook: apply the registry and, if MONGO_INDEX_CHECK is set, refuse to start on COLLSCAN."""
+        await IndexManager.ensure_indexes()
+        if config.MONGO_INDEX_CHECK:
+            problems = await IndexManager.check_query_plans()
+            if problems:
+                raise RuntimeError(f"Unindexed queries: {', '.join(problems)}")
+
+
+# -------------------
+# Instantiate manager
+# -------------------
+index_manager = IndexManager()
+
+
+async def _main(args) -> int:
+    report = await index_manager.ensure_indexes(create=not args.dry_run)
+    for kind, names in report.items():
+        print(f"{kind:<12} {', '.join(names) or '-'}")
+    failed = bool(report["failed"] or report["conflicting"] or (args.dry_run and report["missing"]))
+    if args.check:
+        problems = await index_manager.check_query_plans()
+        for name, problem in problems.items():
+            print(f"COLLSCAN     {name}: {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="explain() hot queries and fail on COLLSCAN")
+    parser.add_argument("--dry-run", action="store_true", help="report missing indexes without creating them")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -1,20 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-import uvicorn
 from loguru import logger
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Internal Imports
-from app.db.database import close_db_connection
-from app.core.logger import app_logger
+from app.core.logger import app_logger, flush_logging  # first, so import-time logs use the pipeline
+from app.core.middleware import RequestIdMiddleware
+from app.core.config import config
+from app.core.metrics import MetricsMiddleware, collect_stats, mark_worker_dead, render_metrics
+from app.core.responses import ORJSONResponse
+from app.core.services import services
+from app.db.index_manager import index_manager
+from app.core.utils import init_redis, close_redis
+from app.services.gemini_service import gemini_executor
+from app.services.auth_service import password_executor
+from app.services.db_service import invalidation_bus, note_search
+from app.services.speech_service import transcript_poller
+from app.services.task_interpreter import task_interpreter
 from app.core.exception_handler import (
     http_exception_handler,
     global_exception_handler
 )
 
 # Routers
-from app.routers import notes, tasks, speech, learning, auth  # 👈 Added auth router
+from app.routers import notes, tasks, speech, learning, auth, tts  # 👈 Added auth router
 
 # ---------------------------
 # Lifespan Manager
@@ -22,9 +32,29 @@ from app.routers import notes, tasks, speech, learning, auth  # 👈 Added auth
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app_logger.info("🚀 Starting up AI LifeOS Backend...")
+    if not config.JWT_SECRET:
+        raise RuntimeError("JWT_SECRET must be set")
+    services.warm(config.WARM_SERVICES)
+    await init_redis()
+    await index_manager.startup()
+    if services.configured("assemblyai"):
+        transcript_poller.start()
+    if services.configured("gemini"):
+        task_interpreter.start()
+    invalidation_bus.start()
+    await note_search.start()
     yield
-    await close_db_connection()
+    await note_search.stop()
+    await invalidation_bus.stop()
+    await task_interpreter.stop()
+    await transcript_poller.stop()
+    gemini_executor.shutdown()
+    password_executor.shutdown()
+    await services.close()
+    await close_redis()
+    mark_worker_dead()
     app_logger.info("🛑 Shutting down AI LifeOS Backend...")
+    flush_logging()
 
 # ---------------------------
 # FastAPI App Setup
@@ -33,6 +63,7 @@ app = FastAPI(
     title="AI LifeOS Backend",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------------------
@@ -45,6 +76,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, routes_app=app)
+if config.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)  # inside RequestIdMiddleware, so profiles are named by request id
+app.add_middleware(RequestIdMiddleware)  # outermost, so CORS and error responses carry the id too
 
 # ---------------------------
 # Exception Handlers
@@ -58,8 +94,16 @@ app.add_exception_handler(Exception, global_exception_handler)
 app.include_router(auth.router)       # 👈 New Authentication router
 app.include_router(notes.router)
 app.include_router(tasks.router)
-app.include_router(speech.router)
-app.include_router(learning.router)
+
+# Routers that only serve one provider are left out when its settings are missing
+for router, service in ((speech.router, "assemblyai"), (learning.router, "gemini"), (tts.router, "tts")):
+    if services.configured(service):
+        app.include_router(router)
+    else:
+        logger.warning(
+            f"{service} is not configured (set {', '.join(services.missing_settings(service))}); "
+            f"{router.prefix} routes disabled"
+        )
 
 # ---------------------------
 # Root Route
@@ -68,8 +112,22 @@ app.include_router(learning.router)
 async def root():
     return {"message": "AI LifeOS Backend is running ✅"}
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (sync, so the multiprocess file merge runs in the threadpool)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/metrics/stats", include_in_schema=False)
+def component_stats():
+    """Cache, pool and queue counters for the worker that answers (internal, like /metrics)."""
+    return collect_stats()
+
 # ---------------------------
 # Entry Point
 # ---------------------------
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
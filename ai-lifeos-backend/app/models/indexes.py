@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+# Relative field weights for note search (Mongo text index and the in-process engine)
+NOTE_TEXT_WEIGHTS: Dict[str, int] = {"title": 10, "summary": 5, "content": 1}
+
+# MongoDB index registry: every index the app relies on, applied at startup by
+# app.db.index_manager. Add an IndexSpec here instead of calling create_index().
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    name: str
+    keys: List[Tuple[str, Any]]  # direction is 1/-1 or "text"
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A hot query that must be served by an index (checked with explain())."""
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: List[Tuple[str, int]] = field(default_factory=list)
+
+
+INDEXES: List[IndexSpec] = [
+    # Users: login/signup lookup
+    IndexSpec("users", "email_unique", [("email", ASCENDING)], {"unique": True}),
+
+    # Notes: newest-first keyset pages, optionally filtered by tag (multikey)
+    IndexSpec("notes", "created_at_id", [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    IndexSpec("notes", "tags_created_at", [("tags", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+    IndexSpec(
+        "notes",
+        "text_search",
+        [(field, TEXT) for field in NOTE_TEXT_WEIGHTS],
+        {"weights": NOTE_TEXT_WEIGHTS, "default_language": "english"},
+    ),
+
+    # Tasks: newest-first keyset pages, optionally filtered by status/priority
+    IndexSpec("tasks", "created_at_id", [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    IndexSpec(
+        "tasks",
+        "status_priority_created_at",
+        [("status", ASCENDING), ("priority", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    ),
+
+    # Transcripts: one document per audio content hash (legacy docs without a hash are exempt)
+    IndexSpec(
+        "transcripts",
+        "content_hash_unique",
+        [("content_hash", ASCENDING)],
+        {"unique": True, "partialFilterExpression": {"content_hash": {"$type": "string"}}},
+    ),
+
+    # Transcription jobs: orphan takeover scans unfinished jobs by lease
+    IndexSpec("transcription_jobs", "status_lease_until", [("status", ASCENDING), ("lease_until", ASCENDING)]),
+]
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("user by email", "users", {"email": "user@example.com"}),
+    QueryShape("notes page", "notes", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape("notes by tag", "notes", {"tags": {"$all": ["work"]}}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape("notes text search", "notes", {"$text": {"$search": "python"}}),
+    QueryShape("tasks page", "tasks", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape("tasks by status", "tasks", {"status": "pending"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    QueryShape(
+        "tasks by status and priority",
+        "tasks",
+        {"status": "pending", "priority": "high"},
+        [("created_at", DESCENDING), ("_id", DESCENDING)],
+    ),
+    QueryShape("transcript by hash", "transcripts", {"content_hash": "0" * 64}),
+    QueryShape(
+        "orphaned transcription jobs",
+        "transcription_jobs",
+        {
+            "status": {"$in": ["queued", "processing"]},
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": datetime(2000, 1, 1)}}],
+        },
+    ),
+]
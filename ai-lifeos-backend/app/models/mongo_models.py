@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 # MongoDB document models (for validation on insert/update)
@@ -9,6 +9,20 @@ class TranscriptDoc(BaseModel):
     confidence: float
     duration: float
     user_id: Optional[str] = None  # For multi-user scalability
+    content_hash: Optional[str] = None  # SHA-256 of the uploaded audio, unique when present
+
+
+class TranscriptionJobDoc(BaseModel):
+    transcript_id: str
+    audio_url: str
+    status: str = "queued"  # queued | processing | completed | error
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    user_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    lease_until: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class NoteDoc(BaseModel):
@@ -24,4 +38,6 @@ class TaskDoc(BaseModel):
     description: str
     priority: str
     status: str = "pending"
+    raw_description: Optional[str] = None  # the submitted text, once interpretation replaced it
+    interpretation_status: str = "skipped"  # pending (queued) | done | failed | skipped
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 # Shared base for timestamps
@@ -7,6 +7,16 @@ class TimestampedModel(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
 
+# -------------------
+# Auth Schemas
+# -------------------
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: str
+    all_sessions: bool = False
+
 # -------------------
 # Speech Schemas
 # -------------------
@@ -19,6 +29,15 @@ class TranscriptResponse(BaseModel):
     confidence: float
     duration: float
 
+class TranscriptionJobRequest(BaseModel):
+    audio_url: str
+
+class TranscriptionJobResponse(BaseModel):
+    job_id: str
+    status: str
+    transcript: Optional[TranscriptResponse] = None
+    error: Optional[str] = None
+
 # -------------------
 # Notes Schemas
 # -------------------
@@ -36,6 +55,23 @@ class NoteSummaryResponse(BaseModel):
     summary: str
     key_points: List[str]
 
+# Stored documents as sent by the list/get/search endpoints. Those return them as read
+# (ORJSONResponse), so these models document the shape and never re-validate it; every
+# field but _id is optional because ?fields= can project the rest away.
+class NoteOut(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(alias="_id")
+    title: Optional[str] = None
+    content: Optional[str] = None
+    summary: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class NoteSearchHit(NoteOut):
+    score: Optional[float] = None  # memory engine only
+
 # -------------------
 # Tasks Schemas
 # -------------------
@@ -52,6 +88,41 @@ class TaskResponse(BaseModel):
     task_id: str
     description: str
     status: str = "pending"
+    interpretation_status: str = "pending"
+
+class TaskOut(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(alias="_id")
+    description: Optional[str] = None
+    raw_description: Optional[str] = None  # as submitted, once interpretation rewrote it
+    priority: Optional[str] = None
+    status: Optional[str] = None
+    interpretation_status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+# -------------------
+# Bulk Schemas (notes and tasks)
+# -------------------
+class BulkOperation(BaseModel):
+    op: str  # create | update | delete
+    id: Optional[str] = None  # required for update/delete
+    data: Optional[Dict[str, Any]] = None  # NoteCreate/TaskCreate or NoteUpdate/TaskUpdate fields
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+
+class BulkItemResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: str  # created | updated | deleted | not_found | invalid | error
+    error: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+    counts: Dict[str, int]
 
 # -------------------
 # Learning Schemas
@@ -69,6 +140,7 @@ class LearningSuggestionResponse(BaseModel):
 class TTSRequest(BaseModel):
     text: str
     voice: str = "en-US-Standard-A"  # Default Google voice
+    encoding: str = "LINEAR16"  # LINEAR16 (wav), MP3 or OGG_OPUS
 
 class TTSResponse(BaseModel):
     audio_url: str  # Signed URL or base64
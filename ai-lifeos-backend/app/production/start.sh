@@ -1,3 +1,10 @@
 #!/bin/bash
 echo " Starting AI-LifeOS Backend..."
+
+# Workers write metrics to per-process files here and /metrics aggregates them;
+# files left by a previous run would be counted again, so start empty.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/ai-lifeos-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4
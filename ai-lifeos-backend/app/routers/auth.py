@@ -1,12 +1,31 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.auth_utils import auth_cache_stats, revoke_access_token, verify_token
+from app.core.config import config
+from app.core.executor import ExecutorBusyError, ExecutorTimeoutError
+from app.core.metrics import register_stats
+from app.models.schemas import LogoutRequest, RefreshRequest
 from app.models.user_model import User
-from app.services.auth_service import signup_user, login_user
+from app.services.auth_service import signup_user, login_user, logout_user, refresh_session, password_executor
+from app.services.token_service import token_service
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please try again",
+        headers={"Retry-After": str(config.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
 @router.post("/signup")
 async def signup(user: User):
-    result = await signup_user(user)
+    try:
+        result = await signup_user(user)
+    except (ExecutorBusyError, ExecutorTimeoutError):
+        raise _password_pool_busy()
     if "error" in result:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result["error"])
     return result
@@ -15,7 +34,42 @@ async def signup(user: User):
 async def login(data: dict):
     email = data.get("email")
     password = data.get("password")
-    result = await login_user(email, password)
+    try:
+        result = await login_user(email, password)
+    except (ExecutorBusyError, ExecutorTimeoutError):
+        raise _password_pool_busy()
     if "error" in result:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result["error"])
     return result
+
+@router.post("/refresh")
+async def refresh(request: RefreshRequest):
+    try:
+        return await refresh_session(request.refresh_token)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+@router.post("/logout")
+async def logout(
+    request: LogoutRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
+    try:
+        result = await logout_user(request.refresh_token, request.all_sessions)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if credentials:
+        # Also deny the presented access token when the denylist is enabled
+        try:
+            await revoke_access_token(verify_token(credentials.credentials))
+        except HTTPException:
+            pass  # already invalid or expired
+    return result
+
+
+# Served internally at /metrics/stats: pool saturation and token counters would help an attacker
+register_stats("auth.password_pool", password_executor.stats)
+register_stats("auth.refresh_tokens", token_service.stats)
+register_stats("auth.token_cache", auth_cache_stats)
@@ -1,11 +1,53 @@
-from fastapi import APIRouter
-from app.services.gemini_service import gemini_service
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from app.core.executor import ExecutorBusyError
+from app.core.metrics import register_stats
+from app.core.utils import format_sse
+from app.services.gemini_service import gemini_service, suggestion_cache
 from app.models.schemas import LearningSuggestionRequest, LearningSuggestionResponse
 
 router = APIRouter(prefix="/api/learning", tags=["learning"])
 
+
 @router.post("/suggest", response_model=LearningSuggestionResponse)
 async def get_suggestion(request: LearningSuggestionRequest):
     """Get personalized learning suggestion via Gemini."""
-    data = await gemini_service.generate_learning_suggestion(request.user_input)
-    return LearningSuggestionResponse(**data)
\ No newline at end of file
+    try:
+        data = await gemini_service.generate_learning_suggestion(request.user_input)
+    except ExecutorBusyError:
+        raise HTTPException(status_code=503, detail="Learning service is busy, please retry shortly")
+    return LearningSuggestionResponse(**data)
+
+
+@router.post("/suggest/stream")
+async def stream_suggestion(request: LearningSuggestionRequest):
+    """Stream a learning suggestion as Server-Sent Events (chunk, resources, done)."""
+    events = gemini_service.stream_learning_suggestion(request.user_input)
+
+    # Pull the first event before responding so saturation still maps to a plain 503
+    try:
+        first = await events.__anext__()
+    except ExecutorBusyError:
+        raise HTTPException(status_code=503, detail="Learning service is busy, please retry shortly")
+
+    async def event_stream():
+        yield format_sse(*first)
+        try:
+            async for event, data in events:
+                yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"Streaming suggestion failed: {e}")
+            yield format_sse("error", {"detail": "Suggestion stream failed"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Hit/miss/coalesced counters, served internally at /metrics/stats
+register_stats("learning.suggestion_cache", suggestion_cache.stats)
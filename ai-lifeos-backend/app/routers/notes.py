@@ -1,23 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.auth_utils import verify_token
-from app.services.db_service import db_service
-from app.models.schemas import NoteCreate, NoteUpdate
+from fastapi import APIRouter, HTTPException, Depends, Query
+from app.core.auth_utils import get_current_user
+from app.core.config import config
+from app.core.metrics import register_stats
+from app.core.pagination import parse_fields
+from app.core.responses import ORJSONResponse
+from app.services.db_service import db_service, note_cache, note_search
+from app.models.schemas import BulkRequest, BulkResponse, NoteCreate, NoteOut, NoteSearchHit, NoteUpdate
 from app.models.mongo_models import NoteDoc
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from bson import ObjectId
-
-# -----------------------
-# JWT Authentication Setup
-# -----------------------
-security = HTTPBearer()
-
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_token(token)
-    return payload
-
+from typing import List, Dict, Optional
+from datetime import datetime
 
 # -----------------------
 # Router Setup (all routes protected)
@@ -33,18 +25,56 @@ router = APIRouter(
 # Response Schema
 # -----------------------
 class NoteListResponse(BaseModel):
-    notes: List[Dict[str, Any]]
+    notes: List[NoteOut]
+    next_cursor: Optional[str] = None
 
 
 # -----------------------
-# Get all notes
+# List notes (newest first, cursor-paginated)
 # -----------------------
 @router.get("/", response_model=NoteListResponse)
-async def get_notes():
-    notes = await db_service.get_notes()
-    for note in notes:
-        note["_id"] = str(note["_id"])
-    return {"notes": notes}
+async def get_notes(
+    limit: int = Query(config.LIST_PAGE_SIZE_DEFAULT, ge=1, le=config.LIST_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    tags: Optional[List[str]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. title,tags"),
+):
+    try:
+        notes, next_cursor = await db_service.get_notes(
+            limit=limit,
+            cursor=cursor,
+            tags=tags,
+            created_after=created_after,
+            created_before=created_before,
+            fields=parse_fields(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse({"notes": notes, "next_cursor": next_cursor})
+
+
+# -----------------------
+# Full-text search (ranked, offset-paginated)
+# -----------------------
+class NoteSearchResponse(BaseModel):
+    results: List[NoteSearchHit]
+    next_offset: Optional[int] = None
+
+
+@router.get("/search", response_model=NoteSearchResponse)
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=256),
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=config.LIST_PAGE_SIZE_MAX),
+    offset: int = Query(0, ge=0, le=10_000),
+):
+    try:
+        results, next_offset = await db_service.search_notes(q, tags=tags, limit=limit, offset=offset)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return ORJSONResponse({"results": results, "next_offset": next_offset})
 
 
 # -----------------------
@@ -57,16 +87,25 @@ async def create_note(note: NoteCreate):
     return {"note_id": note_id}
 
 
+# -----------------------
+# Bulk create/update/delete (unordered, per-item results)
+# -----------------------
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_notes(request: BulkRequest):
+    if len(request.operations) > config.BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {config.BULK_MAX_OPERATIONS} operations per request")
+    return await db_service.bulk_notes(request.operations)
+
+
 # -----------------------
 # Get note by ID
 # -----------------------
-@router.get("/{note_id}", response_model=Dict[str, Any])
+@router.get("/{note_id}", response_model=NoteOut)
 async def get_note_by_id(note_id: str):
     note = await db_service.get_note_by_id(note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    note["_id"] = str(note["_id"])
-    return note
+    return ORJSONResponse(note)
 
 
 # -----------------------
@@ -92,3 +131,8 @@ async def delete_note(note_id: str):
     if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
     return {"message": "Note deleted successfully"}
+
+
+# Read cache and search index counters, served internally at /metrics/stats
+register_stats("notes.read_cache", note_cache.stats)
+register_stats("notes.search", note_search.stats)
@@ -1,26 +1,167 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.speech_service import speech_service
-from app.models.schemas import TranscriptResponse
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Header
+from fastapi.responses import StreamingResponse
+from app.core import codec
+from app.core.cache import SingleFlight
+from app.core.config import config
+from app.core.metrics import register_stats
+from app.core.responses import ORJSONResponse
+from app.core.utils import format_sse, get_redis_client
+from app.services.speech_service import TranscriptionPendingError, speech_service, job_channel
+from app.services.upload_service import audio_uploader, iter_upload_file, hash_upload_file, UploadTooLargeError
+from app.models.schemas import TranscriptResponse, TranscriptionJobRequest, TranscriptionJobResponse
 from loguru import logger
-import aiofiles
 
 router = APIRouter(prefix="/api/speech", tags=["speech"])
 
-@router.post("/upload-and-transcribe", response_model=TranscriptResponse)
-async def upload_and_transcribe(audio_file: UploadFile = File(...)):
-    """Upload audio file and get transcription via AssemblyAI."""
-    temp_path = f"/tmp/{audio_file.filename}"
+TERMINAL_JOB_STATUSES = ("completed", "error")
+
+# Identical uploads arriving together on this worker share one upload + transcription
+upload_flight = SingleFlight()
 
-    # Non-blocking write
-    async with aiofiles.open(temp_path, "wb") as f:
-        content = await audio_file.read()
-        await f.write(content)
 
+async def _upload_or_fail(source):
     try:
-        # Replace with actual S3/public URL upload
-        audio_url = "https://your-s3-bucket/audio.wav"
-        transcript = await speech_service.transcribe_audio(audio_url)
-        return transcript
+        return await audio_uploader.upload(source)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
-        logger.error(f"Transcription failed: {e}")
-        raise HTTPException(status_code=500, detail="Transcription failed")
+        logger.error(f"Audio upload failed: {e}")
+        raise HTTPException(status_code=502, detail="Audio upload failed")
+
+
+@router.post(
+    "/upload-and-transcribe",
+    response_model=TranscriptResponse,
+    responses={202: {"model": TranscriptionJobResponse, "description": "Still transcribing; poll the job"}},
+)
+async def upload_and_transcribe(audio_file: UploadFile = File(...)):
+    """
+    Upload audio file and get transcription via AssemblyAI. Audio is identified by its
+    SHA-256, so a recording that was transcribed before is answered from storage.
+    Transcriptions that take longer than TRANSCRIPTION_WAIT_SECONDS get a 202 with the
+    job id to follow at /jobs/{job_id}.
+    """
+    content_hash = await hash_upload_file(audio_file, config.UPLOAD_CHUNK_BYTES)
+
+    async def upload_and_wait():
+        existing = await speech_service.find_transcript_by_hash(content_hash)
+        if existing:
+            return existing
+        uploaded = await _upload_or_fail(iter_upload_file(audio_file, config.UPLOAD_CHUNK_BYTES))
+        try:
+            return await speech_service.transcribe_audio(uploaded["upload_url"], content_hash=content_hash)
+        except TranscriptionPendingError:
+            raise
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise HTTPException(status_code=500, detail="Transcription failed")
+
+    try:
+        transcript, _ = await upload_flight.do(content_hash, upload_and_wait)
+    except TranscriptionPendingError as e:
+        job = await speech_service.get_job(e.job_id)
+        pending = TranscriptionJobResponse(job_id=e.job_id, status=job["status"] if job else "processing")
+        return ORJSONResponse(pending, status_code=202, headers={"Location": f"{router.prefix}/jobs/{e.job_id}"})
+    return transcript
+
+
+@router.post("/upload-stream", response_model=TranscriptionJobResponse, status_code=202)
+async def upload_stream(request: Request, x_content_sha256: Optional[str] = Header(None)):
+    """
+    Stream a raw audio request body (not multipart) straight to the provider in
+    fixed-size chunks, then start a transcription job for it.
+
+    The body is hashed while it streams; known audio gets an already-completed job.
+    Clients that send X-Content-SHA256 for known audio skip the upload entirely.
+    """
+    if x_content_sha256:
+        existing = await speech_service.find_transcript_by_hash(x_content_sha256.lower())
+        if existing:
+            job = await speech_service.record_duplicate_job("", x_content_sha256.lower(), existing)
+            return TranscriptionJobResponse(job_id=job["_id"], status=job["status"], transcript=existing)
+
+    uploaded = await _upload_or_fail(request.stream())
+
+    existing = await speech_service.find_transcript_by_hash(uploaded["sha256"])
+    if existing:
+        job = await speech_service.record_duplicate_job(uploaded["upload_url"], uploaded["sha256"], existing)
+        return TranscriptionJobResponse(job_id=job["_id"], status=job["status"], transcript=existing)
+
+    try:
+        job = await speech_service.submit_job(uploaded["upload_url"], content_hash=uploaded["sha256"])
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return TranscriptionJobResponse(job_id=job["_id"], status=job["status"])
+
+
+# Upload counters, including the peak bytes buffered by one upload (served at /metrics/stats)
+register_stats("speech.uploads", audio_uploader.stats)
+
+
+# -----------------------
+# Transcription jobs
+# -----------------------
+@router.post("/jobs", response_model=TranscriptionJobResponse, status_code=202)
+async def submit_transcription_job(request: TranscriptionJobRequest):
+    """Start a transcription and return its job id right away."""
+    try:
+        job = await speech_service.submit_job(request.audio_url)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return TranscriptionJobResponse(job_id=job["_id"], status=job["status"])
+
+
+@router.get("/jobs/{job_id}", response_model=TranscriptionJobResponse)
+async def get_transcription_job(job_id: str):
+    """Current status of a job, with the transcript once completed."""
+    job = await speech_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_transcription_job(job_id: str):
+    """Push job status changes as Server-Sent Events until the job finishes."""
+    job = await speech_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        yield format_sse("status", job)
+        if job["status"] in TERMINAL_JOB_STATUSES:
+            return
+
+        try:
+            redis_client = await get_redis_client()
+            pubsub = redis_client.pubsub()
+            await pubsub.subscribe(job_channel(job_id))
+        except Exception as e:
+            logger.warning(f"Redis subscribe failed, falling back to polling: {e}")
+            pubsub = None
+
+        try:
+            while True:
+                if pubsub:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+                    current = codec.loads(message["data"]) if message else await speech_service.get_job(job_id)
+                else:
+                    await asyncio.sleep(2)
+                    current = await speech_service.get_job(job_id)
+                if not current:
+                    break
+                yield format_sse("status", current)
+                if current["status"] in TERMINAL_JOB_STATUSES:
+                    break
+        finally:
+            if pubsub:
+                await pubsub.unsubscribe(job_channel(job_id))
+                await pubsub.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,53 +1,97 @@
-from fastapi import APIRouter, HTTPException
-from app.services.gemini_service import gemini_service
-from app.services.db_service import db_service
-from app.models.schemas import TaskCreate, TaskResponse, TaskUpdate
+from fastapi import APIRouter, HTTPException, Query
+from app.services.db_service import db_service, task_cache
+from app.services.task_interpreter import task_interpreter
+from app.models.schemas import BulkRequest, BulkResponse, TaskCreate, TaskOut, TaskResponse, TaskUpdate
 from app.models.mongo_models import TaskDoc
-from typing import List, Dict, Any
+from pydantic import BaseModel
+from typing import List, Dict, Optional
+from datetime import datetime
 from fastapi import Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.auth_utils import verify_token
-
-security = HTTPBearer()
-
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_token(token)
-    return payload
+from app.core.auth_utils import get_current_user
+from app.core.config import config
+from app.core.metrics import register_stats
+from app.core.pagination import parse_fields
+from app.core.responses import ORJSONResponse
+from app.core.services import services
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
 # -----------------------
 # Create a new task
+# Stored as submitted; Gemini rewrites the description in the background
+# (task_interpreter) and interpretation_status tracks it
 # -----------------------
 @router.post("/create", response_model=TaskResponse)
 async def create_task(task: TaskCreate, user=Depends(get_current_user)):  # 👈 only logged-in users
-    interpreted = await gemini_service.interpret_text(task.description, "Extract task from text")
-    doc = TaskDoc(description=interpreted, priority=task.priority)
+    interpret = services.configured("gemini")
+    doc = TaskDoc(
+        description=task.description,
+        priority=task.priority,
+        interpretation_status="pending" if interpret else "skipped",
+    )
     task_id = await db_service.insert_task(doc)
-    return TaskResponse(task_id=task_id, description=doc.description, status=doc.status)
+    if interpret and not await task_interpreter.enqueue(task_id):
+        doc.interpretation_status = "failed"
+        await db_service.set_task_interpretation_status(task_id, "failed")
+    return TaskResponse(
+        task_id=task_id,
+        description=doc.description,
+        status=doc.status,
+        interpretation_status=doc.interpretation_status,
+    )
+
+
+# -----------------------
+# Bulk create/update/delete (unordered, per-item results)
+# -----------------------
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_tasks(request: BulkRequest, user=Depends(get_current_user)):
+    if len(request.operations) > config.BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {config.BULK_MAX_OPERATIONS} operations per request")
+    return await db_service.bulk_tasks(request.operations)
 
 
 # -----------------------
-# Get all tasks
+# List tasks (newest first, cursor-paginated)
 # -----------------------
-@router.get("/", response_model=List[Dict[str, Any]])
-async def get_tasks():
-    tasks = await db_service.get_tasks()
-    for task in tasks:
-        task["_id"] = str(task["_id"])
-    return tasks
+class TaskListResponse(BaseModel):
+    tasks: List[TaskOut]
+    next_cursor: Optional[str] = None
+
+
+@router.get("/", response_model=TaskListResponse)
+async def get_tasks(
+    limit: int = Query(config.LIST_PAGE_SIZE_DEFAULT, ge=1, le=config.LIST_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. description,status"),
+):
+    try:
+        tasks, next_cursor = await db_service.get_tasks(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            priority=priority,
+            created_after=created_after,
+            created_before=created_before,
+            fields=parse_fields(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse({"tasks": tasks, "next_cursor": next_cursor})
 
 # -----------------------
 # Get task by ID
 # -----------------------
-@router.get("/{task_id}", response_model=Dict[str, Any])
+@router.get("/{task_id}", response_model=TaskOut)
 async def get_task_by_id(task_id: str):
     task = await db_service.get_task_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    task["_id"] = str(task["_id"])
-    return task
+    return ORJSONResponse(task)
 
 # -----------------------
 # Update task fields
@@ -78,3 +122,7 @@ async def delete_task(task_id: str):
     if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"message": "Task deleted successfully"}
+
+
+# Read cache counters, served internally at /metrics/stats
+register_stats("tasks.read_cache", task_cache.stats)
@@ -0,0 +1,103 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from loguru import logger
+from app.core.auth_utils import get_current_user
+from app.core.config import config
+from app.core.metrics import register_stats
+from app.models.schemas import TTSRequest
+from app.services.tts_service import AUDIO_FORMATS, audio_cache, tts_service
+
+router = APIRouter(prefix="/api/tts", tags=["tts"])
+
+# Audio for a key never changes, so clients and proxies may keep it indefinitely
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+async def _send_file(f):
+    try:
+        while True:
+            chunk = await f.read(FILE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await f.close()
+
+
+@router.post("/synthesize")
+async def synthesize(
+    request: TTSRequest,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Synthesize speech and stream the audio file. Audio is cached on disk by
+    (text, voice, encoding), so repeated phrases are served without calling Google.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text must not be empty")
+    if len(request.text.encode("utf-8")) > config.TTS_MAX_TEXT_BYTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Text exceeds {config.TTS_MAX_TEXT_BYTES} bytes; use /api/tts/synthesize/stream",
+        )
+    if request.encoding not in AUDIO_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Encoding must be one of {', '.join(AUDIO_FORMATS)}")
+
+    try:
+        path, audio, cached = await tts_service.open_audio(request.text, request.voice, request.encoding)
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    # The file name is the content key, which makes a stable validator across workers
+    etag = f'"{os.path.basename(path).rsplit(".", 1)[0]}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "X-TTS-Cache": "hit" if cached else "miss"}
+    if if_none_match == etag:
+        await audio.close()
+        return Response(status_code=304, headers=headers)
+    # Served from the open file rather than the path, which the cache may evict meanwhile
+    headers["Content-Length"] = str(os.fstat(audio.fileno()).st_size)
+    return StreamingResponse(_send_file(audio), media_type=AUDIO_FORMATS[request.encoding][1], headers=headers)
+
+
+@router.post("/synthesize/stream")
+async def synthesize_stream(request: TTSRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Read long text (a whole note or suggestion) aloud as one streamed LINEAR16 WAV.
+    The text is split at sentence boundaries and synthesized a few chunks ahead of
+    playback, so time to first audio doesn't grow with the length of the text.
+    """
+    if len(request.text.encode("utf-8")) > config.TTS_LONG_TEXT_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"Text exceeds {config.TTS_LONG_TEXT_MAX_BYTES} bytes")
+    if request.encoding != "LINEAR16":
+        raise HTTPException(status_code=400, detail="Streaming synthesis only supports LINEAR16")
+
+    audio = tts_service.stream_long_speech(request.text, request.voice)
+
+    # Wait for the header (i.e. the first chunk) so an early failure is still a plain error status
+    try:
+        header = await audio.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    async def body():
+        yield header
+        try:
+            async for pcm in audio:
+                yield pcm
+        except Exception as e:
+            # Headers are already sent; ending early leaves a playable, truncated WAV
+            logger.error(f"Streaming synthesis failed: {e}")
+        finally:
+            await audio.aclose()
+
+    return StreamingResponse(body(), media_type="audio/wav", headers={"X-Accel-Buffering": "no"})
+
+
+# Disk audio cache counters, served internally at /metrics/stats
+register_stats("tts.audio_cache", audio_cache.stats)
@@ -1,25 +1,44 @@
 from passlib.context import CryptContext
 from app.models.user_model import User
 from app.core.auth_utils import create_access_token
+from app.core.config import config
+from app.core.executor import BoundedExecutor
 from app.db.database import db
+from app.services.token_service import token_service
+from loguru import logger
+from pymongo.errors import DuplicateKeyError
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def hash_password(password: str):
-    return pwd_context.hash(password)
+# bcrypt releases the GIL while hashing, so threads give real parallelism and the
+# event loop stays free; excess logins are rejected with ExecutorBusyError
+password_executor = BoundedExecutor(
+    name="password",
+    max_concurrency=config.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=config.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=config.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+    call_timeout=config.PASSWORD_HASH_CALL_TIMEOUT_SECONDS,
+)
 
-def verify_password(plain, hashed):
-    return pwd_context.verify(plain, hashed)
+async def hash_password(password: str):
+    return await password_executor.run(pwd_context.hash, password)
+
+async def verify_password(plain, hashed):
+    return await password_executor.run(pwd_context.verify, plain, hashed)
 
 async def signup_user(user_data: User):
     existing_user = await db["users"].find_one({"email": user_data.email})
     if existing_user:
         return {"error": "User already exists"}
 
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await hash_password(user_data.password)
     user_dict = user_data.dict()
     user_dict["password"] = hashed_pw
-    await db["users"].insert_one(user_dict)
+    try:
+        await db["users"].insert_one(user_dict)
+    except DuplicateKeyError:
+        # Concurrent signup with the same email lost the race on email_unique
+        return {"error": "User already exists"}
     return {"message": "User created successfully"}
 
 async def login_user(email: str, password: str):
@@ -27,8 +46,27 @@ async def login_user(email: str, password: str):
     if not user:
         return {"error": "User not found"}
 
-    if not verify_password(password, user["password"]):
+    if not await verify_password(password, user["password"]):
         return {"error": "Invalid credentials"}
 
     token = create_access_token({"sub": user["email"]})
-    return {"access_token": token, "token_type": "bearer"}
+    result = {"access_token": token, "token_type": "bearer"}
+    try:
+        result["refresh_token"] = await token_service.issue(user["email"])
+    except RuntimeError as e:
+        # Still let the user in; they'll just have to log in again when the access token expires
+        logger.warning(f"Login without refresh token for {user['email']}: {e}")
+    return result
+
+async def refresh_session(refresh_token: str):
+    """New access + refresh token pair for a valid refresh token (no Mongo or bcrypt)."""
+    sub, new_refresh_token = await token_service.rotate(refresh_token)
+    return {
+        "access_token": create_access_token({"sub": sub}),
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+    }
+
+async def logout_user(refresh_token: str, all_sessions: bool = False):
+    await token_service.revoke(refresh_token, all_sessions)
+    return {"message": "Logged out"}
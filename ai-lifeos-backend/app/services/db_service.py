@@ -1,66 +1,341 @@
-import motor.motor_asyncio
 from bson import ObjectId
-from typing import List, Dict, Any
-from app.db.database import notes_collection, tasks_collection, transcripts_collection
-from app.models.mongo_models import TranscriptDoc, NoteDoc, TaskDoc
+from typing import List, Dict, Any, Optional, Tuple
+from app.db.database import (
+    notes_collection,
+    tasks_collection,
+    transcripts_collection,
+    transcription_jobs_collection,
+)
+from app.models.mongo_models import TranscriptDoc, TranscriptionJobDoc, NoteDoc, TaskDoc
+from app.models.schemas import BulkOperation, NoteCreate, NoteUpdate, TaskCreate, TaskUpdate
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.cache import InvalidationBus, LRUCache, TwoTierCache
+from app.core.pagination import SORT_NEWEST_FIRST, build_projection, date_range, encode_cursor, keyset_filter
+from app.core.config import config
+from app.core.metrics import observe_db
+from app.services.search_service import make_note_search
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
+
+invalidation_bus = InvalidationBus(config.READ_CACHE_CHANNEL)
+
+
+def _read_cache(namespace: str) -> TwoTierCache:
+    return TwoTierCache(
+        namespace,
+        LRUCache(config.READ_CACHE_LOCAL_MAX_ITEMS, config.READ_CACHE_LOCAL_TTL_SECONDS),
+        config.READ_CACHE_REDIS_TTL_SECONDS,
+        invalidation_bus,
+    )
+
+
+note_cache = _read_cache("notes")
+task_cache = _read_cache("tasks")
+note_search = make_note_search(config.NOTES_SEARCH_ENGINE, invalidation_bus, config.NOTES_SEARCH_REBUILD_SECONDS)
+
+
+NOTE_FIELDS = set(NoteDoc.__fields__) | {"_id"}
+TASK_FIELDS = set(TaskDoc.__fields__) | {"_id"}
+
 
 class DBService:
 
+    # -------------------
+    # Pagination
+    # -------------------
+    @staticmethod
+    async def _list_page(
+        collection,
+        query: Dict[str, Any],
+        limit: int,
+        projection: Optional[Dict[str, int]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of `query` (already keyset-filtered) plus the next cursor, None on the last page."""
+        limit = max(1, min(limit, config.LIST_PAGE_SIZE_MAX))
+        # Fetch one extra row to learn whether another page exists without a count()
+        docs = await collection.find(query, projection) \
+            .sort(SORT_NEWEST_FIRST) \
+            .limit(limit + 1) \
+            .to_list(length=limit + 1)
+        next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+        return docs[:limit], next_cursor  # _id stays an ObjectId; ORJSONResponse converts it
+
+    # -------------------
+    # Bulk writes
+    # -------------------
+    @staticmethod
+    async def _bulk_write(
+        collection,
+        operations: List[BulkOperation],
+        create_model,
+        update_model,
+        doc_model,
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """
+        Run mixed create/update/delete operations as one unordered bulk_write.
+        Returns per-item results (same order as `operations`) and the ids that were
+        written and deleted, for cache/search maintenance. Items are independent:
+        an invalid or failing item never stops the others, and there is no ordering
+        between items, so clients should collapse edits to one operation per id.
+        """
+        now = datetime.utcnow()
+        results = [{"index": i, "op": op.op, "id": op.id, "status": "error", "error": None}
+                   for i, op in enumerate(operations)]
+        requests, request_items = [], []
+
+        # Updates/deletes of missing documents are reported per item, so look them up first
+        target_ids = set()
+        for op in operations:
+            if op.op in ("update", "delete") and op.id and ObjectId.is_valid(op.id):
+                target_ids.add(ObjectId(op.id))
+        existing = set()
+        if target_ids:
+            async for doc in collection.find({"_id": {"$in": list(target_ids)}}, {"_id": 1}):
+                existing.add(doc["_id"])
+
+        for i, op in enumerate(operations):
+            result = results[i]
+            try:
+                if op.op == "create":
+                    doc = doc_model(**create_model(**(op.data or {})).dict()).dict()
+                    doc["_id"] = ObjectId()  # pre-assigned so the result can carry the id
+                    doc["created_at"] = now
+                    result["id"] = str(doc["_id"])
+                    request = InsertOne(doc)
+                elif op.op in ("update", "delete"):
+                    if not (op.id and ObjectId.is_valid(op.id)):  # ObjectId(None) would mint a new id
+                        raise ValueError(f"Invalid id: {op.id!r}")
+                    oid = ObjectId(op.id)
+                    if oid not in existing:
+                        result["status"] = "not_found"
+                        continue
+                    if op.op == "delete":
+                        request = DeleteOne({"_id": oid})
+                    else:
+                        fields = update_model(**(op.data or {})).dict(exclude_unset=True)
+                        if not fields:
+                            raise ValueError("No fields to update")
+                        fields["updated_at"] = now
+                        request = UpdateOne({"_id": oid}, {"$set": fields})
+                else:
+                    raise ValueError(f"Unknown op: {op.op}")
+            except (ValueError, TypeError) as e:
+                result["status"] = "invalid"
+                result["error"] = str(e)
+                continue
+            requests.append(request)
+            request_items.append(i)
+
+        failed: Dict[int, str] = {}
+        if requests:
+            try:
+                await collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed[request_items[error["index"]]] = error.get("errmsg", "Write failed")
+            except Exception as e:
+                logger.error(f"Bulk write on {collection.name} failed: {e}")
+                failed = {i: "Database error" for i in request_items}
+
+        done = {"create": "created", "update": "updated", "delete": "deleted"}
+        written, deleted = [], []
+        for i in request_items:
+            result = results[i]
+            if i in failed:
+                result["error"] = failed[i]
+                if result["op"] == "create":
+                    result["id"] = None
+                continue
+            result["status"] = done[result["op"]]
+            (deleted if result["op"] == "delete" else written).append(result["id"])
+        return results, written, deleted
+
+    @staticmethod
+    def _bulk_counts(results: List[Dict[str, Any]]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return counts
+
+    @staticmethod
+    @observe_db
+    async def bulk_notes(operations: List[BulkOperation]) -> Dict[str, Any]:
+        results, written, deleted = await DBService._bulk_write(
+            notes_collection, operations, NoteCreate, NoteUpdate, NoteDoc
+        )
+        await note_cache.invalidate_many(written + deleted)
+        await note_search.notes_changed(written)
+        await note_search.notes_deleted(deleted)
+        counts = DBService._bulk_counts(results)
+        logger.info(f"Bulk notes: {counts}")
+        return {"results": results, "counts": counts}
+
+    @staticmethod
+    @observe_db
+    async def bulk_tasks(operations: List[BulkOperation]) -> Dict[str, Any]:
+        # Bulk creates store descriptions as sent: they replay tasks the client already created
+        results, written, deleted = await DBService._bulk_write(
+            tasks_collection, operations, TaskCreate, TaskUpdate, TaskDoc
+        )
+        await task_cache.invalidate_many(written + deleted)
+        counts = DBService._bulk_counts(results)
+        logger.info(f"Bulk tasks: {counts}")
+        return {"results": results, "counts": counts}
+
     # -------------------
     # Transcripts
     # -------------------
     @staticmethod
+    @observe_db
     async def insert_transcript(transcript: TranscriptDoc) -> str:
         try:
             doc = transcript.dict()
             result = await transcripts_collection.insert_one(doc)
-            logger.info(f"Inserted transcript: {result.inserted_id}")
+            logger.debug(f"Inserted transcript: {result.inserted_id}")
             return str(result.inserted_id)
         except Exception as e:
             logger.error(f"Failed to insert transcript: {e}")
             raise RuntimeError("Database error: cannot insert transcript")
 
+    @staticmethod
+    @observe_db
+    async def upsert_transcript_by_hash(transcript: TranscriptDoc) -> None:
+        """Store a transcript once per content hash; later duplicates are no-ops."""
+        try:
+            await transcripts_collection.update_one(
+                {"content_hash": transcript.content_hash},
+                {"$setOnInsert": transcript.dict()},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.error(f"Failed to upsert transcript {transcript.content_hash}: {e}")
+            raise RuntimeError("Database error: cannot upsert transcript")
+
+    @staticmethod
+    @observe_db
+    async def get_transcript_by_hash(content_hash: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await transcripts_collection.find_one({"content_hash": content_hash})
+        except Exception as e:
+            logger.error(f"Failed to fetch transcript {content_hash}: {e}")
+            return None
+
+    # -------------------
+    # Transcription jobs
+    # -------------------
+    @staticmethod
+    @observe_db
+    async def insert_transcription_job(job_id: str, job: TranscriptionJobDoc) -> Dict[str, Any]:
+        try:
+            doc = {"_id": job_id, **job.dict()}
+            await transcription_jobs_collection.insert_one(doc)
+            return doc
+        except Exception as e:
+            logger.error(f"Failed to insert transcription job: {e}")
+            raise RuntimeError("Database error: cannot insert transcription job")
+
+    @staticmethod
+    @observe_db
+    async def get_transcription_job(job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await transcription_jobs_collection.find_one({"_id": job_id})
+        except Exception as e:
+            logger.error(f"Failed to fetch transcription job {job_id}: {e}")
+            return None
+
+    @staticmethod
+    @observe_db
+    async def update_transcription_job(job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            fields["updated_at"] = datetime.utcnow()
+            return await transcription_jobs_collection.find_one_and_update(
+                {"_id": job_id},
+                {"$set": fields},
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception as e:
+            logger.error(f"Failed to update transcription job {job_id}: {e}")
+            return None
+
+    @staticmethod
+    @observe_db
+    async def claim_orphaned_transcription_jobs(lease_seconds: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Atomically take over unfinished jobs whose polling lease expired (e.g. after a worker restart)."""
+        claimed = []
+        now = datetime.utcnow()
+        try:
+            for _ in range(limit):
+                job = await transcription_jobs_collection.find_one_and_update(
+                    {
+                        "status": {"$in": ["queued", "processing"]},
+                        "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+                    },
+                    {"$set": {"lease_until": now + timedelta(seconds=lease_seconds)}},
+                    return_document=ReturnDocument.AFTER,
+                )
+                if not job:
+                    break
+                claimed.append(job)
+        except Exception as e:
+            logger.error(f"Failed to claim orphaned transcription jobs: {e}")
+        return claimed
+
     # -------------------
     # Notes CRUD
     # -------------------
     @staticmethod
+    @observe_db
     async def insert_note(note: NoteDoc) -> str:
         try:
             doc = note.dict()
             doc["created_at"] = datetime.utcnow()
             result = await notes_collection.insert_one(doc)
-            logger.info(f"Inserted note: {result.inserted_id}")
+            logger.debug(f"Inserted note: {result.inserted_id}")
+            await note_search.note_changed(str(result.inserted_id))
             return str(result.inserted_id)
         except Exception as e:
             logger.error(f"Failed to insert note: {e}")
             raise RuntimeError("Database error: cannot insert note")
 
     @staticmethod
-    async def get_notes() -> List[Dict[str, Any]]:
+    @observe_db
+    async def get_notes(
+        limit: int = config.LIST_PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of notes; notes must carry every tag in `tags`."""
+        query = date_range(created_after, created_before)
+        if tags:
+            query["tags"] = {"$all": tags}
+        # Cursor/field errors are the caller's fault: raise ValueError instead of an empty page
+        projection = build_projection(fields, NOTE_FIELDS)
+        query = keyset_filter(query, cursor)
         try:
-            cursor = notes_collection.find()
-            notes = await cursor.to_list(length=100)
-            for note in notes:
-                note["_id"] = str(note["_id"])
-            return notes
+            return await DBService._list_page(notes_collection, query, limit, projection)
         except Exception as e:
             logger.error(f"Failed to fetch notes: {e}")
-            return []
+            return [], None
 
     @staticmethod
+    @observe_db
     async def get_note_by_id(note_id: str) -> Dict[str, Any]:
+        return await note_cache.get_or_load(note_id, lambda: DBService._find_note(note_id))
+
+    @staticmethod
+    async def _find_note(note_id: str) -> Dict[str, Any]:
         try:
-            note = await notes_collection.find_one({"_id": ObjectId(note_id)})
-            if note:
-                note["_id"] = str(note["_id"])
-            return note
+            return await notes_collection.find_one({"_id": ObjectId(note_id)})
         except Exception as e:
             logger.error(f"Failed to fetch note {note_id}: {e}")
             return None
 
     @staticmethod
+    @observe_db
     async def update_note(note_id: str, fields: Dict[str, Any]) -> bool:
         try:
             fields["updated_at"] = datetime.utcnow()
@@ -68,59 +343,103 @@ class DBService:
                 {"_id": ObjectId(note_id)},
                 {"$set": fields}
             )
+            await note_cache.invalidate(note_id)
+            await note_search.note_changed(note_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to update note {note_id}: {e}")
             return False
 
     @staticmethod
+    @observe_db
     async def delete_note(note_id: str) -> bool:
         try:
             result = await notes_collection.delete_one({"_id": ObjectId(note_id)})
+            await note_cache.invalidate(note_id)
+            await note_search.note_deleted(note_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Failed to delete note {note_id}: {e}")
             return False
 
+    @staticmethod
+    @observe_db
+    async def search_notes(
+        query: str,
+        tags: Optional[List[str]] = None,
+        limit: int = config.LIST_PAGE_SIZE_DEFAULT,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Relevance-ranked notes matching `query` (and every tag in `tags`)."""
+        limit = max(1, min(limit, config.LIST_PAGE_SIZE_MAX))
+        try:
+            return await note_search.search(query, tags, limit, offset)
+        except Exception as e:
+            logger.error(f"Failed to search notes: {e}")
+            raise RuntimeError("Database error: cannot search notes")
+
     # -------------------
     # Tasks CRUD
     # -------------------
     @staticmethod
+    @observe_db
     async def insert_task(task: TaskDoc) -> str:
         try:
             doc = task.dict()
             doc["created_at"] = datetime.utcnow()
             result = await tasks_collection.insert_one(doc)
-            logger.info(f"Inserted task: {result.inserted_id}")
+            logger.debug(f"Inserted task: {result.inserted_id}")
             return str(result.inserted_id)
         except Exception as e:
             logger.error(f"Failed to insert task: {e}")
             raise RuntimeError("Database error: cannot insert task")
 
     @staticmethod
-    async def get_tasks() -> List[Dict[str, Any]]:
+    @observe_db
+    async def get_tasks(
+        limit: int = config.LIST_PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of tasks filtered by status/priority/date."""
+        query = date_range(created_after, created_before)
+        if status:
+            query["status"] = status
+        if priority:
+            query["priority"] = priority
+        projection = build_projection(fields, TASK_FIELDS)
+        query = keyset_filter(query, cursor)
         try:
-            cursor = tasks_collection.find()
-            tasks = await cursor.to_list(length=100)
-            for task in tasks:
-                task["_id"] = str(task["_id"])
-            return tasks
+            return await DBService._list_page(tasks_collection, query, limit, projection)
         except Exception as e:
             logger.error(f"Failed to fetch tasks: {e}")
-            return []
+            return [], None
 
     @staticmethod
+    @observe_db
     async def get_task_by_id(task_id: str) -> Dict[str, Any]:
+        return await task_cache.get_or_load(task_id, lambda: DBService._find_task(task_id))
+
+    @staticmethod
+    @observe_db
+    async def find_task(task_id: str) -> Dict[str, Any]:
+        """Uncached read, for background work that acts on the task's current state."""
+        return await DBService._find_task(task_id)
+
+    @staticmethod
+    async def _find_task(task_id: str) -> Dict[str, Any]:
         try:
-            task = await tasks_collection.find_one({"_id": ObjectId(task_id)})
-            if task:
-                task["_id"] = str(task["_id"])
-            return task
+            return await tasks_collection.find_one({"_id": ObjectId(task_id)})
         except Exception as e:
             logger.error(f"Failed to fetch task {task_id}: {e}")
             return None
 
     @staticmethod
+    @observe_db
     async def update_task(task_id: str, fields: Dict[str, Any]) -> bool:
         try:
             fields["updated_at"] = datetime.utcnow()
@@ -128,19 +447,53 @@ class DBService:
                 {"_id": ObjectId(task_id)},
                 {"$set": fields}
             )
+            await task_cache.invalidate(task_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to update task {task_id}: {e}")
             return False
 
     @staticmethod
+    @observe_db
     async def update_task_status(task_id: str, status: str) -> bool:
         return await DBService.update_task(task_id, {"status": status})
 
     @staticmethod
+    @observe_db
+    async def complete_task_interpretation(task_id: str, raw_description: str, interpreted: str) -> bool:
+        """
+        Write an interpreted description back, unless the task was edited or deleted while it
+        was queued; an edited task keeps the user's text and is marked skipped instead.
+        """
+        now = datetime.utcnow()
+        result = await tasks_collection.update_one(
+            {"_id": ObjectId(task_id), "interpretation_status": "pending", "description": raw_description},
+            {"$set": {
+                "description": interpreted,
+                "raw_description": raw_description,
+                "interpretation_status": "done",
+                "updated_at": now,
+            }},
+        )
+        if not result.modified_count:
+            await tasks_collection.update_one(
+                {"_id": ObjectId(task_id), "interpretation_status": "pending"},
+                {"$set": {"interpretation_status": "skipped", "updated_at": now}},
+            )
+        await task_cache.invalidate(task_id)
+        return result.modified_count > 0
+
+    @staticmethod
+    @observe_db
+    async def set_task_interpretation_status(task_id: str, status: str) -> bool:
+        return await DBService.update_task(task_id, {"interpretation_status": status})
+
+    @staticmethod
+    @observe_db
     async def delete_task(task_id: str) -> bool:
         try:
             result = await tasks_collection.delete_one({"_id": ObjectId(task_id)})
+            await task_cache.invalidate(task_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Failed to delete task {task_id}: {e}")
@@ -1,23 +1,50 @@
-from typing import Dict, Any
-import google.generativeai as genai
+import hashlib
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from app.core import codec
 from app.core.config import config
+from app.core.cache import SWRCache
+from app.core.executor import BoundedExecutor, ExecutorBusyError
+from app.core.metrics import track_external
+from app.core.services import services
+from app.core.utils import cache_result, get_redis_client
 from loguru import logger
 import re
 
-# Configure Gemini API
-genai.configure(api_key=config.GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-2.5-flash")
 
-class GeminiService:
+def _create_model():
+    import google.generativeai as genai  # ~0.4s to import, so only when first needed
+
+    genai.configure(api_key=config.GEMINI_API_KEY)
+    return genai.GenerativeModel("gemini-2.5-flash")
+
+
+services.register("gemini", _create_model, requires=("GEMINI_API_KEY",))
+
+
+def generate_content(*args, **kwargs):
+    """Runs on the executor thread, so creating the model on first use doesn't block the loop."""
+    return services.get("gemini").generate_content(*args, **kwargs)
+
+
+# The SDK call is blocking, so it runs on a bounded pool instead of the event loop
+gemini_executor = BoundedExecutor(
+    name="gemini",
+    max_concurrency=config.GEMINI_MAX_CONCURRENCY,
+    max_queue=config.GEMINI_MAX_QUEUE,
+    queue_timeout=config.GEMINI_QUEUE_TIMEOUT_SECONDS,
+    call_timeout=config.GEMINI_CALL_TIMEOUT_SECONDS,
+)
+
+suggestion_cache = SWRCache(
+    namespace="learning:suggest",
+    ttl=config.LEARNING_CACHE_TTL_SECONDS,
+    stale_ttl=config.LEARNING_CACHE_STALE_SECONDS,
+)
 
-    @staticmethod
-    async def generate_learning_suggestion(user_input: str) -> Dict[str, Any]:
-        """
-        Generate a complete learning suggestion with everything in one field.
-        """
-        try:
-            prompt = (
-                f"""You are a Go learning expert. Create a complete learning suggestion for: "{user_input}"
+
+def build_learning_prompt(user_input: str) -> str:
+    """Prompt shared by the buffered and streaming suggestion endpoints."""
+    return f"""You are a Go learning expert. Create a complete learning suggestion for: "{user_input}"
 
 Include:
 - Topic name  
@@ -42,9 +69,58 @@ Format as clean Markdown:
    https://www.youtube.com/watch?v=VIDEO_ID
 ---
 """
-            )
-            
-            response = model.generate_content(prompt)
+
+
+def build_interpret_prompt(text: str, instruction: str) -> str:
+    return f"""{instruction}. Reply with only the result as one short, actionable sentence, no preamble.
+
+Text: "{text}"
+"""
+
+
+class GeminiService:
+
+    @staticmethod
+    async def interpret_text(text: str, instruction: str = "Extract task from text") -> str:
+        """
+        Rewrite `text` following `instruction` (e.g. a task description from a dictated note).
+        Results are cached in Redis by (instruction, text); failures and empty replies raise.
+        """
+        key = "gemini:interpret:" + hashlib.sha256(f"{instruction}\n{text}".encode()).hexdigest()
+        redis_client = await get_redis_client()
+        cached = await redis_client.get(key)
+        if cached:
+            return codec.loads(cached)
+
+        async with track_external("gemini", "interpret"):
+            response = await gemini_executor.run(generate_content, build_interpret_prompt(text, instruction))
+        result = (response.text or "").strip()
+        if not result:
+            raise RuntimeError("Gemini returned an empty interpretation")
+        await cache_result(redis_client, key, result, ttl=config.TASK_INTERPRET_CACHE_TTL_SECONDS)
+        return result
+
+    @staticmethod
+    async def generate_learning_suggestion(user_input: str) -> Dict[str, Any]:
+        """
+        Return a learning suggestion, served from cache when an equivalent request was seen.
+        Identical concurrent requests share one Gemini generation.
+        """
+        return await suggestion_cache.get_or_compute(
+            user_input,
+            lambda: GeminiService._generate_learning_suggestion(user_input),
+            should_cache=lambda data: bool(data.get("suggestion")),
+        )
+
+    @staticmethod
+    async def _generate_learning_suggestion(user_input: str) -> Dict[str, Any]:
+        """
+        Generate a complete learning suggestion with everything in one field.
+        """
+        try:
+            prompt = build_learning_prompt(user_input)
+            async with track_external("gemini", "generate"):
+                response = await gemini_executor.run(generate_content, prompt)
             result_text = response.text.strip() if response.text else ""
             
             # Extract VALID YouTube links
@@ -52,16 +128,95 @@ Format as clean Markdown:
             logger.info(f"Found {len(youtube_links)} valid YouTube links")
             
             # Add links to the suggestion (for display)
-            if youtube_links:
-                links_section = "\n\n### Extracted Links:\n" + "\n".join([f"- {link}" for link in youtube_links[:3]])
-                result_text += links_section
-            
+            result_text += format_links_section(youtube_links)
+
             return {"suggestion": result_text, "resources": youtube_links}
 
+        except ExecutorBusyError:
+            logger.warning("Gemini executor saturated, rejecting learning suggestion")
+            raise
         except Exception as e:
             logger.error(f"Gemini generate_learning_suggestion failed: {e}")
             return {"suggestion": "", "resources": []}
 
+    @staticmethod
+    async def stream_learning_suggestion(user_input: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (event, data) pairs for a streamed suggestion: `chunk` events as Gemini
+        produces text, then one `resources` event and a closing `done` event.
+        Cached suggestions are replayed as a single chunk.
+        """
+        cached = await suggestion_cache.lookup(user_input)
+        if cached:
+            yield "chunk", {"text": cached["suggestion"]}
+            yield "resources", {"resources": cached["resources"]}
+            yield "done", {"cached": True}
+            return
+
+        prompt = build_learning_prompt(user_input)
+        extractor = YouTubeLinkExtractor()
+        parts = []
+        async with track_external("gemini", "stream"):
+            async for chunk in gemini_executor.stream(generate_content, prompt, stream=True):
+                text = chunk.text or ""
+                if not text:
+                    continue
+                parts.append(text)
+                extractor.feed(text)
+                yield "chunk", {"text": text}
+
+        youtube_links = extractor.finish()
+        logger.info(f"Found {len(youtube_links)} valid YouTube links (streamed)")
+        links_section = format_links_section(youtube_links)
+        if links_section:
+            yield "chunk", {"text": links_section}
+        yield "resources", {"resources": youtube_links}
+
+        result_text = "".join(parts).strip()
+        if result_text:
+            await suggestion_cache.store(
+                user_input, {"suggestion": result_text + links_section, "resources": youtube_links}
+            )
+        yield "done", {"cached": False}
+
+
+def format_links_section(youtube_links: List[str]) -> str:
+    """Markdown footer listing the extracted links (empty when there are none)."""
+    if not youtube_links:
+        return ""
+    return "\n\n### Extracted Links:\n" + "\n".join([f"- {link}" for link in youtube_links[:3]])
+
+
+class YouTubeLinkExtractor:
+    """
+    Incremental version of extract_youtube_links for streamed text.
+    Only text up to the last whitespace is scanned, so URLs split across chunks are not lost.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self.links: List[str] = []
+
+    def _add(self, links: List[str]) -> List[str]:
+        new_links = [link for link in links if link not in self.links][: 3 - len(self.links)]
+        self.links.extend(new_links)
+        return new_links
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a chunk and return any links completed by it."""
+        self._pending += chunk
+        cut = max(self._pending.rfind(" "), self._pending.rfind("\n"), self._pending.rfind("\t"))
+        if cut < 0:
+            return []
+        complete, self._pending = self._pending[: cut + 1], self._pending[cut + 1:]
+        return self._add(extract_youtube_links(complete))
+
+    def finish(self) -> List[str]:
+        """Flush the remaining text and return all links found (max 3)."""
+        self._add(extract_youtube_links(self._pending))
+        self._pending = ""
+        return self.links
+
 
 def extract_youtube_links(text: str) -> list[str]:
     """Extract VALID YouTube links from text"""
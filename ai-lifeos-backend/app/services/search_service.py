@@ -0,0 +1,346 @@
+import asyncio
+import bisect
+import heapq
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from loguru import logger
+
+from app.core.cache import InvalidationBus
+from app.db.database import notes_collection
+from app.models.indexes import NOTE_TEXT_WEIGHTS
+
+# Search hits carry list-view fields only; bodies are fetched by id when opened
+HIT_PROJECTION = {"title": 1, "summary": 1, "tags": 1, "created_at": 1}
+INDEX_PROJECTION = {**{field: 1 for field in NOTE_TEXT_WEIGHTS}, "tags": 1}
+SEARCH_NAMESPACE = "notes:search"
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+# ---------------------------
+# Mongo text index engine
+# ---------------------------
+class MongoTextSearch:
+    """$text search over the weighted `text_search` index (see app/models/indexes.py)."""
+
+    name = "mongo"
+
+    def __init__(self):
+        self._stats = {"queries": 0}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def note_changed(self, note_id: str) -> None:
+        pass  # Mongo maintains the text index itself
+
+    async def note_deleted(self, note_id: str) -> None:
+        pass
+
+    async def notes_changed(self, note_ids: List[str]) -> None:
+        pass
+
+    async def notes_deleted(self, note_ids: List[str]) -> None:
+        pass
+
+    async def search(
+        self, query: str, tags: Optional[List[str]], limit: int, offset: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Ranked hits and the offset of the next page (None on the last page)."""
+        self._stats["queries"] += 1
+        mongo_query: Dict[str, Any] = {"$text": {"$search": query}}
+        if tags:
+            mongo_query["tags"] = {"$all": tags}
+        projection = {**HIT_PROJECTION, "score": {"$meta": "textScore"}}
+        docs = await notes_collection.find(mongo_query, projection) \
+            .sort([("score", {"$meta": "textScore"})]) \
+            .skip(offset) \
+            .limit(limit + 1) \
+            .to_list(length=limit + 1)
+        next_offset = offset + limit if len(docs) > limit else None
+        return docs[:limit], next_offset
+
+    def stats(self) -> Dict[str, Any]:
+        return {"engine": self.name, **self._stats}
+
+
+# ---------------------------
+# In-process inverted index engine
+# ---------------------------
+class InvertedIndexSearch:
+    """
+    Per-worker BM25 inverted index over title/summary/content, weighted like the Mongo
+    text index. Unlike $text it matches the last query term as a prefix (search as you
+    type) and has no minimum-token rules. It is built from Mongo at startup, updated
+    incrementally by DBService writes on this worker, and by other workers' writes via
+    the invalidation bus. A periodic rebuild repairs drift from missed messages.
+    Until the first build finishes, queries fall through to MongoTextSearch.
+    """
+
+    name = "memory"
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_EXPANSIONS = 50
+
+    def __init__(self, bus: InvalidationBus, rebuild_seconds: float):
+        self.bus = bus
+        self.rebuild_seconds = rebuild_seconds
+        self.fallback = MongoTextSearch()
+        # Weighted term frequencies are small ints (interned by CPython) and per-note term
+        # lists are tuples: at 100k notes this roughly halves memory vs floats and sets.
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._vocab: List[str] = []  # sorted, for prefix expansion
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._doc_tags: Dict[str, Set[str]] = {}
+        self._tag_docs: Dict[str, Set[str]] = {}
+        self._total_len = 0
+        self._ready = False
+        self._rebuilding = False
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._refreshes: Set[asyncio.Task] = set()
+        self._stats = {"queries": 0, "fallback_queries": 0, "rebuilds": 0, "last_rebuild_seconds": 0.0}
+        bus.subscribe(SEARCH_NAMESPACE, self._on_remote_change)
+
+    # -------------------
+    # Index maintenance
+    # -------------------
+    def _remove(self, note_id: str) -> None:
+        for term in self._doc_terms.pop(note_id, ()):
+            postings = self._postings[term]
+            del postings[note_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocab[bisect.bisect_left(self._vocab, term)]
+        self._total_len -= self._doc_len.pop(note_id, 0)
+        for tag in self._doc_tags.pop(note_id, ()):
+            docs = self._tag_docs[tag]
+            docs.discard(note_id)
+            if not docs:
+                del self._tag_docs[tag]
+
+    def _add(self, doc: Dict[str, Any]) -> None:
+        note_id = str(doc["_id"])
+        self._remove(note_id)
+
+        weighted: Dict[str, int] = {}
+        for field, weight in NOTE_TEXT_WEIGHTS.items():
+            for term in tokenize(doc.get(field)):
+                weighted[term] = weighted.get(term, 0) + weight
+        for term, tf in weighted.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._vocab, term)
+            postings[note_id] = tf
+
+        length = sum(weighted.values())
+        self._doc_terms[note_id] = tuple(weighted)
+        self._doc_len[note_id] = length
+        self._total_len += length
+        tags = set(doc.get("tags") or [])
+        self._doc_tags[note_id] = tags
+        for tag in tags:
+            self._tag_docs.setdefault(tag, set()).add(note_id)
+
+    def index_document(self, doc: Dict[str, Any]) -> None:
+        """Add or replace one note (a dict with _id and the text/tag fields)."""
+        self._add(doc)
+
+    async def _reindex(self, note_ids: List[str]) -> None:
+        if self._rebuilding:
+            self._dirty.update(note_ids)
+        try:
+            oids = [ObjectId(note_id) for note_id in note_ids]
+            docs = await notes_collection.find({"_id": {"$in": oids}}, INDEX_PROJECTION).to_list(length=len(oids))
+        except Exception as e:
+            logger.warning(f"Search reindex of {len(note_ids)} notes failed: {e}")
+            return
+        found = set()
+        for doc in docs:
+            self._add(doc)
+            found.add(str(doc["_id"]))
+        for note_id in note_ids:
+            if note_id not in found:
+                self._remove(note_id)
+
+    def _on_remote_change(self, note_ids: List[str]) -> None:
+        task = asyncio.create_task(self._reindex(note_ids))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def notes_changed(self, note_ids: List[str]) -> None:
+        if not note_ids:
+            return
+        await self._reindex(note_ids)
+        await self.bus.publish(SEARCH_NAMESPACE, note_ids)
+
+    async def notes_deleted(self, note_ids: List[str]) -> None:
+        if not note_ids:
+            return
+        if self._rebuilding:
+            self._dirty.update(note_ids)
+        for note_id in note_ids:
+            self._remove(note_id)
+        await self.bus.publish(SEARCH_NAMESPACE, note_ids)
+
+    async def note_changed(self, note_id: str) -> None:
+        await self.notes_changed([note_id])
+
+    async def note_deleted(self, note_id: str) -> None:
+        await self.notes_deleted([note_id])
+
+    async def rebuild(self) -> None:
+        """Re-read every note from Mongo, then re-fetch notes that changed meanwhile."""
+        started = time.perf_counter()
+        self._rebuilding = True
+        self._dirty.clear()
+        seen: Set[str] = set()
+        try:
+            count = 0
+            async for doc in notes_collection.find({}, INDEX_PROJECTION):
+                self._add(doc)
+                seen.add(str(doc["_id"]))
+                count += 1
+                if count % 1000 == 0:
+                    await asyncio.sleep(0)  # let requests run during large rebuilds
+            for note_id in set(self._doc_terms) - seen:
+                self._remove(note_id)
+        finally:
+            self._rebuilding = False
+        if self._dirty:
+            await self._reindex(list(self._dirty))
+
+        self._ready = True
+        self._stats["rebuilds"] += 1
+        self._stats["last_rebuild_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Search index built: {len(self._doc_terms)} notes, {len(self._postings)} terms "
+                    f"in {self._stats['last_rebuild_seconds']}s")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Search index rebuild failed: {e}")
+            await asyncio.sleep(self.rebuild_seconds)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    # -------------------
+    # Query
+    # -------------------
+    def _expand(self, term: str) -> List[str]:
+        start = bisect.bisect_left(self._vocab, term)
+        matches = []
+        for candidate in self._vocab[start:start + self.MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches
+
+    def rank(self, query: str, tags: Optional[List[str]], k: int) -> List[Tuple[str, float]]:
+        """Top-k (note_id, score) pairs; OR semantics like $text, last term matched as a prefix."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        allowed: Optional[Set[str]] = None
+        for tag in tags or []:
+            docs = self._tag_docs.get(tag, set())
+            allowed = docs if allowed is None else allowed & docs
+            if not allowed:
+                return []
+
+        expanded = {term for term in terms[:-1] if term in self._postings}
+        expanded.update(self._expand(terms[-1]))
+
+        n_docs = len(self._doc_len)
+        avg_len = self._total_len / n_docs if n_docs else 1.0
+        scores: Dict[str, float] = {}
+        for term in expanded:
+            postings = self._postings[term]
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for note_id, tf in postings.items():
+                if allowed is not None and note_id not in allowed:
+                    continue
+                norm = self.K1 * (1 - self.B + self.B * self._doc_len[note_id] / avg_len)
+                scores[note_id] = scores.get(note_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
+
+    async def search(
+        self, query: str, tags: Optional[List[str]], limit: int, offset: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        if not self._ready:
+            self._stats["fallback_queries"] += 1
+            return await self.fallback.search(query, tags, limit, offset)
+
+        self._stats["queries"] += 1
+        ranked = self.rank(query, tags, offset + limit + 1)
+        page = ranked[offset:offset + limit]
+        next_offset = offset + limit if len(ranked) > offset + limit else None
+        if not page:
+            return [], next_offset
+
+        docs = await notes_collection.find(
+            {"_id": {"$in": [ObjectId(note_id) for note_id, _ in page]}}, HIT_PROJECTION
+        ).to_list(length=len(page))
+        by_id = {str(doc["_id"]): doc for doc in docs}
+        hits = []
+        for note_id, score in page:
+            doc = by_id.get(note_id)
+            if doc:  # deleted since it was indexed
+                doc["_id"] = note_id
+                doc["score"] = round(score, 4)
+                hits.append(doc)
+        return hits, next_offset
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "ready": self._ready,
+            "notes": len(self._doc_len),
+            "terms": len(self._postings),
+            **self._stats,
+        }
+
+
+def make_note_search(engine: str, bus: InvalidationBus, rebuild_seconds: float):
+    """Build the engine named by NOTES_SEARCH_ENGINE ("mongo" or "memory")."""
+    if engine == "memory":
+        return InvertedIndexSearch(bus, rebuild_seconds)
+    if engine != "mongo":
+        raise ValueError(f"Unknown NOTES_SEARCH_ENGINE: {engine}")
+    return MongoTextSearch()
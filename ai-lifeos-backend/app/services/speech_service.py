@@ -1,81 +1,371 @@
-import assemblyai as aai
-from typing import Dict, Any
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from app.core import codec
+from app.core.cache import SingleFlight
 from app.core.config import config
-from app.core.utils import get_redis_client, cache_result
+from app.core.metrics import track_external
+from app.core.services import services
+from app.core.utils import get_redis_client, cache_result, call_external_api
 from app.services.db_service import db_service
+from app.services.transcript_poller import TranscriptPoller
 from app.models.schemas import TranscriptResponse
-from app.models.mongo_models import TranscriptDoc
+from app.models.mongo_models import TranscriptDoc, TranscriptionJobDoc
 from loguru import logger
-import asyncio
 
-# Init AssemblyAI
-aai.settings.api_key = config.ASSEMBLYAI_API_KEY
+# AssemblyAI is plain REST, so the "client" is just its auth headers
+services.register("assemblyai", lambda: {"authorization": config.ASSEMBLYAI_API_KEY}, requires=("ASSEMBLYAI_API_KEY",))
+JOB_STATUS_TTL = 86400
+transcript_codec = codec.ModelCodec(TranscriptResponse)
+INFLIGHT_HASH_TTL = 3600
+
+# Content hash -> job id for transcriptions started by this worker
+_hash_jobs: Dict[str, str] = {}
+_submit_flight = SingleFlight()
+
+
+def job_channel(job_id: str) -> str:
+    """Redis key and pub/sub channel carrying a job's latest state."""
+    return f"transcription_job:{job_id}"
+
+
+def transcript_hash_key(content_hash: str) -> str:
+    return f"transcript:sha256:{content_hash}"
+
+
+def inflight_hash_key(content_hash: str) -> str:
+    return f"transcript:inflight:{content_hash}"
+
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public shape of a job document (matches TranscriptionJobResponse)."""
+    return {
+        "job_id": job["_id"],
+        "status": job["status"],
+        "transcript": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+class TranscriptionPendingError(RuntimeError):
+    """A transcription didn't finish within TRANSCRIPTION_WAIT_SECONDS; it continues as a job."""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Transcription job {job_id} is still running")
+        self.job_id = job_id
+
 
 class SpeechService:
+    # -------------------
+    # AssemblyAI REST calls
+    # -------------------
     @staticmethod
-    async def transcribe_audio(audio_url: str) -> TranscriptResponse:
-        """Transcribe audio using AssemblyAI with caching and error handling."""
-        cache_key = f"transcript_{audio_url}"
-        redis_client = None
+    async def _submit_transcript(audio_url: str) -> Dict[str, Any]:
+        async with track_external("assemblyai", "submit"):
+            return await call_external_api(
+                f"{config.ASSEMBLYAI_BASE_URL}/transcript",
+                method="POST",
+                json_data={"audio_url": audio_url, "language_code": "en"},
+                headers=services.get("assemblyai"),
+            )
 
-        # Redis client setup
+    @staticmethod
+    async def _fetch_transcript(transcript_id: str) -> Dict[str, Any]:
+        async with track_external("assemblyai", "fetch"):
+            return await call_external_api(
+                f"{config.ASSEMBLYAI_BASE_URL}/transcript/{transcript_id}",
+                headers=services.get("assemblyai"),
+            )
+
+    # -------------------
+    # Job state
+    # -------------------
+    @staticmethod
+    async def _publish_job(job: Dict[str, Any]) -> None:
+        """Mirror job state to Redis and notify subscribers of /jobs/{id}/events."""
         try:
             redis_client = await get_redis_client()
+            payload = codec.dumps(job_view(job))
+            await redis_client.setex(job_channel(job["_id"]), JOB_STATUS_TTL, payload)
+            await redis_client.publish(job_channel(job["_id"]), payload)
         except Exception as e:
-            logger.warning(f"Redis connection failed: {e}. Proceeding without cache.")
+            logger.warning(f"Redis job publish failed: {e}")
 
-        # Check cache first
+    @staticmethod
+    async def _on_transcript_update(job_id: str, transcript: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Called by the poller whenever a transcript changes status."""
+        status = transcript.get("status")
+        fields: Dict[str, Any] = {"status": status}
+
+        if status in ("completed", "error"):
+            job = await db_service.get_transcription_job(job_id) or {}
+
+        if status == "completed":
+            response = TranscriptResponse(
+                transcript_id=transcript["id"],
+                text=transcript.get("text") or "",
+                confidence=transcript.get("confidence") or 0.0,
+                duration=transcript.get("audio_duration") or 0.0,
+            )
+            # Stored before the lease goes, so identical audio always finds one or the other
+            await SpeechService._store_transcript(job.get("audio_url", ""), response, job.get("content_hash"))
+            await SpeechService._release_hash(job.get("content_hash"))
+            fields["result"] = response.dict()
+            logger.info(f"Transcribed audio successfully: {transcript['id']}")
+        elif status == "error":
+            await SpeechService._release_hash(job.get("content_hash"))
+            fields["error"] = transcript.get("error") or "Transcription failed"
+            logger.error(f"Transcription error for job {job_id}: {fields['error']}")
+
+        job = await db_service.update_transcription_job(job_id, fields)
+        if job:
+            await SpeechService._publish_job(job)
+        return job
+
+    @staticmethod
+    async def _store_transcript(
+        audio_url: str, response: TranscriptResponse, content_hash: Optional[str] = None
+    ) -> None:
+        """Cache the finished transcript (by content hash when known) and persist it."""
+        try:
+            redis_client = await get_redis_client()
+            cache_key = transcript_hash_key(content_hash) if content_hash else f"transcript_{audio_url}"
+            await cache_result(redis_client, cache_key, response)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+        try:
+            doc = TranscriptDoc(**response.dict(), content_hash=content_hash)
+            if content_hash:
+                await db_service.upsert_transcript_by_hash(doc)
+            else:
+                await db_service.insert_transcript(doc)
+        except Exception as e:
+            logger.error(f"Database insert failed: {e}")
+
+    # -------------------
+    # Content-hash deduplication
+    # -------------------
+    @staticmethod
+    async def find_transcript_by_hash(content_hash: str) -> Optional[TranscriptResponse]:
+        """Return a stored transcript for identical audio, checking Redis before Mongo."""
+        redis_client = None
+        try:
+            redis_client = await get_redis_client()
+            cached = await redis_client.get(transcript_hash_key(content_hash))
+            if cached:
+                logger.info("Returning cached transcript for duplicate audio")
+                return transcript_codec.decode(cached)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+
+        doc = await db_service.get_transcript_by_hash(content_hash)
+        if not doc:
+            return None
+        response = TranscriptResponse(**doc)
         if redis_client:
             try:
-                cached = await redis_client.get(cache_key)
-                if cached:
-                    logger.info("Returning cached transcript")
-                    return TranscriptResponse(**eval(cached))
+                await cache_result(redis_client, transcript_hash_key(content_hash), response)
             except Exception as e:
-                logger.warning(f"Redis cache read failed: {e}")
+                logger.warning(f"Redis cache write failed: {e}")
+        return response
 
-        # AssemblyAI transcription
+    @staticmethod
+    async def _reserve_hash(content_hash: str, job_id: str) -> str:
+        """Claim a content hash across workers; returns the job id that owns it."""
         try:
-            config_obj = aai.TranscriptionConfig(audio_url=audio_url, language_code="en")
-            transcript = aai.Transcriber().transcribe(config_obj)
+            redis_client = await get_redis_client()
+            if await redis_client.set(inflight_hash_key(content_hash), job_id, nx=True, ex=INFLIGHT_HASH_TTL):
+                return job_id
+            return await redis_client.get(inflight_hash_key(content_hash)) or job_id
+        except Exception as e:
+            logger.warning(f"Redis in-flight reservation failed: {e}")
+            return job_id
+
+    @staticmethod
+    async def _release_hash(content_hash: Optional[str]) -> None:
+        if not content_hash:
+            return
+        _hash_jobs.pop(content_hash, None)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.delete(inflight_hash_key(content_hash))
+        except Exception as e:
+            logger.warning(f"Redis in-flight release failed: {e}")
+
+    @staticmethod
+    async def record_duplicate_job(audio_url: str, content_hash: str, response: TranscriptResponse) -> Dict[str, Any]:
+        """Create an already-completed job for audio whose transcript is known."""
+        job = await db_service.insert_transcription_job(
+            uuid.uuid4().hex,
+            TranscriptionJobDoc(
+                transcript_id=response.transcript_id,
+                audio_url=audio_url,
+                status="completed",
+                result=response.dict(),
+                content_hash=content_hash,
+            ),
+        )
+        await SpeechService._publish_job(job)
+        return job
+
+    # -------------------
+    # Public API
+    # -------------------
+    @staticmethod
+    async def submit_job(
+        audio_url: str, user_id: Optional[str] = None, content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Start a transcription and return the job immediately; the shared poller tracks it.
+        With a content hash, a transcription already running for the same audio (on this
+        or another worker) is returned instead of starting a new one.
+        """
+        if not content_hash:
+            return await SpeechService._start_job(uuid.uuid4().hex, audio_url, user_id)
+
+        local_job_id = _hash_jobs.get(content_hash)
+        if local_job_id:
+            job = await db_service.get_transcription_job(local_job_id)
+            if job:
+                return job
+
+        job, _ = await _submit_flight.do(
+            content_hash, lambda: SpeechService._submit_deduplicated(audio_url, user_id, content_hash)
+        )
+        return job
+
+    @staticmethod
+    async def _submit_deduplicated(audio_url: str, user_id: Optional[str], content_hash: str) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        owner_job_id = await SpeechService._reserve_hash(content_hash, job_id)
+        if owner_job_id != job_id:
+            # Another worker is submitting the same audio; its job document appears once submitted
+            for _ in range(10):
+                job = await db_service.get_transcription_job(owner_job_id)
+                if job:
+                    return job
+                await asyncio.sleep(0.5)
+            logger.warning(f"In-flight job {owner_job_id} for {content_hash} never appeared, starting our own")
+        return await SpeechService._start_job(job_id, audio_url, user_id, content_hash)
+
+    @staticmethod
+    async def _start_job(
+        job_id: str, audio_url: str, user_id: Optional[str] = None, content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        try:
+            transcript = await SpeechService._submit_transcript(audio_url)
         except Exception as e:
             logger.error(f"AssemblyAI transcription request failed: {e}")
+            await SpeechService._release_hash(content_hash)
             raise ValueError("Failed to start transcription service")
 
-        # Poll until completion
+        job = await db_service.insert_transcription_job(
+            job_id,
+            TranscriptionJobDoc(
+                transcript_id=transcript["id"],
+                audio_url=audio_url,
+                status=transcript.get("status", "queued"),
+                user_id=user_id,
+                content_hash=content_hash,
+                lease_until=datetime.utcnow() + timedelta(seconds=config.TRANSCRIPTION_LEASE_SECONDS),
+            ),
+        )
+        if content_hash:
+            _hash_jobs[content_hash] = job_id
+        await SpeechService._publish_job(job)
+        transcript_poller.track(job_id, transcript["id"])
+        return job
+
+    @staticmethod
+    async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+        """Read job state from Redis, falling back to Mongo."""
         try:
-            while transcript.status != aai.TranscriptStatus.completed:
-                if transcript.status == aai.TranscriptStatus.error:
-                    raise ValueError(f"Transcription error: {transcript.error}")
-                await asyncio.sleep(1)
-                transcript = aai.Transcriber().get_transcript(transcript.id)
+            redis_client = await get_redis_client()
+            cached = await redis_client.get(job_channel(job_id))
+            if cached:
+                return codec.loads(cached)
         except Exception as e:
-            logger.error(f"Error during transcription polling: {e}")
-            raise ValueError("Transcription process failed")
+            logger.warning(f"Redis job read failed: {e}")
 
-        # Build response
-        response = TranscriptResponse(
-            transcript_id=transcript.id,
-            text=transcript.text,
-            confidence=transcript.confidence or 0.0,
-            duration=transcript.audio_duration or 0.0
-        )
+        job = await db_service.get_transcription_job(job_id)
+        return job_view(job) if job else None
+
+    @staticmethod
+    async def wait_for_job(job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a job to finish and return its public view. Jobs polled by this worker
+        resolve through the poller; jobs owned by another worker are re-read with backoff.
+        """
+        if transcript_poller.is_tracking(job_id):
+            return job_view(await transcript_poller.wait(job_id, timeout=timeout))
 
-        # Cache result
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        delay = config.TRANSCRIPTION_POLL_INITIAL_SECONDS
+        while True:
+            job = await SpeechService.get_job(job_id)
+            if job and job["status"] in ("completed", "error"):
+                return job
+            if deadline and loop.time() + delay > deadline:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(delay)
+            delay = min(delay * config.TRANSCRIPTION_POLL_BACKOFF, config.TRANSCRIPTION_POLL_MAX_SECONDS)
+
+    @staticmethod
+    async def transcribe_audio(audio_url: str, content_hash: Optional[str] = None) -> TranscriptResponse:
+        """Transcribe audio using AssemblyAI with caching and error handling."""
+        if content_hash:
+            existing = await SpeechService.find_transcript_by_hash(content_hash)
+            if existing:
+                return existing
+            return await SpeechService._await_transcript(
+                await SpeechService.submit_job(audio_url, content_hash=content_hash)
+            )
+
+        cache_key = f"transcript_{audio_url}"
+        redis_client = None
+
+        # Redis client setup
+        try:
+            redis_client = await get_redis_client()
+        except Exception as e:
+            logger.warning(f"Redis connection failed: {e}. Proceeding without cache.")
+
+        # Check cache first
         if redis_client:
             try:
-                await cache_result(redis_client, cache_key, str(response.dict()))
+                cached = await redis_client.get(cache_key)
+                if cached:
+                    logger.info("Returning cached transcript")
+                    return transcript_codec.decode(cached)
             except Exception as e:
-                logger.warning(f"Redis cache write failed: {e}")
+                logger.warning(f"Redis cache read failed: {e}")
+
+        # Submit and let the shared poller report completion
+        return await SpeechService._await_transcript(await SpeechService.submit_job(audio_url))
 
-        # Store in DB
+    @staticmethod
+    async def _await_transcript(job: Dict[str, Any]) -> TranscriptResponse:
         try:
-            doc = TranscriptDoc(**response.dict())
-            await db_service.insert_transcript(doc)
-        except Exception as e:
-            logger.error(f"Database insert failed: {e}")
+            job = await SpeechService.wait_for_job(job["_id"], timeout=config.TRANSCRIPTION_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise TranscriptionPendingError(job["_id"])
+        if job.get("status") != "completed":
+            logger.error(f"Error during transcription: {job.get('error')}")
+            raise ValueError("Transcription process failed")
+        return TranscriptResponse(**job["transcript"])
 
-        logger.info(f"Transcribed audio successfully: {transcript.id}")
-        return response
+
+transcript_poller = TranscriptPoller(
+    fetch_status=SpeechService._fetch_transcript,
+    on_update=SpeechService._on_transcript_update,
+    initial_delay=config.TRANSCRIPTION_POLL_INITIAL_SECONDS,
+    max_delay=config.TRANSCRIPTION_POLL_MAX_SECONDS,
+    backoff=config.TRANSCRIPTION_POLL_BACKOFF,
+    concurrency=config.TRANSCRIPTION_POLL_CONCURRENCY,
+    lease_seconds=config.TRANSCRIPTION_LEASE_SECONDS,
+)
 
 speech_service = SpeechService()
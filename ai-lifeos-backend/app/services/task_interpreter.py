@@ -0,0 +1,194 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import ResponseError
+
+from app.core.config import config
+from app.core.executor import ExecutorBusyError
+from app.core.metrics import TASK_INTERPRETATIONS
+from app.core.utils import get_redis_client
+from app.services.db_service import db_service
+from app.services.gemini_service import gemini_service
+
+Message = Tuple[str, Dict[str, str]]
+
+
+class TaskInterpreter:
+    """
+    Rewrites new task descriptions with Gemini in the background, so creating a task is
+    a single insert and doesn't depend on the model being up.
+
+    Task ids are queued on a Redis Stream read by one consumer group, so each task is
+    handled by one worker and survives restarts until it is acknowledged. Messages left
+    unacknowledged for `claim_idle_seconds` (a failed attempt or a dead worker) are
+    claimed again by any worker; after `max_attempts` deliveries the task is marked
+    failed and keeps its description as submitted. A saturated executor isn't an
+    attempt: the task is queued again as a new message after `busy_retry_seconds`.
+    """
+
+    def __init__(
+        self,
+        interpret: Callable[[str], Awaitable[str]],
+        stream: str,
+        group: str,
+        maxlen: int,
+        concurrency: int,
+        claim_idle_seconds: float,
+        max_attempts: int,
+        busy_retry_seconds: float,
+    ):
+        self._interpret = interpret
+        self.stream = stream
+        self.group = group
+        self.maxlen = maxlen
+        self.concurrency = concurrency
+        self.claim_idle_seconds = claim_idle_seconds
+        self.max_attempts = max_attempts
+        self.busy_retry_seconds = busy_retry_seconds
+        self.consumer = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+        self._next_claim = 0.0
+        self._stats = {"handled": 0, "errors": 0}
+
+    # -------------------
+    # Lifecycle
+    # -------------------
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Task interpreter started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Task interpreter stopped")
+
+    # -------------------
+    # Public API
+    # -------------------
+    async def enqueue(self, task_id: str) -> bool:
+        """Queue a task for interpretation; False when Redis is unavailable."""
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.xadd(self.stream, {"task_id": task_id}, maxlen=self.maxlen, approximate=True)
+            return True
+        except Exception as e:
+            logger.error(f"Could not queue task {task_id} for interpretation: {e}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self._task is not None, **self._stats}
+
+    # -------------------
+    # Internals
+    # -------------------
+    async def _ensure_group(self, redis_client) -> None:
+        try:
+            await redis_client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _claim_stale(self, redis_client) -> List[Message]:
+        claimed = await redis_client.xautoclaim(
+            self.stream, self.group, self.consumer,
+            min_idle_time=int(self.claim_idle_seconds * 1000), start_id="0-0", count=self.concurrency,
+        )
+        return claimed[1]
+
+    async def _read_new(self, redis_client) -> List[Message]:
+        batches = await redis_client.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=self.concurrency,
+            block=int(min(self.claim_idle_seconds / 2, 5.0) * 1000),
+        )
+        return [message for _, messages in batches or [] for message in messages]
+
+    async def _deliveries(self, redis_client, message_id: str) -> int:
+        pending = await redis_client.xpending_range(self.stream, self.group, min=message_id, max=message_id, count=1)
+        return pending[0]["times_delivered"] if pending else 1
+
+    async def _requeue(self, redis_client, message_id: str, task_id: str) -> None:
+        """Replace the message with a new one, so the retry starts from a delivery count of zero."""
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.xadd(self.stream, {"task_id": task_id}, maxlen=self.maxlen, approximate=True)
+            pipe.xack(self.stream, self.group, message_id)
+            await pipe.execute()
+
+    async def _handle(self, redis_client, message_id: str, fields: Dict[str, str]) -> None:
+        task_id = fields.get("task_id", "")
+        task = await db_service.find_task(task_id)
+        if not task or task.get("interpretation_status") != "pending":
+            await redis_client.xack(self.stream, self.group, message_id)
+            return
+
+        try:
+            interpreted = await self._interpret(task["description"])
+        except ExecutorBusyError:
+            # Not the task's fault, so it doesn't use up an attempt
+            logger.warning(f"Gemini executor saturated, task {task_id} will be retried")
+            TASK_INTERPRETATIONS.labels(outcome="busy").inc()
+            await asyncio.sleep(self.busy_retry_seconds)
+            await self._requeue(redis_client, message_id, task_id)
+            return
+        except Exception as e:
+            self._stats["errors"] += 1
+            attempts = await self._deliveries(redis_client, message_id)
+            if attempts < self.max_attempts:
+                logger.warning(f"Interpreting task {task_id} failed (attempt {attempts}): {e}")
+                TASK_INTERPRETATIONS.labels(outcome="retry").inc()
+                return
+            logger.error(f"Giving up on interpreting task {task_id} after {attempts} attempts: {e}")
+            await db_service.set_task_interpretation_status(task_id, "failed")
+            TASK_INTERPRETATIONS.labels(outcome="failed").inc()
+        else:
+            applied = await db_service.complete_task_interpretation(task_id, task["description"], interpreted)
+            TASK_INTERPRETATIONS.labels(outcome="done" if applied else "skipped").inc()
+            self._stats["handled"] += 1
+        await redis_client.xack(self.stream, self.group, message_id)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        group_ready = False
+
+        while True:
+            try:
+                redis_client = await get_redis_client()
+                if not group_ready:
+                    await self._ensure_group(redis_client)
+                    group_ready = True
+
+                messages: List[Message] = []
+                if loop.time() >= self._next_claim:
+                    messages = await self._claim_stale(redis_client)
+                    if len(messages) < self.concurrency:  # else more are waiting: claim again next round
+                        self._next_claim = loop.time() + self.claim_idle_seconds / 2
+                if not messages:
+                    messages = await self._read_new(redis_client)
+                if messages:
+                    await asyncio.gather(*(self._handle(redis_client, *message) for message in messages))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Task interpreter iteration failed: {e}")
+                group_ready = False
+                await asyncio.sleep(1)
+
+
+task_interpreter = TaskInterpreter(
+    interpret=gemini_service.interpret_text,
+    stream=config.TASK_INTERPRET_STREAM,
+    group=config.TASK_INTERPRET_GROUP,
+    maxlen=config.TASK_INTERPRET_STREAM_MAXLEN,
+    concurrency=config.TASK_INTERPRET_CONCURRENCY,
+    claim_idle_seconds=config.TASK_INTERPRET_CLAIM_IDLE_SECONDS,
+    max_attempts=config.TASK_INTERPRET_MAX_ATTEMPTS,
+    busy_retry_seconds=config.TASK_INTERPRET_BUSY_RETRY_SECONDS,
+)
@@ -0,0 +1,135 @@
+import hashlib
+import secrets
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.core import codec
+from app.core.config import config
+from app.core.utils import get_redis_client
+
+# Redis layout (all keys expire with the refresh TTL):
+#   refresh:{sha256(token)}         -> {"sub", "family"}   live token, consumed with GETDEL
+#   refresh_used:{sha256(token)}    -> {"family", "used_at"} tombstone for reuse detection
+#   refresh_family:{family}         -> sha256 of the family's live token
+#   refresh_user:{sub}              -> set of the user's families (logout everywhere)
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _ttl() -> int:
+    return config.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+class TokenService:
+    """
+    Rotating, revocable refresh tokens. Each refresh consumes the presented token and
+    issues a new one in the same family; presenting an already-used token (outside a
+    short grace window for racing clients) revokes the whole family, since it means
+    the token leaked. Tokens are opaque; only their SHA-256 is stored.
+    """
+
+    def __init__(self):
+        self._stats = {"issued": 0, "rotated": 0, "invalid": 0, "reuse_revoked": 0, "revoked": 0}
+
+    async def _store(
+        self, redis_client, token: str, sub: str, family: str, used_digest: Optional[str] = None
+    ) -> None:
+        digest = _digest(token)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            if used_digest:
+                tombstone = codec.dumps({"family": family, "used_at": time.time()})
+                pipe.setex(f"refresh_used:{used_digest}", _ttl(), tombstone)
+            pipe.setex(f"refresh:{digest}", _ttl(), codec.dumps({"sub": sub, "family": family}))
+            pipe.setex(f"refresh_family:{family}", _ttl(), digest)
+            pipe.sadd(f"refresh_user:{sub}", family)
+            pipe.expire(f"refresh_user:{sub}", _ttl())
+            await pipe.execute()
+
+    async def issue(self, sub: str) -> str:
+        """Start a new token family for a fresh login."""
+        try:
+            redis_client = await get_redis_client()
+            token = secrets.token_urlsafe(32)
+            await self._store(redis_client, token, sub, secrets.token_hex(8))
+        except Exception as e:
+            logger.error(f"Failed to issue refresh token: {e}")
+            raise RuntimeError("Token store unavailable")
+        self._stats["issued"] += 1
+        return token
+
+    async def _revoke_family(self, redis_client, family: str) -> None:
+        live = await redis_client.getdel(f"refresh_family:{family}")
+        if live:
+            await redis_client.delete(f"refresh:{live}")
+
+    async def rotate(self, token: str) -> Tuple[str, str]:
+        """
+        Exchange a refresh token for (sub, new refresh token) in two round trips: a GETDEL,
+        which also picks one winner when a token is presented twice, and a pipeline.
+        Raises ValueError if the token is unknown, expired, revoked or reused.
+        """
+        digest = _digest(token)
+        try:
+            redis_client = await get_redis_client()
+            entry = await redis_client.getdel(f"refresh:{digest}")
+            if entry is None:
+                await self._check_reuse(redis_client, digest)
+                self._stats["invalid"] += 1
+                raise ValueError("Invalid or expired refresh token")
+
+            entry = codec.loads(entry)
+            new_token = secrets.token_urlsafe(32)
+            await self._store(redis_client, new_token, entry["sub"], entry["family"], used_digest=digest)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to rotate refresh token: {e}")
+            raise RuntimeError("Token store unavailable")
+        self._stats["rotated"] += 1
+        return entry["sub"], new_token
+
+    async def _check_reuse(self, redis_client, digest: str) -> None:
+        used = await redis_client.get(f"refresh_used:{digest}")
+        if not used:
+            return
+        used = codec.loads(used)
+        if time.time() - used["used_at"] <= config.REFRESH_TOKEN_REUSE_GRACE_SECONDS:
+            return  # two requests raced on the same token; reject the loser quietly
+        await self._revoke_family(redis_client, used["family"])
+        self._stats["reuse_revoked"] += 1
+        logger.warning(f"Refresh token reuse detected; revoked token family {used['family']}")
+
+    async def revoke(self, token: str, all_sessions: bool = False) -> bool:
+        """Log out: drop this token's family, or every family of its user."""
+        try:
+            redis_client = await get_redis_client()
+            entry = await redis_client.getdel(f"refresh:{_digest(token)}")
+            if entry is None:
+                return False
+            entry = codec.loads(entry)
+            families = [entry["family"]]
+            if all_sessions:
+                families = list(await redis_client.smembers(f"refresh_user:{entry['sub']}"))
+                await redis_client.delete(f"refresh_user:{entry['sub']}")
+            else:
+                await redis_client.srem(f"refresh_user:{entry['sub']}", entry["family"])
+            for family in families:
+                await self._revoke_family(redis_client, family)
+        except Exception as e:
+            logger.error(f"Failed to revoke refresh token: {e}")
+            raise RuntimeError("Token store unavailable")
+        self._stats["revoked"] += len(families)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+# -------------------
+# Instantiate service
+# -------------------
+token_service = TokenService()
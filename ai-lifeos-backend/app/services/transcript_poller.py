@@ -0,0 +1,208 @@
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from app.services.db_service import db_service
+
+
+@dataclass
+class PendingTranscript:
+    job_id: str
+    transcript_id: str
+    delay: float
+    last_status: str = "queued"
+    failures: int = 0
+
+
+class TranscriptPoller:
+    """
+    One background loop per worker that polls every pending AssemblyAI transcript.
+
+    Each job is re-polled with exponential backoff (initial -> max delay), due jobs are
+    fetched concurrently up to `concurrency` (each poll is its own task, so a slow fetch
+    never holds up the schedule), and callers can await completion with
+    `wait()` instead of running their own polling loop. Jobs whose worker died are
+    picked up again through a lease stored on the Mongo job document.
+    """
+
+    def __init__(
+        self,
+        fetch_status: Callable[[str], Awaitable[Dict[str, Any]]],
+        on_update: Callable[[str, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+        initial_delay: float,
+        max_delay: float,
+        backoff: float,
+        concurrency: int,
+        lease_seconds: int,
+    ):
+        self._fetch_status = fetch_status
+        self._on_update = on_update
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.lease_seconds = lease_seconds
+        self._concurrency = concurrency
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pending: Dict[str, PendingTranscript] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._polls: Set[asyncio.Task] = set()
+        self._next_orphan_scan = 0.0
+
+    # -------------------
+    # Lifecycle
+    # -------------------
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Transcript poller started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        for poll in self._polls:
+            poll.cancel()
+        await asyncio.gather(self._task, *self._polls, return_exceptions=True)
+        self._task = None
+        self._polls.clear()
+        logger.info(f"Transcript poller stopped with {len(self._pending)} pending jobs")
+
+    # -------------------
+    # Public API
+    # -------------------
+    def track(self, job_id: str, transcript_id: str) -> None:
+        """Start polling a submitted transcript (starts the loop if lifespan hasn't)."""
+        self.start()
+        if job_id in self._pending:
+            return
+        self._pending[job_id] = PendingTranscript(job_id, transcript_id, self.initial_delay)
+        self._schedule(job_id, self.initial_delay)
+
+    def is_tracking(self, job_id: str) -> bool:
+        return job_id in self._pending
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until a tracked job reaches a terminal state and return the job document."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            waiters = self._waiters.get(job_id, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "polling": len(self._polls),
+            "waiters": sum(len(w) for w in self._waiters.values()),
+        }
+
+    # -------------------
+    # Internals
+    # -------------------
+    def _schedule(self, job_id: str, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self._heap, (loop.time() + delay, next(self._seq), job_id))
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _resolve(self, job_id: str, job: Dict[str, Any]) -> None:
+        for future in self._waiters.pop(job_id, []):
+            if not future.done():
+                future.set_result(job)
+
+    async def _resume_orphans(self) -> None:
+        jobs = await db_service.claim_orphaned_transcription_jobs(self.lease_seconds)
+        for job in jobs:
+            self.track(job["_id"], job["transcript_id"])
+        if jobs:
+            logger.info(f"Resumed polling for {len(jobs)} orphaned transcription jobs")
+
+    async def _poll(self, job_id: str, semaphore: asyncio.Semaphore) -> None:
+        pending = self._pending.get(job_id)
+        if pending is None:
+            return
+
+        async with semaphore:
+            try:
+                transcript = await self._fetch_status(pending.transcript_id)
+            except Exception as e:
+                pending.failures += 1
+                pending.delay = min(pending.delay * self.backoff, self.max_delay)
+                logger.warning(f"Polling transcript {pending.transcript_id} failed ({pending.failures}x): {e}")
+                self._schedule(job_id, pending.delay)
+                return
+
+        status = transcript.get("status", "processing")
+        if status in ("completed", "error"):
+            del self._pending[job_id]
+            job = await self._on_update(job_id, transcript)
+            self._resolve(job_id, job or {"_id": job_id, "status": status, "error": transcript.get("error")})
+            return
+
+        if status != pending.last_status:
+            pending.last_status = status
+            await self._on_update(job_id, transcript)
+        else:
+            lease_until = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            await db_service.update_transcription_job(job_id, {"lease_until": lease_until})
+
+        pending.delay = min(pending.delay * self.backoff, self.max_delay)
+        self._schedule(job_id, pending.delay)
+
+    async def _poll_safely(self, job_id: str, semaphore: asyncio.Semaphore) -> None:
+        try:
+            await self._poll(job_id, semaphore)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            pending = self._pending.get(job_id)
+            logger.exception(f"Polling job {job_id} failed: {e}")
+            if pending:
+                self._schedule(job_id, pending.delay)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        while True:
+            try:
+                now = loop.time()
+                if now >= self._next_orphan_scan:
+                    self._next_orphan_scan = now + self.lease_seconds / 2
+                    await self._resume_orphans()
+
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+                for job_id in due:
+                    poll = asyncio.create_task(self._poll_safely(job_id, semaphore))
+                    self._polls.add(poll)
+                    poll.add_done_callback(self._polls.discard)
+
+                next_due = self._heap[0][0] if self._heap else self._next_orphan_scan
+                sleep_for = max(0.0, min(next_due, self._next_orphan_scan) - loop.time())
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Transcript poller iteration failed: {e}")
+                await asyncio.sleep(1)
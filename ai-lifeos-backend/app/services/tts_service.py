@@ -1,32 +1,332 @@
-from google.cloud import texttospeech
+import asyncio
+import hashlib
+import os
+import re
+import struct
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+from app.core.cache import SingleFlight
 from app.core.config import config
+from app.core.metrics import track_external
+from app.core.services import services
 from loguru import logger
-import os
 
-# Setup Google Cloud TTS
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = config.GOOGLE_CLOUD_CREDENTIALS_PATH
+# encoding name (texttospeech.AudioEncoding member) -> (file extension, media type)
+AUDIO_FORMATS = {
+    "LINEAR16": ("wav", "audio/wav"),
+    "MP3": ("mp3", "audio/mpeg"),
+    "OGG_OPUS": ("ogg", "audio/ogg"),
+}
+
+
+def _create_client():
+    from google.cloud import texttospeech  # gRPC + protobuf stack, ~0.2s to import
+
+    if config.GOOGLE_CLOUD_CREDENTIALS_PATH:
+        os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", config.GOOGLE_CLOUD_CREDENTIALS_PATH)
+    try:
+        return texttospeech.TextToSpeechAsyncClient()
+    except Exception as e:
+        logger.error(f"Failed to initialize Google TTS client: {e}")
+        raise RuntimeError("TTS client not initialized")
+
+
+async def _close_client(client) -> None:
+    await client.transport.close()
+
+
+services.register("tts", _create_client, requires=("GOOGLE_CLOUD_PROJECT_ID",), close=_close_client)
+
+
+def language_of(voice_name: str) -> str:
+    """"en-US-Standard-A" -> "en-US"."""
+    return "-".join(voice_name.split("-")[:2])
+
+
+# ---------------------------
+# Disk audio cache
+# ---------------------------
+class AudioCache:
+    """
+    Content-addressed audio files on local disk, evicted least-recently-used by total
+    bytes. Recency is the file mtime (touched on every hit), so workers sharing the
+    directory share one LRU order; eviction rescans the directory and trims to 90% of
+    `max_bytes` so it runs rarely.
+    """
+
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total_bytes: Optional[int] = None  # unknown until the first scan
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "evicted_bytes": 0}
+
+    @staticmethod
+    def key(text: str, voice_name: str, encoding: str) -> str:
+        return hashlib.sha256(f"{encoding}\0{voice_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def path(self, key: str, encoding: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{AUDIO_FORMATS[encoding][0]}")
+
+    def _scan(self) -> list:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # evicted by another worker meanwhile
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self) -> None:
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * self.LOW_WATERMARK
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._stats["evictions"] += 1
+            self._stats["evicted_bytes"] += size
+        self._total_bytes = total
+
+    def lookup(self, key: str, encoding: str) -> Optional[str]:
+        path = self.path(key, encoding)
+        try:
+            os.utime(path)  # mark as recently used; raises if it was evicted
+        except FileNotFoundError:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return path
+
+    async def store(self, key: str, encoding: str, audio: bytes) -> str:
+        path = self.path(key, encoding)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(audio)
+        os.replace(tmp_path, path)  # atomic: readers never see a partial file
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in await asyncio.to_thread(self._scan))
+        else:
+            self._total_bytes += len(audio)
+        if self._total_bytes > self.max_bytes:
+            await asyncio.to_thread(self._evict)
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "total_bytes": self._total_bytes,
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ---------------------------
+# Long text: sentence chunks and WAV stitching
+# ---------------------------
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# RIFF/data sizes for a stream whose length isn't known up front (players read to EOF)
+STREAMING_SIZE = 0xFFFFFFFF
+
+
+def _split_oversized(piece: str, max_bytes: int) -> List[str]:
+    """Split a sentence longer than max_bytes at spaces, or mid-word as a last resort."""
+    parts, current = [], ""
+    for word in piece.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if len(candidate.encode("utf-8")) <= max_bytes:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        while len(word.encode("utf-8")) > max_bytes:
+            cut = len(word.encode("utf-8")[:max_bytes].decode("utf-8", "ignore"))
+            parts.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text: str, max_bytes: int) -> List[str]:
+    """
+    Pack whole sentences into chunks of at most max_bytes (UTF-8). The first chunk is
+    a single sentence so the first audio is as quick to synthesize as possible.
+    """
+    chunks, current = [], ""
+    for sentence in SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        for piece in _split_oversized(sentence, max_bytes):
+            candidate = f"{current} {piece}" if current else piece
+            if chunks and len(candidate.encode("utf-8")) <= max_bytes:
+                current = candidate
+            else:
+                if current:
+                    chunks.append(current)
+                current = piece
+                if not chunks:
+                    chunks.append(current)
+                    current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_wav(data: bytes) -> Tuple[bytes, bytes]:
+    """Split a RIFF/WAVE file into (fmt chunk body, PCM sample data)."""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    fmt, offset = None, 12
+    while offset + 8 <= len(data):
+        chunk_id, size = data[offset:offset + 4], struct.unpack("<I", data[offset + 4:offset + 8])[0]
+        body = data[offset + 8:offset + 8 + size]
+        if chunk_id == b"fmt ":
+            fmt = body
+        elif chunk_id == b"data":
+            if fmt is None:
+                break
+            return fmt, body
+        offset += 8 + size + (size & 1)  # chunks are word-aligned
+    raise ValueError("WAV file has no fmt/data chunks")
+
+
+def wav_header(fmt: bytes, data_size: int = STREAMING_SIZE) -> bytes:
+    riff_size = STREAMING_SIZE if data_size == STREAMING_SIZE else 4 + 8 + len(fmt) + 8 + data_size
+    return (
+        b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+audio_cache = AudioCache(config.TTS_CACHE_DIR, config.TTS_CACHE_MAX_BYTES)
+_synthesis_flight = SingleFlight()
 
-try:
-    client = texttospeech.TextToSpeechClient()
-except Exception as e:
-    logger.error(f"Failed to initialize Google TTS client: {e}")
-    client = None
 
 class TTSService:
     @staticmethod
-    def synthesize_speech(text: str, voice_name: str = "en-US-Standard-A") -> bytes:
-        if not client:
-            raise RuntimeError("TTS client not initialized")
+    async def synthesize_speech(text: str, voice_name: str = "en-US-Standard-A", encoding: str = "LINEAR16") -> bytes:
+        tts_client = services.get("tts")
+        from google.cloud import texttospeech  # already imported by the client factory
 
         try:
             synthesis_input = texttospeech.SynthesisInput(text=text)
-            voice = texttospeech.VoiceSelectionParams(language_code="en-US", name=voice_name)
-            audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.LINEAR16)
-            response = client.synthesize_speech(input=synthesis_input, voice=voice, audio_config=audio_config)
+            voice = texttospeech.VoiceSelectionParams(language_code=language_of(voice_name), name=voice_name)
+            audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding[encoding])
+            async with track_external("tts", "synthesize"):
+                response = await tts_client.synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
             logger.info(f"Synthesized speech for: {text[:50]}...")
             return response.audio_content
         except Exception as e:
             logger.error(f"TTS synthesis failed: {e}")
             raise RuntimeError("Failed to synthesize speech")
 
+    @staticmethod
+    async def synthesize_to_file(
+        text: str, voice_name: str = "en-US-Standard-A", encoding: str = "LINEAR16"
+    ) -> Tuple[str, bool]:
+        """
+        Path of the cached audio for (text, voice, encoding), synthesizing it on a miss.
+        Returns (path, cached). Concurrent misses for the same key synthesize once.
+        """
+        if encoding not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        key = AudioCache.key(text, voice_name, encoding)
+        path = audio_cache.lookup(key, encoding)
+        if path:
+            return path, True
+
+        async def synthesize():
+            started = time.perf_counter()
+            audio = await TTSService.synthesize_speech(text, voice_name, encoding)
+            stored = await audio_cache.store(key, encoding, audio)
+            logger.debug(f"Cached {len(audio)} bytes of {encoding} audio in {time.perf_counter() - started:.2f}s")
+            return stored
+
+        path, _ = await _synthesis_flight.do(key, synthesize)
+        return path, False
+
+    @staticmethod
+    async def open_audio(
+        text: str, voice_name: str = "en-US-Standard-A", encoding: str = "LINEAR16"
+    ) -> Tuple[str, Any, bool]:
+        """
+        synthesize_to_file with the file opened for reading, returned as (path, file,
+        cached). Another worker may evict the path before it is read; an open file
+        stays readable, and a file evicted before it could be opened is synthesized again.
+        """
+        for _ in range(2):
+            path, cached = await TTSService.synthesize_to_file(text, voice_name, encoding)
+            try:
+                return path, await aiofiles.open(path, "rb"), cached
+            except FileNotFoundError:
+                # The file is the cache entry, so the next lookup misses and re-synthesizes
+                logger.debug(f"Cached audio {path} was evicted before it was read")
+        raise RuntimeError("Synthesized audio was evicted before it could be read")
+
+    @staticmethod
+    async def _chunk_pcm(text: str, voice_name: str) -> Tuple[bytes, bytes]:
+        _, f, _ = await TTSService.open_audio(text, voice_name, "LINEAR16")
+        try:
+            data = await f.read()
+        finally:
+            await f.close()
+        try:
+            return parse_wav(data)
+        except ValueError as e:
+            raise RuntimeError(f"Unexpected LINEAR16 audio: {e}")
+
+    @staticmethod
+    async def stream_long_speech(text: str, voice_name: str = "en-US-Standard-A") -> AsyncIterator[bytes]:
+        """
+        Yield one LINEAR16 WAV stream for text of any length: a header, then each
+        chunk's samples in order. Chunks are synthesized (through the audio cache) at
+        most TTS_CHUNK_CONCURRENCY ahead of the one being sent, so the first audio goes
+        out once the first sentence is ready and memory stays bounded.
+        """
+        chunks = split_sentences(text, config.TTS_CHUNK_MAX_BYTES)
+        if not chunks:
+            raise ValueError("Text must not be empty")
+        pending, next_chunk, fmt = deque(), 0, None
+        try:
+            while pending or next_chunk < len(chunks):
+                while next_chunk < len(chunks) and len(pending) < config.TTS_CHUNK_CONCURRENCY:
+                    pending.append(asyncio.create_task(TTSService._chunk_pcm(chunks[next_chunk], voice_name)))
+                    next_chunk += 1
+                chunk_fmt, pcm = await pending.popleft()
+                if fmt is None:
+                    fmt = chunk_fmt
+                    yield wav_header(fmt)
+                elif chunk_fmt != fmt:
+                    raise RuntimeError("TTS chunks returned mismatched audio formats")
+                yield pcm
+        finally:
+            for task in pending:
+                task.cancel()
+
 tts_service = TTSService()
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+import aiofiles
+import httpx
+from fastapi import UploadFile
+from loguru import logger
+
+from app.core import http_client
+from app.core.config import config
+from app.core.metrics import track_external
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds UPLOAD_MAX_BYTES."""
+
+
+# ---------------------------
+# Chunk helpers
+# ---------------------------
+async def iter_upload_file(upload: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    """Read a multipart UploadFile in fixed-size reads instead of one full read()."""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def hash_upload_file(upload: UploadFile, chunk_size: int) -> str:
+    """
+    SHA-256 of a multipart upload. Starlette has already spooled the file locally,
+    so this costs a local read and lets duplicates skip the provider entirely.
+    """
+    digest = hashlib.sha256()
+    async for chunk in iter_upload_file(upload, chunk_size):
+        digest.update(chunk)
+    await upload.seek(0)
+    return digest.hexdigest()
+
+
+class ChunkPipe:
+    """
+    Re-chunks an async byte stream into blocks of at most `chunk_size` bytes while
+    enforcing a size limit. `peak_buffered` records the most bytes held at once and
+    `sha256` is computed incrementally over everything that passed through.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], chunk_size: int, max_bytes: int):
+        self._source = source
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.peak_buffered = 0
+        self._digest = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        async for chunk in self._source:
+            self.total_bytes += len(chunk)
+            if self.total_bytes > self.max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+            self._digest.update(chunk)
+            buffer += chunk
+            self.peak_buffered = max(self.peak_buffered, len(buffer))
+            while len(buffer) >= self.chunk_size:
+                yield bytes(buffer[: self.chunk_size])
+                del buffer[: self.chunk_size]
+        if buffer:
+            yield bytes(buffer)
+
+
+# ---------------------------
+# Uploader
+# ---------------------------
+class AudioUploader:
+    """
+    Streams audio to AssemblyAI's upload endpoint (or a local directory standing in for
+    an object store) without holding the whole file in memory.
+    """
+
+    def __init__(self):
+        self._active = 0
+        self._stats = {"uploads": 0, "failed": 0, "bytes": 0, "peak_buffered_bytes": 0}
+
+    async def _upload_assemblyai(self, pipe: ChunkPipe) -> str:
+        async with track_external("assemblyai", "upload"):
+            response = await http_client.request(
+                "POST",
+                f"{config.ASSEMBLYAI_BASE_URL}/upload",
+                content=pipe.__aiter__(),
+                headers={"authorization": config.ASSEMBLYAI_API_KEY, "content-type": "application/octet-stream"},
+                timeout=httpx.Timeout(
+                    config.HTTP_TIMEOUT_SECONDS,
+                    connect=config.HTTP_CONNECT_TIMEOUT_SECONDS,
+                    pool=config.HTTP_POOL_TIMEOUT_SECONDS,
+                    write=120.0,
+                ),
+                retry=False,  # the body is a one-shot stream
+            )
+            response.raise_for_status()
+            return response.json()["upload_url"]
+
+    async def _upload_local(self, pipe: ChunkPipe) -> str:
+        os.makedirs(config.UPLOAD_LOCAL_DIR, exist_ok=True)
+        path = os.path.join(config.UPLOAD_LOCAL_DIR, uuid.uuid4().hex)
+        try:
+            async with aiofiles.open(path, "wb") as f:
+                async for block in pipe:
+                    await f.write(block)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return f"file://{os.path.abspath(path)}"
+
+    async def upload(self, source: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """Pipe `source` to the configured backend and return the provider URL, size and SHA-256."""
+        pipe = ChunkPipe(source, config.UPLOAD_CHUNK_BYTES, config.UPLOAD_MAX_BYTES)
+        self._active += 1
+        try:
+            if config.UPLOAD_BACKEND == "local":
+                upload_url = await self._upload_local(pipe)
+            else:
+                upload_url = await self._upload_assemblyai(pipe)
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(f"Audio upload failed after {pipe.total_bytes} bytes: {e}")
+            raise
+        finally:
+            self._active -= 1
+            self._stats["peak_buffered_bytes"] = max(self._stats["peak_buffered_bytes"], pipe.peak_buffered)
+
+        self._stats["uploads"] += 1
+        self._stats["bytes"] += pipe.total_bytes
+        logger.info(f"Uploaded {pipe.total_bytes} bytes (peak buffer {pipe.peak_buffered} bytes)")
+        return {
+            "upload_url": upload_url,
+            "size": pipe.total_bytes,
+            "sha256": pipe.sha256,
+            "peak_buffered": pipe.peak_buffered,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"active": self._active, "chunk_bytes": config.UPLOAD_CHUNK_BYTES, **self._stats}
+
+
+audio_uploader = AudioUploader()
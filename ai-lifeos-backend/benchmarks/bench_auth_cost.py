@@ -0,0 +1,78 @@
+"""
+Per-request auth cost: full HS256 verification (jwt.decode) vs. the cached
+get_current_user dependency, as a microbenchmark and end to end through a
+route added to the app that does nothing but auth.
+
+    python -m benchmarks.bench_auth_cost --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from loguru import logger
+
+from app.core import auth_utils
+from app.core.auth_utils import create_access_token, get_current_user, verify_token
+from app.main import app
+from benchmarks.bench_gemini_load import percentile
+
+
+async def uncached_dependency(credentials: HTTPAuthorizationCredentials = Depends(auth_utils.security)):
+    """The old per-router dependency: verify on every request."""
+    return verify_token(credentials.credentials)
+
+
+async def micro(name, dependency, credentials, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await dependency(credentials)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<22} {elapsed / iterations * 1e6:8.2f}us per call")
+
+
+async def auth_only():
+    return {}
+
+
+app.add_api_route("/bench/auth", auth_only, dependencies=[Depends(get_current_user)])
+
+
+async def end_to_end(name, token, requests):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/bench/auth")
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.text
+    print(
+        f"{name:<22} p50={statistics.median(latencies):6.3f}ms p99={percentile(latencies, 99):6.3f}ms"
+    )
+
+
+async def main(args):
+    logger.remove()
+    token = create_access_token({"sub": "bench@example.com"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    await micro("jwt.decode every call", uncached_dependency, credentials, args.iterations)
+    await micro("cached dependency", get_current_user, credentials, args.iterations)
+
+    app.dependency_overrides[get_current_user] = uncached_dependency
+    await end_to_end("http, uncached", token, args.requests)
+    app.dependency_overrides.clear()
+    await end_to_end("http, cached", token, args.requests)
+    print(f"cache stats: {auth_utils.auth_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+"""
+Sync throughput: replaying N offline note edits one request at a time vs. one
+POST /api/notes/bulk.
+
+Runs the FastAPI app in-process against mongomock (every Mongo call delayed by
+--rtt-ms to stand in for the network round trip) and fakeredis. The workload is
+60% creates, 30% updates and 10% deletes of pre-seeded notes.
+
+    python -m benchmarks.bench_bulk_sync --operations 500 --rtt-ms 1
+"""
+import argparse
+import asyncio
+import random
+import time
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import httpx
+from bson import ObjectId
+from loguru import logger
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.routers import notes
+from app.services import db_service as db_module
+
+ROUND_TRIPS = {"insert_one", "update_one", "delete_one", "find_one", "bulk_write", "insert_many"}
+
+
+class LatencyCursor:
+    def __init__(self, cursor, rtt: float):
+        self._cursor = cursor
+        self._rtt = rtt
+
+    async def __aiter__(self):
+        await asyncio.sleep(self._rtt)
+        async for doc in self._cursor:
+            yield doc
+
+
+class LatencyCollection:
+    """Adds one simulated network round trip to every awaited Mongo call."""
+
+    def __init__(self, collection, rtt: float):
+        self._collection = collection
+        self._rtt = rtt
+        self.round_trips = 0
+
+    def find(self, *args, **kwargs):
+        self.round_trips += 1
+        return LatencyCursor(self._collection.find(*args, **kwargs), self._rtt)
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in ROUND_TRIPS:
+            return attr
+
+        async def call(*args, **kwargs):
+            self.round_trips += 1
+            await asyncio.sleep(self._rtt)
+            return await attr(*args, **kwargs)
+        return call
+
+
+def make_workload(seed_ids, count: int, rng: random.Random):
+    operations, deletable = [], list(seed_ids)
+    rng.shuffle(deletable)
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.6 or not deletable:
+            operations.append({"op": "create", "data": {"title": f"offline {i}", "content": "x" * 300, "tags": ["sync"]}})
+        elif roll < 0.9:
+            operations.append({"op": "update", "id": rng.choice(deletable), "data": {"content": f"edited {i}"}})
+        else:
+            operations.append({"op": "delete", "id": deletable.pop()})
+    return operations
+
+
+async def replay_single(client: httpx.AsyncClient, operations):
+    for op in operations:
+        if op["op"] == "create":
+            response = await client.post("/api/notes/", json=op["data"])
+        elif op["op"] == "update":
+            response = await client.patch(f"/api/notes/{op['id']}", json=op["data"])
+        else:
+            response = await client.delete(f"/api/notes/{op['id']}")
+        assert response.status_code in (200, 404), response.text
+
+
+async def replay_bulk(client: httpx.AsyncClient, operations, batch: int):
+    for start in range(0, len(operations), batch):
+        response = await client.post("/api/notes/bulk", json={"operations": operations[start:start + batch]})
+        assert response.status_code == 200, response.text
+
+
+async def run(name: str, args, replay):
+    mongo = AsyncMongoMockClient()["bench"]
+    collection = LatencyCollection(mongo["notes"], args.rtt_ms / 1000)
+    seed = [{"_id": ObjectId(), "title": f"seed {i}", "content": "y" * 300, "tags": []} for i in range(args.operations)]
+    await mongo["notes"].insert_many(seed)
+    operations = make_workload([str(doc["_id"]) for doc in seed], args.operations, random.Random(3))
+
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_redis():
+        return redis_client
+
+    transport = httpx.ASGITransport(app=app)
+    with patch.object(db_module, "notes_collection", collection), \
+            patch("app.core.cache.get_redis_client", get_redis):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            started = time.perf_counter()
+            await replay(client, operations)
+            elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<14} ops={len(operations):<5} {elapsed * 1000:9.1f}ms "
+        f"{len(operations) / elapsed:9.0f} ops/s  mongo round trips={collection.round_trips}"
+    )
+
+
+async def main(args):
+    logger.remove()  # one log line per item would dominate the single-item timing
+    app.dependency_overrides[notes.get_current_user] = lambda: {"sub": "bench@example.com"}
+    await run("single-item", args, replay_single)
+    await run("bulk", args, lambda client, ops: replay_bulk(client, ops, args.batch))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=500, help="operations per bulk request")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated Mongo round trip")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,47 @@
+"""
+Cache codec microbenchmark: orjson codec vs. the old str(dict) / eval() path.
+
+    python -m benchmarks.bench_cache_codec --iterations 100000
+"""
+import argparse
+import timeit
+
+from app.core import codec
+from app.models.schemas import LearningSuggestionResponse, TranscriptResponse
+
+TRANSCRIPT = TranscriptResponse(
+    transcript_id="5551722-f677-48a6-9f31-13bdc7b5b8a1",
+    text="Goroutines are lightweight threads managed by the Go runtime. " * 20,
+    confidence=0.94,
+    duration=42.5,
+)
+SUGGESTION = LearningSuggestionResponse(
+    suggestion="## Learning Topic: Channels\n\n### Explanation:\n" + "Channels connect goroutines. " * 80,
+    resources=[f"https://www.youtube.com/watch?v=abcdefghij{i}" for i in range(3)],
+)
+
+
+def old_roundtrip(model):
+    return type(model)(**eval(str(model.dict())))
+
+
+def codec_roundtrip(model):
+    return codec.ModelCodec(type(model)).decode(codec.dumps(model))
+
+
+def main(args):
+    for name, model in (("transcript", TRANSCRIPT), ("suggestion", SUGGESTION)):
+        assert old_roundtrip(model) == codec_roundtrip(model) == model
+        old = timeit.timeit(lambda: old_roundtrip(model), number=args.iterations)
+        new = timeit.timeit(lambda: codec_roundtrip(model), number=args.iterations)
+        print(
+            f"{name:<11} str+eval={old / args.iterations * 1e6:8.2f}us "
+            f"codec={new / args.iterations * 1e6:8.2f}us speedup={old / new:5.1f}x "
+            f"size={len(str(model.dict()))}B -> {len(codec.dumps(model))}B"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
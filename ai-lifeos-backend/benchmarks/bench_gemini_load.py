@@ -0,0 +1,106 @@
+"""
+Load test: CRUD latency while Gemini calls are in flight.
+
+Runs the FastAPI app in-process against a stubbed Gemini model (blocking sleep,
+like the real SDK) and a stubbed notes store, then measures GET /api/notes/
+latency with and without a burst of /api/learning/suggest traffic.
+
+    python -m benchmarks.bench_gemini_load --gemini-latency 0.5 --suggest-concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+
+from app.core.services import services
+from app.main import app
+from app.routers import notes
+from app.services import gemini_service as gemini_module
+
+
+class StubModel:
+    """Mimics GenerativeModel.generate_content: blocks the calling thread."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt: str):
+        time.sleep(self.latency)
+        return SimpleNamespace(text="## Learning Topic: Stub\nhttps://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+
+async def stub_get_notes(*args, **kwargs):
+    return [{"_id": str(i), "title": f"note {i}", "content": "x" * 200} for i in range(20)], None
+
+
+async def run_inline(fn, *args, **kwargs):
+    """The pre-pool behavior: call the blocking SDK directly on the event loop."""
+    return fn(*args, **kwargs)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure_crud(client: httpx.AsyncClient, duration: float, interval: float):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/api/notes/")
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def suggest_burst(client: httpx.AsyncClient, concurrency: int, stop: asyncio.Event):
+    async def worker():
+        while not stop.is_set():
+            await client.post("/api/learning/suggest", json={"user_input": "goroutines"})
+            # In-process transport never suspends on its own; yield like a socket would
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def scenario(name: str, args, with_load: bool):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        stop = asyncio.Event()
+        load = asyncio.create_task(suggest_burst(client, args.suggest_concurrency, stop)) if with_load else None
+        await asyncio.sleep(0.05)
+        latencies = await measure_crud(client, args.duration, args.crud_interval)
+        stop.set()
+        if load:
+            await load
+
+    print(
+        f"{name:<28} n={len(latencies):<5} p50={statistics.median(latencies):8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms max={max(latencies):8.2f}ms"
+    )
+
+
+async def main(args):
+    app.dependency_overrides[notes.get_current_user] = lambda: {"sub": "bench@example.com"}
+    with services.override("gemini", StubModel(args.gemini_latency)), \
+            patch.object(notes.db_service, "get_notes", stub_get_notes):
+        await scenario("crud only", args, with_load=False)
+        await scenario("crud + gemini (pool)", args, with_load=True)
+        with patch.object(gemini_module.gemini_executor, "run", run_inline):
+            await scenario("crud + gemini (inline)", args, with_load=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gemini-latency", type=float, default=0.2)
+    parser.add_argument("--suggest-concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of CRUD traffic per scenario")
+    parser.add_argument("--crud-interval", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""
+Outbound HTTP: a new httpx.AsyncClient per call (the old call_external_api) vs. the
+worker's shared, pooled client (app.core.http_client.request).
+
+Both hit benchmarks.fake_providers' AssemblyAI transcript endpoint, over TLS with a
+throwaway self-signed certificate unless --plain, so each new client pays a TCP +
+TLS handshake the way a call to api.assemblyai.com does. Reports req/s, p50/p95 and
+how many connections each approach opened.
+
+    python -m benchmarks.bench_http_client --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import httpx
+
+from app.core import http_client
+from app.core.metrics import OUTBOUND_CONNECTIONS_OPENED
+from app.core.services import services
+from benchmarks.bench_gemini_load import percentile
+
+
+def self_signed_cert(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def start_fake(args, directory: str) -> subprocess.Popen:
+    tls = ""
+    if not args.plain:
+        cert, key = self_signed_cert(directory)
+        os.environ["SSL_CERT_FILE"] = cert  # httpx trusts it (trust_env), so both clients verify as usual
+        tls = f", ssl_keyfile={key!r}, ssl_certfile={cert!r}"
+    command = [sys.executable, "-c", (
+        "import argparse, uvicorn\n"
+        "from benchmarks.fake_providers import add_arguments, create_app\n"
+        "parser = argparse.ArgumentParser(); add_arguments(parser)\n"
+        f"uvicorn.run(create_app(parser.parse_args(['--assemblyai-ms', '{args.latency_ms}'])), host='127.0.0.1', "
+        f"port={args.port}, log_level='warning'{tls})"
+    )]
+    return subprocess.Popen(command, env=dict(os.environ, PYTHONPATH=os.getcwd()))
+
+
+async def wait_ready(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        for _ in range(200):
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def per_call_client(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def shared_client(url: str) -> None:
+    (await http_client.request("GET", url)).raise_for_status()
+
+
+async def run(call, url: str, args) -> list:
+    latencies = []
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await call(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return latencies
+
+
+def connections_opened(host: str) -> float:
+    return OUTBOUND_CONNECTIONS_OPENED.labels(host=host)._value.get()
+
+
+async def main(args):
+    scheme = "http" if args.plain else "https"
+    base = f"{scheme}://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as directory:
+        process = start_fake(args, directory)
+        try:
+            await wait_ready(base + "/docs")
+            async with httpx.AsyncClient() as setup:
+                transcript_id = (await setup.post(base + "/v2/transcript", json={"audio_url": "x"})).json()["id"]
+            url = f"{base}/v2/transcript/{transcript_id}"
+
+            shared = http_client._create_client()
+            with services.override("http", shared), \
+                    patch.object(http_client.config, "HTTP_HOST_MAX_CONCURRENCY", args.concurrency):
+                for name, call in (("per-call client", per_call_client), ("shared client", shared_client)):
+                    opened_before = connections_opened("127.0.0.1")
+                    started = time.perf_counter()
+                    latencies = await run(call, url, args)
+                    elapsed = time.perf_counter() - started
+                    opened = (
+                        args.requests if call is per_call_client
+                        else connections_opened("127.0.0.1") - opened_before
+                    )
+                    print(
+                        f"{name:<16} {args.requests / elapsed:8.0f} req/s  p50={percentile(latencies, 50):7.2f}ms  "
+                        f"p95={percentile(latencies, 95):7.2f}ms  connections opened={opened:.0f}"
+                    )
+            await shared.aclose()
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="fake provider latency per request")
+    parser.add_argument("--port", type=int, default=9400)
+    parser.add_argument("--plain", action="store_true", help="plain HTTP instead of TLS")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""
+Logging overhead: the old synchronous setup (rotating file sink + print() sink at
+DEBUG, formatted and written on the event loop) vs. the queue-backed JSON pipeline.
+
+Measures the cost of one logger call on the caller, then requests/sec for POST
+/api/notes/ (the app in-process against mongomock and fakeredis; stdout is
+redirected to a scratch file so both setups pay for a real write).
+
+    python -m benchmarks.bench_logging --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import httpx
+from loguru import logger
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core import logger as log_module
+from app.core.config import config
+from app.main import app
+from app.routers import notes
+from app.services import db_service as db_module
+
+
+def legacy_setup(directory):
+    """app/core/logger.py before the queue-backed sink."""
+    log_module.close_logging()
+    logger.remove()
+    logger.add(
+        os.path.join(directory, "app.log"),
+        rotation="1 day",
+        level="INFO",
+        format="{time:YYYY-MM-DD at HH:mm:ss} | {level} | {message}",
+    )
+    logger.add(lambda msg: print(msg, end=""), level="DEBUG")
+
+
+def queued_setup(directory, level):
+    def setup():
+        with patch.object(config, "LOG_FILE", os.path.join(directory, "app.log")), \
+                patch.object(config, "LOG_LEVEL", level):
+            log_module.configure_logging()
+    return setup
+
+
+def per_call(iterations):
+    started = time.perf_counter()
+    for i in range(iterations):
+        logger.info(f"Inserted note: {i}")
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def throughput(requests, concurrency):
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_redis():
+        return redis_client
+
+    remaining = iter(range(requests))
+
+    async def client_loop(client):
+        for i in remaining:
+            response = await client.post("/api/notes/", json={"title": f"note {i}", "content": "x" * 200})
+            assert response.status_code == 200, response.text
+
+    transport = httpx.ASGITransport(app=app)
+    with patch.object(db_module, "notes_collection", AsyncMongoMockClient()["bench"]["notes"]), \
+            patch("app.core.cache.get_redis_client", get_redis):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+            return requests / (time.perf_counter() - started)
+
+
+async def main(args):
+    app.dependency_overrides[notes.get_current_user] = lambda: {"sub": "bench@example.com"}
+    with tempfile.TemporaryDirectory() as directory:
+        scenarios = [
+            ("sync file + print", lambda: legacy_setup(directory)),
+            ("queued json INFO", queued_setup(directory, "INFO")),
+            ("queued json DEBUG", queued_setup(directory, "DEBUG")),  # debug sampled at LOG_SAMPLE_RATES
+        ]
+        stdout = open(os.path.join(directory, "stdout.log"), "w")
+        results = []
+        for name, setup in scenarios:
+            setup()
+            with contextlib.redirect_stdout(stdout):
+                call_us = per_call(args.calls)
+                rps = await throughput(args.requests, args.concurrency)
+                log_module.flush_logging()
+            results.append((name, call_us, rps, log_module.logging_stats() if "queued" in name else None))
+        stdout.close()
+        log_module.close_logging()
+
+    for name, call_us, rps, stats in results:
+        print(f"{name:<20} logger.info={call_us:7.2f}us/call  POST /api/notes/={rps:8.0f} req/s")
+        if stats:
+            print(f"  {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=20000, help="iterations of the per-call microbenchmark")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,91 @@
+"""
+Load test: non-auth latency during a login storm.
+
+Runs the FastAPI app in-process with users in mongomock and real bcrypt (passlib's
+default cost), then measures GET / latency while --logins concurrent clients log in
+continuously: once with the bounded password pool and once with bcrypt called
+inline on the event loop (the old behavior).
+
+    python -m benchmarks.bench_login_storm --logins 32 --duration 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+import httpx
+from loguru import logger
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.services import auth_service
+from benchmarks.bench_gemini_load import percentile, run_inline
+
+EMAIL, PASSWORD = "storm@example.com", "correct horse battery staple"
+
+
+async def measure_root(client: httpx.AsyncClient, duration: float, interval: float):
+    """Latency from when each probe was due, so event-loop stalls before it runs are counted."""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    due = time.perf_counter()
+    while True:
+        response = await client.get("/")
+        latencies.append((time.perf_counter() - due) * 1000)
+        assert response.status_code == 200, response.text
+        if time.perf_counter() >= deadline:
+            return latencies
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+
+
+async def login_storm(client: httpx.AsyncClient, concurrency: int, stop: asyncio.Event, outcomes: dict):
+    async def worker():
+        while not stop.is_set():
+            response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+            if response.status_code == 503:
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+            await asyncio.sleep(0)  # in-process transport never suspends on its own
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def scenario(name: str, args):
+    outcomes: dict = {}
+    started = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        stop = asyncio.Event()
+        storm = asyncio.create_task(login_storm(client, args.logins, stop, outcomes))
+        await asyncio.sleep(0.05)
+        latencies = await measure_root(client, args.duration, args.interval)
+        stop.set()
+        await storm
+
+    print(
+        f"{name:<22} n={len(latencies):<5} p50={statistics.median(latencies):8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms max={max(latencies):8.2f}ms "
+        f"logins={outcomes} wall={time.perf_counter() - started:.1f}s"
+    )
+
+
+async def main(args):
+    logger.remove()
+    db = AsyncMongoMockClient()["bench"]
+    await db["users"].insert_one({"email": EMAIL, "password": auth_service.pwd_context.hash(PASSWORD)})
+
+    with patch.object(auth_service, "db", db):
+        await scenario("login storm (pool)", args)
+        print(f"  pool stats: {auth_service.password_executor.stats()}")
+        with patch.object(auth_service.password_executor, "run", run_inline):
+            await scenario("login storm (inline)", args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.01, help="pause between GET / probes")
+    asyncio.run(main(parser.parse_args()))
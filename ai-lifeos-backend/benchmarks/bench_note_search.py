@@ -0,0 +1,140 @@
+"""
+Note search at 10k/100k notes: in-process inverted index vs. the client-side scan
+the API forced before /api/notes/search existed, and optionally Mongo $text.
+
+Notes are synthetic (Zipf-distributed vocabulary, ~80-word bodies). Pass a scratch
+database with --mongo-uri to also load them into Mongo and time $text queries through
+the real text_search index; the database is dropped afterwards.
+
+    python -m benchmarks.bench_note_search --sizes 10000 100000
+    python -m benchmarks.bench_note_search --sizes 10000 --mongo-uri mongodb://localhost:27017/search_bench
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from unittest.mock import patch
+
+from bson import ObjectId
+
+from app.core.cache import InvalidationBus
+from app.services import search_service
+from app.services.search_service import InvertedIndexSearch, MongoTextSearch, tokenize
+from benchmarks.bench_gemini_load import percentile
+from benchmarks.bench_upload_memory import current_rss
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "tu", "ve", "no", "si", "da", "pe", "zu", "ha", "qi", "bo", "ne"]
+
+
+def make_vocabulary(rng: random.Random, size: int):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_notes(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, 20000)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Zipf-ish
+    tags = [f"tag{i}" for i in range(20)]
+    notes = []
+    for _ in range(count):
+        notes.append({
+            "_id": ObjectId(),
+            "title": " ".join(rng.choices(vocabulary, weights, k=4)),
+            "content": " ".join(rng.choices(vocabulary, weights, k=80)),
+            "summary": None,
+            "tags": rng.sample(tags, 2),
+        })
+    # Queries use mid-frequency words so they match a realistic share of notes
+    queries = [" ".join(rng.sample(vocabulary[50:2000], rng.randint(1, 3))) for _ in range(200)]
+    return notes, queries
+
+
+def naive_scan(notes, query, limit=20):
+    """Download-everything-and-grep: what clients did without a search endpoint."""
+    terms = set(tokenize(query))
+    hits = []
+    for note in notes:
+        words = tokenize(f"{note['title']} {note['content']}")
+        score = sum(1 for word in words if word in terms)
+        if score:
+            hits.append((score, str(note["_id"])))
+    hits.sort(reverse=True)
+    return hits[:limit]
+
+
+def time_queries(fn, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    print(
+        f"  {name:<22} p50={statistics.median(latencies):9.2f}ms "
+        f"p99={percentile(latencies, 99):9.2f}ms"
+    )
+
+
+async def bench_mongo(uri, notes, queries):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.models.indexes import INDEXES
+
+    client = AsyncIOMotorClient(uri)
+    db = client.get_default_database()
+    try:
+        await db.notes.drop()
+        for start in range(0, len(notes), 5000):
+            await db.notes.insert_many([dict(note) for note in notes[start:start + 5000]])
+        for spec in INDEXES:
+            if spec.collection == "notes":
+                await db.notes.create_index(spec.keys, name=spec.name, **spec.options)
+
+        engine = MongoTextSearch()
+        latencies = []
+        with patch.object(search_service, "notes_collection", db.notes):
+            for query in queries:
+                started = time.perf_counter()
+                await engine.search(query, None, 20, 0)
+                latencies.append((time.perf_counter() - started) * 1000)
+        report("mongo $text", latencies)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+def main(args):
+    for size in args.sizes:
+        notes, queries = make_notes(size)
+        print(f"{size} notes")
+
+        rss_before = current_rss()
+        engine = InvertedIndexSearch(InvalidationBus("bench:invalidate"), rebuild_seconds=3600)
+        started = time.perf_counter()
+        for note in notes:
+            engine.index_document(note)
+        build = time.perf_counter() - started
+        print(
+            f"  build                  {build:9.2f}s  {len(engine._postings)} terms  "
+            f"~{(current_rss() - rss_before) / 2**20:.0f} MiB"
+        )
+
+        report("inverted index", time_queries(lambda q: engine.rank(q, None, 20), queries))
+        report("inverted index + tag", time_queries(lambda q: engine.rank(q, ["tag3"], 20), queries))
+        report("client-side scan", time_queries(lambda q: naive_scan(notes, q), queries[: args.scan_queries]))
+        if args.mongo_uri:
+            asyncio.run(bench_mongo(args.mongo_uri, notes, queries))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--scan-queries", type=int, default=10, help="the scan is slow; time fewer queries")
+    parser.add_argument("--mongo-uri", help="scratch database for the $text comparison (dropped afterwards)")
+    main(parser.parse_args())
@@ -0,0 +1,104 @@
+"""
+Response serialization for list endpoints: the old path (response_model of
+List[Dict[str, Any]], `_id` stringified in the service and again in the router,
+FastAPI's jsonable_encoder + json.dumps) vs. returning the documents as read from Mongo
+in an ORJSONResponse (app.core.responses).
+
+Both apps serve the same note documents (ObjectId `_id`, datetime timestamps, tags)
+and are called in-process over ASGI, so the numbers are the serialization work per
+request plus a constant routing overhead. Reports ms/request and MB/s per payload size.
+
+    python -m benchmarks.bench_serialization --sizes 100 1000 10000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.core.responses import ORJSONResponse
+from app.models.schemas import NoteOut
+
+
+def make_notes(count: int) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Note {i}",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            "summary": "A short summary of the note",
+            "tags": ["work", "ideas", f"tag-{i % 10}"],
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def old_app(notes: List[Dict[str, Any]]) -> FastAPI:
+    class NoteListResponse(BaseModel):
+        notes: List[Dict[str, Any]]
+        next_cursor: Optional[str] = None
+
+    app = FastAPI()
+
+    @app.get("/notes", response_model=NoteListResponse)
+    async def get_notes():
+        page = [dict(note) for note in notes]  # what Mongo hands back each time
+        for note in page:
+            note["_id"] = str(note["_id"])
+        for note in page:
+            note["_id"] = str(note["_id"])
+        return {"notes": page, "next_cursor": None}
+
+    return app
+
+
+def new_app(notes: List[Dict[str, Any]]) -> FastAPI:
+    class NoteListResponse(BaseModel):
+        notes: List[NoteOut]
+        next_cursor: Optional[str] = None
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/notes", response_model=NoteListResponse)
+    async def get_notes():
+        page = [dict(note) for note in notes]
+        return ORJSONResponse({"notes": page, "next_cursor": None})
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        body = (await client.get("/notes")).content  # warm up
+        started = time.perf_counter()
+        for _ in range(requests):
+            (await client.get("/notes")).raise_for_status()
+        elapsed = time.perf_counter() - started
+    return elapsed / requests * 1000, len(body) * requests / elapsed / 1e6, body
+
+
+async def main(args):
+    print(f"{'items':>6}  {'path':<8} {'ms/req':>9} {'MB/s':>8} {'speedup':>8}")
+    for size in args.sizes:
+        notes = make_notes(size)
+        requests = max(3, args.items // size)
+        old_ms, old_mbps, old_body = await measure(old_app(notes), requests)
+        new_ms, new_mbps, new_body = await measure(new_app(notes), requests)
+        assert len(new_body) <= len(old_body)  # orjson is compact; json.dumps adds ", " separators
+        print(f"{size:>6}  {'old':<8} {old_ms:9.2f} {old_mbps:8.1f}")
+        print(f"{size:>6}  {'orjson':<8} {new_ms:9.2f} {new_mbps:8.1f} {old_ms / new_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--items", type=int, default=200000, help="items to serialize per size (sets request count)")
+    asyncio.run(main(parser.parse_args()))
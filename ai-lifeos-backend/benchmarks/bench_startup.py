@@ -0,0 +1,112 @@
+"""
+Cold-start cost of a worker: `import app.main` and time to the first served request.
+
+Each sample is a fresh interpreter, as for a new --workers process. Reports the
+median/min/max import time, the slowest modules from `python -X importtime`, and
+(with --server) the time from spawning benchmarks.suite_server until GET / answers.
+
+Budget check: exits 1 if the median import exceeds --budget-ms, or if importing the
+app pulled in a provider SDK that should only load on first use (LAZY_MODULES).
+
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 1200 --server
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+# Imported by service factories on first use, never by `import app.main`
+LAZY_MODULES = ("google.generativeai", "google.cloud.texttospeech", "motor.motor_asyncio")
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({"ms": elapsed, "modules": len(sys.modules), "lazy_loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, LOG_STDOUT="false", LOG_FILE="")
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def measure_import() -> dict:
+    return json.loads(run_python("-c", IMPORT_PROBE).stdout.strip().splitlines()[-1])
+
+
+def slowest_modules(top: int) -> list:
+    """(cumulative ms, self ms, module) for the slowest modules loaded by `import app.main`."""
+    rows = []
+    for line in run_python("-X", "importtime", "-c", "import app.main").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def measure_server(port: int) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.suite_server", "--port", str(port)],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"suite_server exited with status {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.TransportError:
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main(args) -> int:
+    samples = [measure_import() for _ in range(args.runs)]
+    times = [sample["ms"] for sample in samples]
+    median = statistics.median(times)
+    print(
+        f"import app.main   median={median:7.1f}ms  min={min(times):7.1f}ms  max={max(times):7.1f}ms  "
+        f"modules={samples[0]['modules']}"
+    )
+
+    print("\nslowest imports (cumulative / self ms):")
+    for cumulative, own, name in slowest_modules(args.top):
+        print(f"  {cumulative:8.1f} {own:8.1f}  {name}")
+
+    if args.server:
+        startup = [measure_server(args.port) for _ in range(args.runs)]
+        print(f"\nspawn -> first response  median={statistics.median(startup):7.1f}ms  max={max(startup):7.1f}ms")
+
+    failures = []
+    lazy_loaded = sorted({module for sample in samples for module in sample["lazy_loaded"]})
+    if lazy_loaded:
+        failures.append(f"imported at startup but should be lazy: {', '.join(lazy_loaded)}")
+    if args.budget_ms and median > args.budget_ms:
+        failures.append(f"median import {median:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    for failure in failures:
+        print(f"\nBUDGET FAILED: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=1200.0, help="0 to only check LAZY_MODULES")
+    parser.add_argument("--server", action="store_true", help="also time spawn -> first response")
+    parser.add_argument("--port", type=int, default=9300)
+    sys.exit(main(parser.parse_args()))
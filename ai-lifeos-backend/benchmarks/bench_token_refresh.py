@@ -0,0 +1,68 @@
+"""
+Cost of renewing an access token: POST /auth/login (Mongo lookup + bcrypt verify)
+vs. POST /auth/refresh (Redis only).
+
+Runs the FastAPI app in-process with users in mongomock and tokens in fakeredis.
+
+    python -m benchmarks.bench_token_refresh --renewals 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import httpx
+from loguru import logger
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.services import auth_service, token_service
+from benchmarks.bench_gemini_load import percentile
+
+EMAIL, PASSWORD = "renew@example.com", "correct horse battery staple"
+
+
+def report(name, latencies, verified):
+    print(
+        f"{name:<8} n={len(latencies):<4} p50={statistics.median(latencies):8.2f}ms "
+        f"p99={percentile(latencies, 99):8.2f}ms bcrypt verifies={verified}"
+    )
+
+
+async def main(args):
+    logger.remove()
+    db = AsyncMongoMockClient()["bench"]
+    await db["users"].insert_one({"email": EMAIL, "password": auth_service.pwd_context.hash(PASSWORD)})
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_redis():
+        return redis_client
+
+    transport = httpx.ASGITransport(app=app)
+    with patch.object(auth_service, "db", db), patch.object(token_service, "get_redis_client", get_redis):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, renew in (("login", None), ("refresh", True)):
+                verified_before = auth_service.password_executor.stats()["completed"]
+                response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                refresh_token = response.json()["refresh_token"]
+                latencies = []
+                for _ in range(args.renewals):
+                    started = time.perf_counter()
+                    if renew:
+                        response = await client.post("/auth/refresh", json={"refresh_token": refresh_token})
+                        refresh_token = response.json()["refresh_token"]
+                    else:
+                        response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                    assert response.status_code == 200, response.text
+                    latencies.append((time.perf_counter() - started) * 1000)
+                # The initial login is one verify in both scenarios
+                verified = auth_service.password_executor.stats()["completed"] - verified_before
+                report(name, latencies, verified)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renewals", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Time to first audio for long TTS inputs: chunked streaming synthesis vs. waiting
+for the whole text to be synthesized.
+
+Google is replaced by a fake whose latency grows with input length
+(--base-ms + --ms-per-kb), returning LINEAR16 WAV like the real API. "whole text"
+synthesizes every chunk before returning anything (the best a buffered endpoint can
+do, since one request is capped at 5000 bytes); "streamed" is
+TTSService.stream_long_speech with the audio cache in a scratch directory.
+
+    python -m benchmarks.bench_tts_stream --sizes 2000 20000 100000
+"""
+import argparse
+import asyncio
+import struct
+import tempfile
+import time
+from unittest.mock import patch
+
+from loguru import logger
+
+from app.core.config import config
+from app.services import tts_service as tts_module
+from app.services.tts_service import AudioCache, TTSService, split_sentences, wav_header
+
+SENTENCE = "Step {} is to review the quarterly goals and water the plants before noon. "
+FMT = struct.pack("<HHIIHH", 1, 1, 24000, 48000, 2, 16)
+
+
+def make_fake_google(args):
+    async def synthesize_speech(text, voice_name="en-US-Standard-A", encoding="LINEAR16"):
+        size = len(text.encode("utf-8"))
+        await asyncio.sleep((args.base_ms + args.ms_per_kb * size / 1024) / 1000)
+        return wav_header(FMT, size * 40) + b"\0" * (size * 40)  # ~speech-rate worth of samples
+    return synthesize_speech
+
+
+async def whole_text(text):
+    started = time.perf_counter()
+    for chunk in split_sentences(text, config.TTS_CHUNK_MAX_BYTES):
+        await TTSService.synthesize_speech(chunk)
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, elapsed
+
+
+async def streamed(text):
+    started = time.perf_counter()
+    first = None
+    async for part in TTSService.stream_long_speech(text):
+        if first is None:
+            first = (time.perf_counter() - started) * 1000
+    return first, (time.perf_counter() - started) * 1000
+
+
+async def main(args):
+    logger.remove()
+    with patch.object(TTSService, "synthesize_speech", make_fake_google(args)):
+        for size in args.sizes:
+            # Numbered so no two chunks are identical (repeats would be audio cache hits)
+            text = "".join(SENTENCE.format(i) for i in range(size // len(SENTENCE) + 1))[:size]
+            for name, run in (("whole text", whole_text), ("streamed", streamed)):
+                with tempfile.TemporaryDirectory() as directory, \
+                        patch.object(tts_module, "audio_cache", AudioCache(directory, 1 << 30)):
+                    first, total = await run(text)
+                print(f"{size:>7}B {name:<11} first audio={first:8.1f}ms  complete={total:8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--base-ms", type=float, default=150.0, help="fixed latency per Google call")
+    parser.add_argument("--ms-per-kb", type=float, default=300.0, help="latency growth with input size")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Memory per upload: streamed pipeline vs. the old read-everything path.
+
+Feeds N concurrent synthetic uploads through AudioUploader (local backend, so no
+network) and through a full in-memory read, sampling process RSS while they run.
+
+    python -m benchmarks.bench_upload_memory --uploads 8 --size-mb 20
+"""
+import argparse
+import asyncio
+import gc
+import os
+import resource
+import tempfile
+import time
+from unittest.mock import patch
+
+from app.core.config import config
+from app.services.upload_service import audio_uploader
+
+PAGE_SIZE = resource.getpagesize()
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+async def synthetic_body(size: int, piece: int = 64 * 1024):
+    """Mimics Request.stream(): the server hands us ~64 KiB pieces."""
+    block = os.urandom(piece)
+    sent = 0
+    while sent < size:
+        yield block[: min(piece, size - sent)]
+        sent += piece
+        await asyncio.sleep(0)
+
+
+async def read_everything(source):
+    """Old behavior: `content = await audio_file.read()` before writing it out."""
+    content = b""
+    async for chunk in source:
+        content += chunk
+    return len(content)
+
+
+async def sample_peak(stop: asyncio.Event, baseline: int, peak: list):
+    while not stop.is_set():
+        peak[0] = max(peak[0], current_rss() - baseline)
+        await asyncio.sleep(0.005)
+
+
+async def run(name, make_call, args):
+    gc.collect()
+    baseline = current_rss()
+    peak = [0]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_peak(stop, baseline, peak))
+    started = time.perf_counter()
+    size = int(args.size_mb * 1024 * 1024)
+    await asyncio.gather(*(make_call(synthetic_body(size)) for _ in range(args.uploads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    print(
+        f"{name:<12} uploads={args.uploads} size={args.size_mb}MB "
+        f"rss_growth={peak[0] / 1e6:8.1f}MB per_upload={peak[0] / args.uploads / 1e6:7.2f}MB "
+        f"time={elapsed:.2f}s"
+    )
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as directory, \
+            patch.object(config, "UPLOAD_BACKEND", "local"), \
+            patch.object(config, "UPLOAD_LOCAL_DIR", directory), \
+            patch.object(config, "UPLOAD_MAX_BYTES", 1 << 40):
+        await run("read-all", read_everything, args)
+        await run("streamed", audio_uploader.upload, args)
+    print(f"peak bytes buffered by one streamed upload: {audio_uploader.stats()['peak_buffered_bytes']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--size-mb", type=float, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,156 @@
+"""
+Local stand-ins for the AI providers, with configurable latency, for the benchmark suite.
+
+One HTTP server plays all three:
+
+  AssemblyAI  POST /v2/upload, POST /v2/transcript, GET /v2/transcript/{id}
+              (the app's own REST client is pointed here via ASSEMBLYAI_BASE_URL;
+              transcripts complete --transcribe-seconds after submission)
+  Gemini      POST /gemini/generate  {"prompt"} -> {"text"}
+  Google TTS  POST /tts/synthesize   {"text", "encoding"} -> audio bytes
+
+Gemini and Google TTS are gRPC SDKs in the app, so benchmarks.suite_server swaps their
+client objects for the thin HTTP shims below (FakeGeminiModel, FakeTTSClient), which
+keep the real call shapes: Gemini blocks a pool thread, TTS is awaited.
+
+    python -m benchmarks.fake_providers --port 9100 --gemini-ms 800 --tts-ms 300
+"""
+import argparse
+import asyncio
+import struct
+import time
+import uuid
+from typing import Any, Dict
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+SUGGESTION = (
+    "Start with the fundamentals, then build a small project.\n"
+    "1. **Crash course** https://www.youtube.com/watch?v=abcdefghijk\n"
+    "2. **Deep dive** https://www.youtube.com/watch?v=ZYXWVUTSRQP\n"
+)
+WAV_FMT = struct.pack("<HHIIHH", 1, 1, 24000, 48000, 2, 16)
+
+
+def fake_wav(text: str) -> bytes:
+    pcm = b"\0" * (len(text.encode("utf-8")) * 40)  # roughly speech-rate worth of samples
+    return b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVEfmt " + struct.pack("<I", 16) + WAV_FMT \
+        + b"data" + struct.pack("<I", len(pcm)) + pcm
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI()
+    transcripts: Dict[str, Dict[str, Any]] = {}
+
+    async def latency(ms: float):
+        if ms > 0:
+            await asyncio.sleep(ms / 1000)
+
+    @app.post("/v2/upload")
+    async def upload(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        await latency(args.assemblyai_ms)
+        return {"upload_url": f"https://cdn.fake/{uuid.uuid4().hex}?bytes={size}"}
+
+    @app.post("/v2/transcript")
+    async def submit(body: Dict[str, Any]):
+        await latency(args.assemblyai_ms)
+        transcript_id = uuid.uuid4().hex
+        transcripts[transcript_id] = {"created": time.monotonic(), "audio_url": body.get("audio_url")}
+        return {"id": transcript_id, "status": "queued"}
+
+    @app.get("/v2/transcript/{transcript_id}")
+    async def fetch(transcript_id: str):
+        await latency(args.assemblyai_ms)
+        entry = transcripts.get(transcript_id)
+        if entry is None:
+            return Response(status_code=404)
+        if time.monotonic() - entry["created"] < args.transcribe_seconds:
+            return {"id": transcript_id, "status": "processing"}
+        return {
+            "id": transcript_id,
+            "status": "completed",
+            "text": "Remember to buy milk and call the dentist tomorrow.",
+            "confidence": 0.93,
+            "audio_duration": 4.2,
+        }
+
+    @app.post("/gemini/generate")
+    async def generate(body: Dict[str, Any]):
+        await latency(args.gemini_ms)
+        return {"text": SUGGESTION if "learn" in body.get("prompt", "").lower() else body.get("prompt", "")[-200:]}
+
+    @app.post("/tts/synthesize")
+    async def synthesize(body: Dict[str, Any]):
+        await latency(args.tts_ms + args.tts_ms_per_kb * len(body.get("text", "").encode("utf-8")) / 1024)
+        return Response(content=fake_wav(body.get("text", "")), media_type="audio/wav")
+
+    return app
+
+
+# ---------------------------
+# SDK shims used inside the app process
+# ---------------------------
+class _Text:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Stands in for genai.GenerativeModel: a blocking call, like the real SDK."""
+
+    def __init__(self, base_url: str):
+        self._client = httpx.Client(base_url=base_url, timeout=120)
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        text = self._client.post("/gemini/generate", json={"prompt": prompt}).json()["text"]
+        if not stream:
+            return _Text(text)
+        return iter([_Text(text[i:i + 40]) for i in range(0, len(text), 40)])
+
+
+class _Audio:
+    def __init__(self, audio_content: bytes):
+        self.audio_content = audio_content
+
+
+class _Transport:
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class FakeTTSClient:
+    """Stands in for texttospeech.TextToSpeechAsyncClient."""
+
+    def __init__(self, base_url: str):
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=120)
+        self.transport = _Transport(self._client)
+
+    async def synthesize_speech(self, input, voice, audio_config):
+        response = await self._client.post("/tts/synthesize", json={"text": input.text})
+        response.raise_for_status()
+        return _Audio(response.content)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--assemblyai-ms", type=float, default=50.0, help="latency per AssemblyAI request")
+    parser.add_argument("--transcribe-seconds", type=float, default=1.0, help="time until a transcript completes")
+    parser.add_argument("--gemini-ms", type=float, default=800.0, help="latency per Gemini generation")
+    parser.add_argument("--tts-ms", type=float, default=150.0, help="fixed latency per TTS request")
+    parser.add_argument("--tts-ms-per-kb", type=float, default=300.0, help="TTS latency growth with input size")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args), host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,387 @@
+"""
+End-to-end benchmark suite: drives every router of the real app with concurrent load
+and reports req/s, p50/p95/p99 latency and server RSS per endpoint.
+
+Starts two local processes, benchmarks.fake_providers (AssemblyAI/Gemini/TTS with
+configurable latency) and benchmarks.suite_server (the app under uvicorn with
+mongomock-motor or --mongo-uri, and fakeredis), seeds data through the API, then runs
+each scenario in turn. Results go to a JSON file; --compare flags endpoints whose p95
+or req/s moved by more than --threshold against an earlier run (exit status 1).
+
+    python -m benchmarks.run_suite
+    python -m benchmarks.run_suite --only notes tasks --scale 2 --output before.json
+    python -m benchmarks.run_suite --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_gemini_load import percentile
+from benchmarks.fake_providers import add_arguments as add_provider_arguments
+
+PASSWORD = "bench-password-1"
+LONG_TEXT = " ".join(f"Sentence number {i} of the note being read aloud." for i in range(40))
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: int
+    concurrency: int
+    call: Callable[[httpx.AsyncClient, Dict[str, Any], Dict[str, Any], int], Awaitable[httpx.Response]]
+
+
+# ---------------------------
+# Processes
+# ---------------------------
+def spawn(module: str, *args: str) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    return subprocess.Popen([sys.executable, "-m", module, *args], env=env)
+
+
+async def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with status {process.returncode}")
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not start within {timeout}s")
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None  # not Linux, or the process is gone
+    return None
+
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+def auth(ctx) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {ctx['token']}"}
+
+
+async def login(client, ctx, state, i):
+    return await client.post("/auth/login", json={"email": ctx["email"], "password": PASSWORD})
+
+
+async def refresh(client, ctx, state, i):
+    # Refresh tokens rotate, so every worker follows its own chain; the logins that start
+    # the chains go one at a time so they don't trip the password pool's load shedding
+    if "refresh_token" not in state:
+        async with ctx["login_lock"]:
+            state["refresh_token"] = (await login(client, ctx, state, i)).json()["refresh_token"]
+    response = await client.post("/auth/refresh", json={"refresh_token": state["refresh_token"]})
+    if response.status_code == 200:
+        state["refresh_token"] = response.json()["refresh_token"]
+    return response
+
+
+async def note_create(client, ctx, state, i):
+    body = {"title": f"bench note {i}", "content": f"benchmark content {uuid.uuid4().hex}", "tags": ["bench"]}
+    return await client.post("/api/notes/", json=body, headers=auth(ctx))
+
+
+async def note_list(client, ctx, state, i):
+    return await client.get("/api/notes/", params={"limit": 50}, headers=auth(ctx))
+
+
+async def note_get(client, ctx, state, i):
+    return await client.get(f"/api/notes/{ctx['note_ids'][i % len(ctx['note_ids'])]}", headers=auth(ctx))
+
+
+async def note_update(client, ctx, state, i):
+    note_id = ctx["note_ids"][i % len(ctx["note_ids"])]
+    return await client.patch(f"/api/notes/{note_id}", json={"content": f"edited {i}"}, headers=auth(ctx))
+
+
+async def note_search(client, ctx, state, i):
+    query = ["groceries", "meeting notes", "project plan", "seed"][i % 4]
+    return await client.get("/api/notes/search", params={"q": query}, headers=auth(ctx))
+
+
+async def note_bulk(client, ctx, state, i):
+    operations = [{"op": "create", "data": {"title": f"bulk {i}-{n}", "content": "offline edit"}} for n in range(50)]
+    return await client.post("/api/notes/bulk", json={"operations": operations}, headers=auth(ctx))
+
+
+async def task_create(client, ctx, state, i):
+    return await client.post("/api/tasks/create", json={"description": f"call the dentist #{i}"}, headers=auth(ctx))
+
+
+async def task_list(client, ctx, state, i):
+    return await client.get("/api/tasks/", params={"limit": 50})
+
+
+async def task_get(client, ctx, state, i):
+    return await client.get(f"/api/tasks/{ctx['task_ids'][i % len(ctx['task_ids'])]}")
+
+
+async def task_status(client, ctx, state, i):
+    task_id = ctx["task_ids"][i % len(ctx["task_ids"])]
+    return await client.patch(f"/api/tasks/{task_id}/status", params={"status": ["pending", "done"][i % 2]})
+
+
+async def task_bulk(client, ctx, state, i):
+    operations = [{"op": "create", "data": {"description": f"bulk task {i}-{n}"}} for n in range(50)]
+    return await client.post("/api/tasks/bulk", json={"operations": operations}, headers=auth(ctx))
+
+
+async def speech_upload(client, ctx, state, i):
+    audio = os.urandom(32 * 1024)  # unique bytes: no dedup, a full upload + transcription each time
+    return await client.post("/api/speech/upload-and-transcribe", files={"audio_file": ("memo.wav", audio, "audio/wav")})
+
+
+async def speech_job(client, ctx, state, i):
+    response = await client.post("/api/speech/jobs", json={"audio_url": f"https://cdn.fake/{uuid.uuid4().hex}.wav"})
+    if response.status_code == 202:
+        response = await client.get(f"/api/speech/jobs/{response.json()['job_id']}")
+    return response
+
+
+async def learning_miss(client, ctx, state, i):
+    return await client.post("/api/learning/suggest", json={"user_input": f"learn topic {uuid.uuid4().hex}"})
+
+
+async def learning_hit(client, ctx, state, i):
+    return await client.post("/api/learning/suggest", json={"user_input": "learn rust for backend services"})
+
+
+async def tts_hit(client, ctx, state, i):
+    return await client.post("/api/tts/synthesize", json={"text": "You have three tasks due today."}, headers=auth(ctx))
+
+
+async def tts_miss(client, ctx, state, i):
+    return await client.post("/api/tts/synthesize", json={"text": f"Reminder number {i}: {uuid.uuid4().hex}."}, headers=auth(ctx))
+
+
+async def tts_stream(client, ctx, state, i):
+    text = f"{LONG_TEXT} Variant {uuid.uuid4().hex}."
+    return await client.post("/api/tts/synthesize/stream", json={"text": text}, headers=auth(ctx))
+
+
+async def root(client, ctx, state, i):
+    return await client.get("/")
+
+
+async def metrics(client, ctx, state, i):
+    return await client.get("/metrics")
+
+
+SCENARIOS = [
+    Scenario("root", 2000, 32, root),
+    Scenario("auth.login", 100, 8, login),
+    Scenario("auth.refresh", 500, 16, refresh),
+    Scenario("notes.create", 1000, 32, note_create),
+    Scenario("notes.list", 500, 32, note_list),
+    Scenario("notes.get", 2000, 32, note_get),
+    Scenario("notes.update", 500, 32, note_update),
+    Scenario("notes.search", 1000, 32, note_search),
+    Scenario("notes.bulk", 50, 4, note_bulk),
+    Scenario("tasks.create", 100, 16, task_create),
+    Scenario("tasks.list", 500, 32, task_list),
+    Scenario("tasks.get", 2000, 32, task_get),
+    Scenario("tasks.status", 500, 32, task_status),
+    Scenario("tasks.bulk", 50, 4, task_bulk),
+    Scenario("speech.upload", 50, 8, speech_upload),
+    Scenario("speech.job", 200, 16, speech_job),
+    Scenario("learning.miss", 40, 8, learning_miss),
+    Scenario("learning.hit", 500, 32, learning_hit),
+    Scenario("tts.hit", 1000, 32, tts_hit),
+    Scenario("tts.miss", 100, 16, tts_miss),
+    Scenario("tts.stream", 20, 4, tts_stream),
+    Scenario("metrics", 200, 4, metrics),
+]
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+async def seed(client: httpx.AsyncClient, ctx: Dict[str, Any]) -> None:
+    ctx["login_lock"] = asyncio.Lock()
+    ctx["email"] = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    response = await client.post("/auth/signup", json={"username": "bench", "email": ctx["email"], "password": PASSWORD})
+    response.raise_for_status()
+    ctx["token"] = (await login(client, ctx, {}, 0)).json()["access_token"]
+
+    topics = ["groceries", "meeting notes", "project plan", "travel", "reading list"]
+    notes = [{"op": "create", "data": {"title": f"seed {topics[n % 5]} {n}", "content": f"{topics[n % 5]} details {n}",
+                                       "tags": [topics[n % 5].split()[0]]}} for n in range(200)]
+    tasks = [{"op": "create", "data": {"description": f"seed task {n}", "priority": "high"}} for n in range(200)]
+    note_results = (await client.post("/api/notes/bulk", json={"operations": notes}, headers=auth(ctx))).json()
+    task_results = (await client.post("/api/tasks/bulk", json={"operations": tasks}, headers=auth(ctx))).json()
+    ctx["note_ids"] = [item["id"] for item in note_results["results"] if item["status"] == "created"]
+    ctx["task_ids"] = [item["id"] for item in task_results["results"] if item["status"] == "created"]
+
+
+async def run_scenario(client, scenario: Scenario, ctx, pid: int, scale: float) -> Dict[str, Any]:
+    total = max(1, int(scenario.requests * scale))
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining = iter(range(total))
+    rss = {"start": rss_mb(pid), "peak": rss_mb(pid)}
+
+    async def sample_rss():
+        while True:
+            current = rss_mb(pid)
+            if current and current > (rss["peak"] or 0):
+                rss["peak"] = current
+            await asyncio.sleep(0.05)
+
+    async def worker():
+        state: Dict[str, Any] = {}
+        for i in remaining:
+            started = time.perf_counter()
+            try:
+                response = await scenario.call(client, ctx, state, i)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+
+    ok = sum(count for status, count in statuses.items() if status.isdigit() and int(status) < 400)
+    return {
+        "name": scenario.name,
+        "requests": total,
+        "concurrency": scenario.concurrency,
+        "ok": ok,
+        "errors": total - ok,
+        "statuses": statuses,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+        "rss_start_mb": rss["start"] and round(rss["start"], 1),
+        "rss_peak_mb": rss["peak"] and round(rss["peak"], 1),
+        "rss_end_mb": rss_mb(pid) and round(rss_mb(pid), 1),
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['name']:<15} {result['rps']:9.1f} req/s  p50={result['p50_ms']:8.2f}ms  "
+        f"p95={result['p95_ms']:8.2f}ms  p99={result['p99_ms']:8.2f}ms  "
+        f"rss={result['rss_peak_mb']}MB  errors={result['errors']}"
+        + (f" {result['statuses']}" if result["errors"] else "")
+    )
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nvs {baseline_path} (threshold {threshold:.0%})")
+    for result in results:
+        before = baseline.get(result["name"])
+        if not before:
+            continue
+        rps_change = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        regressed = rps_change < -threshold or p95_change > threshold
+        regressions += regressed
+        print(
+            f"{result['name']:<15} req/s {rps_change:+7.1%}  p95 {p95_change:+7.1%}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args) -> int:
+    scenarios = [s for s in SCENARIOS if not args.only or any(s.name.startswith(prefix) for prefix in args.only)]
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    app_url = f"http://127.0.0.1:{args.port}"
+    provider_args = [
+        "--assemblyai-ms", str(args.assemblyai_ms), "--transcribe-seconds", str(args.transcribe_seconds),
+        "--gemini-ms", str(args.gemini_ms), "--tts-ms", str(args.tts_ms), "--tts-ms-per-kb", str(args.tts_ms_per_kb),
+    ]
+    server_args = ["--port", str(args.port), "--fake-url", fake_url] + (["--mongo-uri", args.mongo_uri] if args.mongo_uri else [])
+
+    providers = spawn("benchmarks.fake_providers", "--port", str(args.fake_port), *provider_args)
+    server = spawn("benchmarks.suite_server", *server_args)
+    results = []
+    try:
+        await wait_ready(fake_url + "/docs", providers)
+        await wait_ready(app_url + "/", server)
+        limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+        async with httpx.AsyncClient(base_url=app_url, timeout=120, limits=limits) as client:
+            ctx: Dict[str, Any] = {}
+            await seed(client, ctx)
+            for scenario in scenarios:
+                result = await run_scenario(client, scenario, ctx, server.pid, args.scale)
+                results.append(result)
+                print_result(result)
+    finally:
+        for process in (server, providers):
+            process.terminate()
+            process.wait(timeout=10)
+
+    output = args.output or os.path.join("benchmarks", "results", f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "git": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mongo": "mongod" if args.mongo_uri else "mongomock",
+                "args": {k: v for k, v in vars(args).items() if k not in ("compare", "output", "mongo_uri")},
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", help="scenario name prefixes, e.g. notes tts.hit")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario's request count")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--mongo-uri", help="scratch database for a real mongod instead of mongomock")
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change that counts as a regression")
+    add_provider_arguments(parser)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,72 @@
+"""
+Run the real app under uvicorn with local stand-ins, for benchmarks.run_suite:
+
+  Mongo      mongomock-motor (in memory), or a real mongod with --mongo-uri
+  Redis      fakeredis (in process)
+  Providers  benchmarks.fake_providers at --fake-url (AssemblyAI over HTTP;
+             Gemini and Google TTS through the SDK shims)
+
+    python -m benchmarks.suite_server --port 9200 --fake-url http://127.0.0.1:9100
+"""
+import argparse
+import os
+import tempfile
+
+
+def configure_environment(args, scratch: str) -> None:
+    """Settings are read from the environment when app.core.config is first imported."""
+    os.environ.update({
+        "MONGO_URI": args.mongo_uri or "mongodb://localhost:27017/lifeos_bench",
+        "REDIS_URL": "redis://fakeredis:6379/0",
+        "JWT_SECRET": "bench-secret",
+        "ASSEMBLYAI_API_KEY": "bench",
+        "ASSEMBLYAI_BASE_URL": f"{args.fake_url}/v2",
+        "GEMINI_API_KEY": "bench",
+        "GOOGLE_CLOUD_PROJECT_ID": "bench",
+        "GOOGLE_CLOUD_CREDENTIALS_PATH": "",
+        "UPLOAD_BACKEND": "assemblyai",
+        "TTS_CACHE_DIR": os.path.join(scratch, "tts_cache"),
+        "LOG_FILE": os.path.join(scratch, "app.log"),
+        "LOG_STDOUT": "false",
+        "TRANSCRIPTION_POLL_INITIAL_SECONDS": "0.2",
+        "TRANSCRIPTION_POLL_MAX_SECONDS": "1.0",
+    })
+    if not args.mongo_uri:
+        os.environ["NOTES_SEARCH_ENGINE"] = "memory"  # mongomock has no $text
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory(prefix="lifeos-bench-") as scratch:
+        configure_environment(args, scratch)
+        serve(args)
+
+
+def serve(args) -> None:
+    import fakeredis.aioredis
+    import uvicorn
+    from app.core import utils
+    from app.core.services import services
+    from app.main import app
+    from benchmarks.fake_providers import FakeGeminiModel, FakeTTSClient
+
+    if not args.mongo_uri:
+        from mongomock_motor import AsyncMongoMockClient
+
+        class MongoMockClient(AsyncMongoMockClient):
+            def get_default_database(self):
+                return self["lifeos_bench"]  # the base class returns an unwrapped (sync) database
+
+        services.set("mongo", MongoMockClient())
+    utils._redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    services.set("gemini", FakeGeminiModel(args.fake_url))
+    services.set("tts", FakeTTSClient(args.fake_url))
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--fake-url", default="http://127.0.0.1:9100")
+    parser.add_argument("--mongo-uri", help="use a real (scratch) database instead of mongomock")
+    main(parser.parse_args())
@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+from unittest.mock import AsyncMock, patch
+from app.core.executor import ExecutorBusyError
+from app.routers import auth
+from app.services import auth_service
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_on_the_pool():
+    hashed = await auth_service.hash_password("s3cret")
+    assert await auth_service.verify_password("s3cret", hashed)
+    assert not await auth_service.verify_password("wrong", hashed)
+    assert auth_service.password_executor.stats()["completed"] >= 3
+
+
+@pytest.mark.asyncio
+@patch("app.routers.auth.login_user", new_callable=AsyncMock, side_effect=ExecutorBusyError("full"))
+async def test_login_returns_503_with_retry_after_when_pool_is_full(mock_login):
+    with pytest.raises(HTTPException) as exc:
+        await auth.login({"email": "a@example.com", "password": "pw"})
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from unittest.mock import AsyncMock, patch
+from app.core import auth_utils
+from app.core.auth_utils import create_access_token, get_current_user
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_cached_until_exp():
+    token = create_access_token({"sub": "cached@example.com"})
+    with patch("app.core.auth_utils.verify_token", wraps=auth_utils.verify_token) as verify:
+        first = await get_current_user(_credentials(token))
+        second = await get_current_user(_credentials(token))
+    assert first == second
+    assert first["sub"] == "cached@example.com"
+    assert verify.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_rejected_and_not_cached():
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(_credentials("not-a-jwt"))
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+@patch("app.core.auth_utils.config.AUTH_DENYLIST_ENABLED", True)
+@patch("app.core.auth_utils.get_redis_client", new_callable=AsyncMock)
+async def test_denylisted_token_is_rejected_even_when_cached(mock_redis):
+    token = create_access_token({"sub": "revoked@example.com"})
+    mock_redis.return_value.exists = AsyncMock(return_value=0)
+    await get_current_user(_credentials(token))
+
+    mock_redis.return_value.exists = AsyncMock(return_value=1)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(_credentials(token))
+    assert exc.value.detail == "Token has been revoked"
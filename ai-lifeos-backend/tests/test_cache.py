@@ -0,0 +1,184 @@
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.cache import SWRCache, make_cache_key, normalize_text
+
+
+def test_normalize_text_ignores_case_whitespace_and_punctuation():
+    assert normalize_text("  Goroutines?! ") == "goroutines"
+    assert make_cache_key("ns", "Go  channels.") == make_cache_key("ns", "go channels")
+
+
+@pytest.mark.asyncio
+@patch("app.core.cache.get_redis_client", side_effect=ConnectionError("down"))
+async def test_concurrent_misses_are_coalesced(mock_redis):
+    cache = SWRCache(namespace="test", ttl=60, stale_ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"suggestion": "x"}
+
+    results = await asyncio.gather(*(cache.get_or_compute("Goroutines", compute) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == {"suggestion": "x"} for r in results)
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+@patch("app.core.cache.get_redis_client")
+async def test_stale_entry_is_served_and_refreshed(mock_redis):
+    stale = json.dumps({"value": {"suggestion": "old"}, "fresh_until": time.time() - 1})
+    mock_redis.return_value.get = AsyncMock(return_value=stale)
+    mock_redis.return_value.setex = AsyncMock(return_value=None)
+    cache = SWRCache(namespace="test", ttl=60, stale_ttl=60)
+
+    async def compute():
+        return {"suggestion": "new"}
+
+    result = await cache.get_or_compute("channels", compute)
+    await asyncio.sleep(0.01)
+
+    assert result == {"suggestion": "old"}
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["refreshes"] == 1
+    mock_redis.return_value.setex.assert_awaited_once()
+
+
+def test_codec_roundtrips_models_without_eval():
+    from app.core import codec
+    from app.models.schemas import TranscriptResponse
+
+    transcript = TranscriptResponse(transcript_id="t1", text="it's \"quoted\"", confidence=0.5, duration=1.0)
+    transcript_codec = codec.ModelCodec(TranscriptResponse)
+
+    assert transcript_codec.decode(transcript_codec.encode(transcript)) == transcript
+    assert transcript_codec.decode(transcript_codec.encode(transcript).decode()) == transcript
+
+
+def test_lru_cache_evicts_oldest_and_expires():
+    from app.core.cache import LRUCache
+
+    lru = LRUCache(max_items=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.stats()["evictions"] == 1
+
+    lru.ttl = 0
+    lru.set("d", 4)
+    assert lru.get("d") is None
+    assert lru.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.core.cache.get_redis_client", side_effect=ConnectionError("down"))
+async def test_two_tier_cache_reads_through_and_invalidates(mock_redis):
+    from app.core.cache import InvalidationBus, LRUCache, TwoTierCache
+
+    bus = InvalidationBus("test:invalidate")
+    cache = TwoTierCache("notes", LRUCache(max_items=10, ttl=60), redis_ttl=60, bus=bus)
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        return {"_id": "n1", "title": "Test"}
+
+    assert await cache.get_or_load("n1", loader) == {"_id": "n1", "title": "Test"}
+    assert await cache.get_or_load("n1", loader) == {"_id": "n1", "title": "Test"}
+    assert loads == 1
+
+    await cache.invalidate("n1")
+    await cache.get_or_load("n1", loader)
+    assert loads == 2
+
+    # A message from another worker drops the local copy
+    bus._handle(json.dumps({"worker": "other", "namespace": "notes", "keys": ["n1"]}))
+    assert cache.local.get("n1") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_slow_load_is_not_overwritten():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core.cache import InvalidationBus, LRUCache, TwoTierCache
+
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_client():
+        return redis_client
+
+    def worker():
+        bus = InvalidationBus("test:invalidate")
+        bus.publish = AsyncMock()
+        return TwoTierCache("notes", LRUCache(max_items=10, ttl=60), redis_ttl=60, bus=bus)
+
+    here, other = worker(), worker()
+    document = {"_id": "n1", "title": "old"}
+    loading = asyncio.Event()
+
+    async def slow_loader():
+        value = dict(document)  # read from Mongo before the update lands
+        loading.set()
+        await asyncio.sleep(0.05)
+        return value
+
+    async def update(cache):
+        await loading.wait()
+        document["title"] = "new"
+        await cache.invalidate("n1")
+        if cache is other:
+            here.drop_local(["n1"])  # what the bus delivers from the other worker
+
+    with patch("app.core.cache.get_redis_client", get_client):
+        # Invalidated by this worker, then by another one, while the loader ran
+        for writer in (here, other):
+            loading.clear()
+            document["title"] = "old"
+            loaded, _ = await asyncio.gather(here.get_or_load("n1", slow_loader), update(writer))
+            assert loaded["title"] == "old"  # the caller still gets what it read
+            assert here.local.get("n1") is None
+            assert await redis_client.get("notes:n1") is None
+
+        assert (await here.get_or_load("n1", slow_loader))["title"] == "new"
+        assert "new" in await redis_client.get("notes:n1")
+    assert here.stats()["redis"]["stale"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_the_redis_read_is_not_cached_locally():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core.cache import InvalidationBus, LRUCache, TwoTierCache
+
+    redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_client():
+        return redis_client
+
+    bus = InvalidationBus("test:invalidate")
+    bus.publish = AsyncMock()
+    cache = TwoTierCache("notes", LRUCache(max_items=10, ttl=60), redis_ttl=60, bus=bus)
+    await redis_client.set("notes:n1", '{"_id": "n1", "title": "old"}')
+    mget = redis_client.mget
+
+    async def slow_mget(*keys):
+        values = await mget(*keys)  # the old copy is read before the update lands
+        cache.drop_local(["n1"])  # what the bus delivers from the writing worker
+        return values
+
+    with patch("app.core.cache.get_redis_client", get_client), patch.object(redis_client, "mget", slow_mget):
+        loaded = await cache.get_or_load("n1", AsyncMock())
+
+    assert loaded["title"] == "old"
+    assert cache.local.get("n1") is None
+    assert cache.stats()["redis"]["stale"] == 1
@@ -10,3 +10,55 @@ async def test_insert_note():
         mock_insert.return_value.inserted_id = "abc123"
         note_id = await db_service.insert_note(note)
         assert note_id == "abc123"
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def __aiter__(self):
+        for doc in self._docs:
+            yield doc
+
+
+@pytest.mark.asyncio
+async def test_bulk_tasks_reports_per_item_results():
+    from bson import ObjectId
+    from app.models.schemas import BulkOperation
+
+    existing, missing = ObjectId(), ObjectId()
+    operations = [
+        BulkOperation(op="create", data={"description": "Buy milk"}),
+        BulkOperation(op="update", id=str(existing), data={"status": "done"}),
+        BulkOperation(op="delete", id=str(missing)),
+        BulkOperation(op="create", data={}),
+    ]
+    with patch("app.services.db_service.tasks_collection") as collection, \
+            patch("app.services.db_service.task_cache.invalidate_many", new_callable=AsyncMock):
+        collection.find.return_value = _Cursor([{"_id": existing}])
+        collection.bulk_write = AsyncMock()
+        response = await db_service.bulk_tasks(operations)
+
+    requests = collection.bulk_write.call_args.args[0]
+    assert len(requests) == 2
+    assert collection.bulk_write.call_args.kwargs["ordered"] is False
+    assert [r["status"] for r in response["results"]] == ["created", "updated", "not_found", "invalid"]
+    assert response["counts"] == {"created": 1, "updated": 1, "not_found": 1, "invalid": 1}
+
+
+@pytest.mark.asyncio
+async def test_bulk_tasks_rejects_missing_and_malformed_ids():
+    from app.models.schemas import BulkOperation
+
+    operations = [
+        BulkOperation(op="update", data={"status": "done"}),
+        BulkOperation(op="delete", id="not-an-object-id"),
+    ]
+    with patch("app.services.db_service.tasks_collection") as collection, \
+            patch("app.services.db_service.task_cache.invalidate_many", new_callable=AsyncMock):
+        collection.bulk_write = AsyncMock()
+        response = await db_service.bulk_tasks(operations)
+
+    collection.bulk_write.assert_not_called()
+    assert [r["status"] for r in response["results"]] == ["invalid", "invalid"]
+    assert all(r["error"].startswith("Invalid id") for r in response["results"])
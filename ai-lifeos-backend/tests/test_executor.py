@@ -0,0 +1,52 @@
+import asyncio
+import time
+import pytest
+from app.core.executor import BoundedExecutor, ExecutorBusyError, ExecutorTimeoutError
+
+
+def make_executor(**overrides):
+    params = dict(name="test", max_concurrency=2, max_queue=1, queue_timeout=0.5, call_timeout=1.0)
+    params.update(overrides)
+    return BoundedExecutor(**params)
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_block_event_loop():
+    executor = make_executor()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+    assert ticks == 5
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    executor = make_executor(max_concurrency=1, max_queue=1, queue_timeout=2.0)
+    running = asyncio.create_task(executor.run(time.sleep, 0.3))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(executor.run(time.sleep, 0.01))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ExecutorBusyError):
+        await executor.run(time.sleep, 0.01)
+
+    await asyncio.gather(running, queued)
+    assert executor.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_keeps_slot_until_thread_finishes():
+    executor = make_executor(max_concurrency=1, call_timeout=0.05)
+    with pytest.raises(ExecutorTimeoutError):
+        await executor.run(time.sleep, 0.2)
+    assert executor.stats()["in_flight"] == 1
+
+    await asyncio.sleep(0.25)
+    assert executor.stats()["in_flight"] == 0
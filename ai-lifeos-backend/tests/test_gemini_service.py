@@ -3,7 +3,7 @@ from unittest.mock import patch, AsyncMock
 from app.services.gemini_service import gemini_service
 
 @pytest.mark.asyncio
-@patch("app.services.gemini_service.model.generate_content")
+@patch("app.services.gemini_service.generate_content")
 @patch("app.services.gemini_service.get_redis_client")
 async def test_interpret_text(mock_redis, mock_gen):
     # Mock Redis
@@ -15,3 +15,18 @@ async def test_interpret_text(mock_redis, mock_gen):
 
     result = await gemini_service.interpret_text("Do something")
     assert result == "Interpreted task"
+
+
+def test_link_extractor_handles_urls_split_across_chunks():
+    from app.services.gemini_service import YouTubeLinkExtractor
+
+    extractor = YouTubeLinkExtractor()
+    extractor.feed("1. **Intro**\n   https://www.youtube.com/wat")
+    assert extractor.links == []
+    extractor.feed("ch?v=abcdefghijk\n2. **More** https://www.youtube.com/watch?v=")
+    assert extractor.links == ["https://www.youtube.com/watch?v=abcdefghijk"]
+    extractor.feed("ZYXWVUTSRQP")
+    assert extractor.finish() == [
+        "https://www.youtube.com/watch?v=abcdefghijk",
+        "https://www.youtube.com/watch?v=ZYXWVUTSRQP",
+    ]
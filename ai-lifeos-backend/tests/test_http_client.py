@@ -0,0 +1,77 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core import http_client
+from app.core.services import services
+
+
+def mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    with patch.multiple(http_client.config, HTTP_RETRIES=2, HTTP_RETRY_BACKOFF_SECONDS=0.001), \
+            patch.object(http_client, "_hosts", {}):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_idempotent_requests_retry_on_503_then_succeed():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503 if len(calls) < 3 else 200, json={"ok": True})
+
+    with services.override("http", mock_client(handler)):
+        response = await http_client.request("GET", "https://api.example.com/items/1")
+
+    assert response.status_code == 200
+    assert calls == ["GET", "GET", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_posts_are_not_retried_unless_asked():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(201)
+
+    with services.override("http", mock_client(handler)):
+        with pytest.raises(httpx.ConnectError):
+            await http_client.request("POST", "https://api.example.com/items", json={})
+        assert (await http_client.request("POST", "https://api.example.com/items", json={}, retry=True)).status_code == 201
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_limit():
+    active = peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200)
+
+    with patch.object(http_client.config, "HTTP_HOST_CONCURRENCY", {"slow.example.com": 2}), \
+            services.override("http", mock_client(handler)):
+        await asyncio.gather(*(http_client.request("GET", "https://slow.example.com/") for _ in range(6)))
+
+    assert peak == 2
+
+
+def test_retry_after_header_is_honoured_and_capped():
+    with patch.object(http_client.config, "HTTP_RETRY_MAX_BACKOFF_SECONDS", 5.0):
+        assert http_client.retry_delay(0, httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+        assert http_client.retry_delay(0, httpx.Response(429, headers={"Retry-After": "120"})) == 5.0
+        assert 0 <= http_client.retry_delay(3) <= 5.0
@@ -0,0 +1,31 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.db.index_manager import index_manager
+
+IXSCAN_PLAN = {"queryPlanner": {"winningPlan": {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}}
+COLLSCAN_PLAN = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+
+
+def _fake_db(plan):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.explain = AsyncMock(return_value=plan)
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return db
+
+
+@pytest.mark.asyncio
+async def test_check_query_plans_passes_when_indexed():
+    with patch("app.db.index_manager.db", _fake_db(IXSCAN_PLAN)):
+        assert await index_manager.check_query_plans() == {}
+
+
+@pytest.mark.asyncio
+async def test_check_query_plans_flags_nested_collscan():
+    with patch("app.db.index_manager.db", _fake_db(COLLSCAN_PLAN)):
+        problems = await index_manager.check_query_plans()
+    assert "user by email" in problems
+    assert problems["notes page"] == "COLLSCAN on notes"
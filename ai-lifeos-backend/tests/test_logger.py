@@ -0,0 +1,96 @@
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import httpx
+from loguru import logger
+
+from app.core import logger as log_module
+from app.core.logger import QueueSink, request_id_var
+from app.core.middleware import RequestIdMiddleware
+
+
+def test_queue_sink_writes_json_with_request_id(tmp_path):
+    path = tmp_path / "app.log"
+    sink = QueueSink(str(path), stdout=False, json_format=True, max_queue=100)
+    handler = logger.add(sink, format="{message}")
+    try:
+        token = request_id_var.set("req-1")
+        logger.patch(log_module._add_request_id).bind(user="a@b.c").info("hello")
+        request_id_var.reset(token)
+        assert sink.flush()
+    finally:
+        logger.remove(handler)
+        sink.close()
+
+    entry = json.loads(path.read_text().strip())
+    assert (entry["msg"], entry["level"], entry["request_id"]) == ("hello", "INFO", "req-1")
+    assert entry["extra"] == {"user": "a@b.c"}
+    assert sink.stats()["written"] == 1
+
+
+def test_sampling_drops_by_level_and_bound_rate():
+    kept = []
+    handler = logger.add(kept.append, format="{message}", filter=log_module._sample)
+    try:
+        with patch.object(log_module.config, "LOG_SAMPLE_RATES", {"DEBUG": 0.0}):
+            logger.debug("dropped")
+            logger.info("kept")
+            logger.bind(sample=0.0).info("dropped too")
+    finally:
+        logger.remove(handler)
+    assert [message.record["message"] for message in kept] == ["kept"]
+
+
+def test_request_id_middleware_echoes_or_generates():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(request_id_var.get())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=RequestIdMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            given = await client.get("/", headers={"X-Request-ID": "abc-123"})
+            bogus = await client.get("/", headers={"X-Request-ID": "bad id\nx"})
+        return given, bogus
+
+    given, bogus = asyncio.run(scenario())
+    assert given.headers["x-request-id"] == "abc-123" == seen[0]
+    assert bogus.headers["x-request-id"] == seen[1] != "bad id\nx"
+
+
+def test_workers_sharing_a_log_file_rotate_it_once(tmp_path):
+    path = tmp_path / "app.log"
+    day = ["2024-05-01"]
+
+    class Clock:
+        @staticmethod
+        def now():
+            return datetime.strptime(day[0], "%Y-%m-%d")
+
+    def write(sink, message):
+        sink._write([{"time": datetime.now(), "level": logger.level("INFO"), "message": message,
+                      "extra": {}, "exception": None, "name": "t", "function": "f", "line": 1}])
+
+    first = QueueSink(str(path), stdout=False, json_format=False, max_queue=10)
+    second = QueueSink(str(path), stdout=False, json_format=False, max_queue=10)
+    try:
+        with patch.object(log_module, "datetime", Clock):
+            write(first, "day one from first")
+            write(second, "day one from second")
+            day[0] = "2024-05-02"
+            write(first, "day two from first")
+            write(second, "day two from second")
+    finally:
+        first.close()
+        second.close()
+
+    archived = (tmp_path / "app.2024-05-01.log").read_text()
+    assert "day one from first" in archived and "day one from second" in archived
+    assert "day two" not in archived
+    current = path.read_text()
+    assert "day two from first" in current and "day two from second" in current
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.metrics import observe_db, track_external
+from app.main import app
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route_template():
+    labels = {"method": "GET", "route": "/", "status": "200"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    unmatched = sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/")
+            await client.get("/no/such/path")
+            return await client.get("/metrics")
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert "http_requests_in_flight" in response.text
+    assert sample("http_request_duration_seconds_count", **labels) == before + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") == unmatched + 1
+
+
+def test_db_and_external_errors_are_counted():
+    @observe_db
+    async def failing_operation():
+        raise RuntimeError("boom")
+
+    async def failing_call():
+        async with track_external("gemini", "test"):
+            raise ValueError("bad response")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(failing_operation())
+    with pytest.raises(ValueError):
+        asyncio.run(failing_call())
+
+    assert sample("db_operation_errors_total", operation="failing_operation") == 1
+    assert sample("db_operation_duration_seconds_count", operation="failing_operation") == 1
+    assert sample("external_call_errors_total", service="gemini", operation="test", error="ValueError") == 1
+
+
+def test_component_stats_are_internal_only():
+    moved = {
+        "learning.suggestion_cache": "/api/learning/cache/stats",
+        "speech.uploads": "/api/speech/upload/stats",
+        "notes.read_cache": "/api/notes/cache/stats",
+        "tasks.read_cache": "/api/tasks/cache/stats",
+        "notes.search": "/api/notes/search/stats",
+        "auth.password_pool": "/auth/password-pool/stats",
+        "auth.refresh_tokens": "/auth/refresh/stats",
+        "auth.token_cache": "/auth/token-cache/stats",
+        "tts.audio_cache": "/api/tts/cache/stats",
+    }
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/metrics/stats")
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert set(moved) <= set(response.json())
+    assert not {route.path for route in app.routes} & set(moved.values())
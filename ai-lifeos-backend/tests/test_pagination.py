@@ -0,0 +1,31 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from app.core.pagination import build_projection, decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_roundtrip():
+    doc = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1, 12, 30, 0, 123000)}
+    created_at, oid = decode_cursor(encode_cursor(doc))
+    assert created_at == doc["created_at"]
+    assert oid == doc["_id"]
+
+
+def test_invalid_cursor_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    doc = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1)}
+    query = keyset_filter({"status": "pending"}, encode_cursor(doc))
+    after = query["$and"][1]["$or"]
+    assert after[0] == {"created_at": {"$lt": doc["created_at"]}}
+    assert after[1] == {"created_at": doc["created_at"], "_id": {"$lt": doc["_id"]}}
+
+
+def test_projection_always_keeps_created_at_and_rejects_unknown_fields():
+    assert build_projection(["title"], {"title", "content"}) == {"title": 1, "created_at": 1}
+    assert build_projection(None, {"title"}) is None
+    with pytest.raises(ValueError):
+        build_projection(["password"], {"title"})
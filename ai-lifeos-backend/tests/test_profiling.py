@@ -0,0 +1,57 @@
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+pytest.importorskip("pyinstrument")
+
+from app.core import profiling
+from app.core.profiling import ProfileRing, ProfilingMiddleware
+
+
+def blocking_helper():
+    time.sleep(0.05)  # stands in for a sync SDK call on the event loop
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        blocking_helper()
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return app
+
+
+def test_header_triggers_collapsed_profile(tmp_path):
+    with patch.multiple(profiling.config, PROFILE_DIR=str(tmp_path), PROFILE_FORMAT="collapsed", PROFILE_TOKEN="s3cret"):
+        app = make_app()
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                plain = await client.get("/slow")
+                wrong = await client.get("/slow", headers={"X-Profile": "guess"})
+                profiled = await client.get("/slow", headers={"X-Profile": "s3cret"})
+            return plain, wrong, profiled
+
+        plain, wrong, profiled = asyncio.run(scenario())
+
+    assert "x-profile-file" not in plain.headers and "x-profile-file" not in wrong.headers
+    name = profiled.headers["x-profile-file"]
+    assert os.listdir(tmp_path) == [name]
+    stacks = (tmp_path / name).read_text()
+    assert any("blocking_helper" in line and "sleep" in line for line in stacks.splitlines())
+
+
+def test_profile_ring_keeps_newest(tmp_path):
+    ring = ProfileRing(str(tmp_path), max_files=2)
+    for i in range(4):
+        ring.write(f"{i}-profile.txt", "a;b 1\n")
+    assert sorted(os.listdir(tmp_path)) == ["2-profile.txt", "3-profile.txt"]
@@ -0,0 +1,26 @@
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.core.responses import ORJSONResponse
+from app.models.schemas import NoteOut
+
+
+def test_mongo_documents_render_in_one_step():
+    oid = ObjectId()
+    note = {"_id": oid, "title": "t", "tags": ["a"], "created_at": datetime(2024, 5, 1, 12, 30)}
+
+    body = json.loads(ORJSONResponse({"notes": [note], "next_cursor": None}).body)
+
+    assert body == {
+        "notes": [{"_id": str(oid), "title": "t", "tags": ["a"], "created_at": "2024-05-01T12:30:00"}],
+        "next_cursor": None,
+    }
+
+
+def test_note_out_documents_the_wire_shape():
+    note = NoteOut.model_validate({"_id": "abc", "title": "t"})
+
+    assert note.model_dump(by_alias=True, exclude_none=True) == {"_id": "abc", "title": "t"}
+    assert "_id" in NoteOut.model_json_schema(by_alias=True)["properties"]
@@ -0,0 +1,37 @@
+from bson import ObjectId
+from app.core.cache import InvalidationBus
+from app.services.search_service import InvertedIndexSearch, tokenize
+
+A, B, C = (str(ObjectId()) for _ in range(3))
+
+
+def _engine():
+    engine = InvertedIndexSearch(InvalidationBus("test:invalidate"), rebuild_seconds=3600)
+    engine.index_document({"_id": A, "title": "Python asyncio", "content": "event loops", "tags": ["code"]})
+    engine.index_document({"_id": B, "title": "Groceries", "content": "buy milk, then read about python", "tags": []})
+    engine.index_document({"_id": C, "title": "Trip", "content": "pack bags", "tags": ["travel"]})
+    return engine
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The Python, and asyncio!") == ["python", "asyncio"]
+
+
+def test_title_matches_rank_above_body_matches():
+    assert [note_id for note_id, _ in _engine().rank("python", None, 10)] == [A, B]
+
+
+def test_last_term_matches_as_prefix_and_tags_filter():
+    engine = _engine()
+    assert [note_id for note_id, _ in engine.rank("asyn", None, 10)] == [A]
+    assert [note_id for note_id, _ in engine.rank("python", ["code"], 10)] == [A]
+    assert engine.rank("python", ["travel"], 10) == []
+
+
+def test_reindexing_replaces_old_terms():
+    engine = _engine()
+    engine.index_document({"_id": B, "title": "Groceries", "content": "eggs", "tags": []})
+    assert [note_id for note_id, _ in engine.rank("python", None, 10)] == [A]
+    engine._remove(A)
+    assert engine.rank("python", None, 10) == []
+    assert "python" not in engine._vocab
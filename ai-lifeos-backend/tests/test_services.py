@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core import services as services_module
+from app.core.services import ServiceRegistry, ServiceUnavailableError
+
+
+def test_service_is_created_once_on_first_use():
+    registry = ServiceRegistry()
+    factory = MagicMock(return_value="client")
+    registry.register("thing", factory)
+
+    assert factory.call_count == 0
+    assert registry.get("thing") == "client"
+    assert registry.get("thing") == "client"
+    assert factory.call_count == 1
+
+
+def test_missing_settings_make_a_service_unavailable():
+    registry = ServiceRegistry()
+    factory = MagicMock()
+    registry.register("gemini", factory, requires=("GEMINI_API_KEY",))
+
+    with patch.object(services_module.config, "GEMINI_API_KEY", ""):
+        assert not registry.configured("gemini")
+        registry.warm(["gemini"])  # skipped, not an error
+        with pytest.raises(ServiceUnavailableError, match="GEMINI_API_KEY"):
+            registry.get("gemini")
+        with registry.override("gemini", "stand-in"):
+            assert registry.get("gemini") == "stand-in"
+    factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_close_runs_closers_for_created_services_only():
+    registry = ServiceRegistry()
+    closer = AsyncMock()
+    registry.register("created", lambda: "a", close=closer)
+    registry.register("unused", lambda: "b", close=closer)
+
+    registry.get("created")
+    await registry.close()
+
+    closer.assert_awaited_once_with("a")
+    assert registry.get("created") == "a"  # recreated on next use
+
+
+def test_app_imports_without_credentials_or_provider_sdks():
+    probe = (
+        "import json, sys; from app.main import app; "
+        "print(json.dumps({'sdks': [m for m in ('google.generativeai', 'google.cloud.texttospeech', 'motor.motor_asyncio') "
+        "if m in sys.modules], 'paths': [route.path for route in app.routes]}))"
+    )
+    env = dict(os.environ, ASSEMBLYAI_API_KEY="", GEMINI_API_KEY="", GOOGLE_CLOUD_PROJECT_ID="", LOG_STDOUT="false", LOG_FILE="")
+    result = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert loaded["sdks"] == []
+    assert "/api/notes/" in loaded["paths"]
+    assert not any(path.startswith(("/api/tts", "/api/learning", "/api/speech")) for path in loaded["paths"])
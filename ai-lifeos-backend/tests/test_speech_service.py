@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.models.schemas import TranscriptResponse
+from app.services import speech_service as speech_module
+from app.services.speech_service import SpeechService, TranscriptionPendingError, speech_service
+
+fakeredis = pytest.importorskip("fakeredis")
+
+TRANSCRIPT = TranscriptResponse(transcript_id="t1", text="Hello World", confidence=0.95, duration=5.0)
+
+
+@pytest.fixture
+def redis_client():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_client():
+        return client
+
+    with patch.object(speech_module, "get_redis_client", get_client), patch.dict(speech_module._hash_jobs, clear=True):
+        yield client
+
+
+@pytest.fixture
+def assemblyai():
+    """Stand-ins for the AssemblyAI submit call, job storage and the poller."""
+    jobs = {}
+
+    async def insert_job(job_id, job):
+        jobs[job_id] = {"_id": job_id, **job.dict()}
+        return jobs[job_id]
+
+    async def get_job(job_id):
+        return jobs.get(job_id)
+
+    async def submit(audio_url):
+        await asyncio.sleep(0.01)
+        return {"id": f"t-{len(jobs)}", "status": "queued"}
+
+    with patch.object(SpeechService, "_submit_transcript", AsyncMock(side_effect=submit)) as mock_submit, \
+            patch.object(speech_module.db_service, "insert_transcription_job", insert_job), \
+            patch.object(speech_module.db_service, "get_transcription_job", get_job), \
+            patch.object(speech_module.transcript_poller, "track") as mock_track:
+        yield mock_submit, mock_track, jobs
+
+
+@pytest.mark.asyncio
+async def test_submit_job_starts_polling_and_publishes_state(redis_client, assemblyai):
+    mock_submit, mock_track, jobs = assemblyai
+
+    job = await speech_service.submit_job("https://cdn.example.com/a.wav")
+
+    assert job["status"] == "queued" and job["_id"] in jobs
+    mock_submit.assert_awaited_once_with("https://cdn.example.com/a.wav")
+    mock_track.assert_called_once_with(job["_id"], job["transcript_id"])
+    assert (await speech_service.get_job(job["_id"]))["status"] == "queued"  # mirrored to Redis
+
+
+@pytest.mark.asyncio
+async def test_identical_audio_is_submitted_once(redis_client, assemblyai):
+    mock_submit, _, jobs = assemblyai
+
+    first, second = await asyncio.gather(
+        speech_service.submit_job("https://cdn.example.com/a.wav", content_hash="abc"),
+        speech_service.submit_job("https://cdn.example.com/a-copy.wav", content_hash="abc"),
+    )
+    third = await speech_service.submit_job("https://cdn.example.com/a.wav", content_hash="abc")
+
+    assert first["_id"] == second["_id"] == third["_id"]
+    assert mock_submit.await_count == 1 and len(jobs) == 1
+    assert await redis_client.get("transcript:inflight:abc") == first["_id"]
+
+
+@pytest.mark.asyncio
+async def test_known_audio_is_found_by_hash_and_cached(redis_client):
+    stored = {"_id": "x", "content_hash": "abc", **TRANSCRIPT.dict()}
+    with patch.object(speech_module.db_service, "get_transcript_by_hash", AsyncMock(return_value=stored)) as mock_db:
+        assert await speech_service.find_transcript_by_hash("abc") == TRANSCRIPT
+        assert await speech_service.find_transcript_by_hash("abc") == TRANSCRIPT
+    mock_db.assert_awaited_once_with("abc")
+
+
+@pytest.mark.asyncio
+async def test_wait_for_job_resolves_through_the_poller_or_by_rereading():
+    done = {"_id": "job1", "status": "completed", "result": TRANSCRIPT.dict(), "error": None}
+
+    with patch.object(speech_module.transcript_poller, "is_tracking", return_value=True), \
+            patch.object(speech_module.transcript_poller, "wait", AsyncMock(return_value=done)) as mock_wait:
+        job = await speech_service.wait_for_job("job1", timeout=5)
+    mock_wait.assert_awaited_once_with("job1", timeout=5)
+    assert (job["job_id"], job["status"], job["transcript"]) == ("job1", "completed", TRANSCRIPT.dict())
+
+    states = [{"job_id": "job2", "status": "processing"}, {"job_id": "job2", "status": "completed"}]
+    with patch.object(SpeechService, "get_job", AsyncMock(side_effect=states)), \
+            patch.object(speech_module.config, "TRANSCRIPTION_POLL_INITIAL_SECONDS", 0.01):
+        assert (await speech_service.wait_for_job("job2", timeout=5))["status"] == "completed"
+
+
+@pytest.mark.asyncio
+@patch.object(SpeechService, "get_job", new_callable=AsyncMock)
+async def test_slow_transcription_is_handed_back_as_a_job(mock_get_job):
+    mock_get_job.return_value = {"job_id": "job1", "status": "processing"}
+
+    with patch.multiple(
+        "app.services.speech_service.config", TRANSCRIPTION_WAIT_SECONDS=0.05, TRANSCRIPTION_POLL_INITIAL_SECONDS=0.01
+    ):
+        with pytest.raises(TranscriptionPendingError) as raised:
+            await SpeechService._await_transcript({"_id": "job1"})
+
+    assert raised.value.job_id == "job1"
+
+
+@pytest.mark.asyncio
+async def test_completed_transcript_is_stored_before_its_hash_is_released():
+    calls = []
+    job = {"_id": "job1", "audio_url": "https://cdn.example.com/a.wav", "content_hash": "abc"}
+    transcript = {"id": "t1", "status": "completed", "text": "Hello World", "confidence": 0.95, "audio_duration": 5.0}
+
+    with patch.object(speech_module.db_service, "get_transcription_job", AsyncMock(return_value=job)), \
+            patch.object(speech_module.db_service, "update_transcription_job", AsyncMock(return_value=None)), \
+            patch.object(SpeechService, "_store_transcript", AsyncMock(side_effect=lambda *a: calls.append("store"))), \
+            patch.object(SpeechService, "_release_hash", AsyncMock(side_effect=lambda *a: calls.append("release"))):
+        await SpeechService._on_transcript_update("job1", transcript)
+
+    assert calls == ["store", "release"]
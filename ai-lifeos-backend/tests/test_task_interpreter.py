@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.executor import ExecutorBusyError
+from app.services.task_interpreter import TaskInterpreter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_client():
+        return client
+
+    with patch("app.services.task_interpreter.get_redis_client", get_client):
+        yield client
+
+
+def make_interpreter(interpret, **overrides):
+    options = dict(
+        stream="tasks:interpret", group="interpreters", maxlen=1000,
+        concurrency=4, claim_idle_seconds=0.05, max_attempts=2, busy_retry_seconds=0.01,
+    )
+    options.update(overrides)
+    return TaskInterpreter(interpret=interpret, **options)
+
+
+async def drain(redis_client, interpreter, timeout=2.0):
+    """Run the worker until nothing is left pending in the group."""
+    interpreter.start()
+    try:
+        for _ in range(int(timeout / 0.02)):
+            await asyncio.sleep(0.02)
+            groups = await redis_client.xinfo_groups(interpreter.stream)
+            if groups and groups[0]["pending"] == 0 and groups[0]["last-delivered-id"] != "0-0":
+                return
+        raise AssertionError("interpretation queue did not drain")
+    finally:
+        await interpreter.stop()
+
+
+@pytest.mark.asyncio
+@patch("app.services.task_interpreter.db_service.complete_task_interpretation", new_callable=AsyncMock)
+@patch("app.services.task_interpreter.db_service.find_task", new_callable=AsyncMock)
+async def test_queued_task_is_interpreted_and_written_back(mock_find, mock_complete, redis_client):
+    mock_find.return_value = {"_id": "t1", "description": "dentist tmrw 3pm", "interpretation_status": "pending"}
+    mock_complete.return_value = True
+    interpret = AsyncMock(return_value="Go to the dentist tomorrow at 3pm")
+    interpreter = make_interpreter(interpret)
+
+    assert await interpreter.enqueue("t1")
+    await drain(redis_client, interpreter)
+
+    interpret.assert_awaited_once_with("dentist tmrw 3pm")
+    mock_complete.assert_awaited_once_with("t1", "dentist tmrw 3pm", "Go to the dentist tomorrow at 3pm")
+
+
+@pytest.mark.asyncio
+@patch("app.services.task_interpreter.db_service.set_task_interpretation_status", new_callable=AsyncMock)
+@patch("app.services.task_interpreter.db_service.find_task", new_callable=AsyncMock)
+async def test_failures_are_retried_then_marked_failed(mock_find, mock_status, redis_client):
+    mock_find.return_value = {"_id": "t1", "description": "x", "interpretation_status": "pending"}
+    interpret = AsyncMock(side_effect=RuntimeError("model down"))
+    interpreter = make_interpreter(interpret)
+
+    await interpreter.enqueue("t1")
+    await drain(redis_client, interpreter)
+
+    assert interpret.await_count == 2
+    mock_status.assert_awaited_once_with("t1", "failed")
+
+
+@pytest.mark.asyncio
+@patch("app.services.task_interpreter.db_service.set_task_interpretation_status", new_callable=AsyncMock)
+@patch("app.services.task_interpreter.db_service.find_task", new_callable=AsyncMock)
+async def test_busy_executor_does_not_use_up_attempts(mock_find, mock_status, redis_client):
+    mock_find.return_value = {"_id": "t1", "description": "x", "interpretation_status": "pending"}
+    interpret = AsyncMock(side_effect=[ExecutorBusyError("saturated"), RuntimeError("model down"), RuntimeError("model down")])
+    interpreter = make_interpreter(interpret)
+
+    await interpreter.enqueue("t1")
+    await drain(redis_client, interpreter)
+
+    assert interpret.await_count == 3  # the busy call plus both attempts
+    mock_status.assert_awaited_once_with("t1", "failed")
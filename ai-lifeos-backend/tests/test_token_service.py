@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch
+from app.services.token_service import token_service
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+    async def get_client():
+        return client
+
+    with patch("app.services.token_service.get_redis_client", get_client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_and_old_token_stops_working(redis_client):
+    token = await token_service.issue("user@example.com")
+    sub, rotated = await token_service.rotate(token)
+    assert sub == "user@example.com"
+    assert rotated != token
+
+    with pytest.raises(ValueError):
+        await token_service.rotate(token)
+    assert (await token_service.rotate(rotated))[0] == "user@example.com"
+
+
+@pytest.mark.asyncio
+@patch("app.services.token_service.config.REFRESH_TOKEN_REUSE_GRACE_SECONDS", -1)
+async def test_reusing_a_rotated_token_revokes_the_family(redis_client):
+    token = await token_service.issue("user@example.com")
+    _, rotated = await token_service.rotate(token)
+
+    with pytest.raises(ValueError):
+        await token_service.rotate(token)  # replayed by an attacker
+    with pytest.raises(ValueError):
+        await token_service.rotate(rotated)  # the legitimate client is logged out too
+
+
+@pytest.mark.asyncio
+async def test_logout_all_sessions(redis_client):
+    first = await token_service.issue("user@example.com")
+    second = await token_service.issue("user@example.com")
+    assert await token_service.revoke(first, all_sessions=True)
+    with pytest.raises(ValueError):
+        await token_service.rotate(second)
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.transcript_poller import TranscriptPoller
+
+
+@pytest.mark.asyncio
+@patch("app.services.transcript_poller.db_service.update_transcription_job", new_callable=AsyncMock)
+@patch("app.services.transcript_poller.db_service.claim_orphaned_transcription_jobs", new_callable=AsyncMock)
+async def test_poller_backs_off_and_resolves_waiters(mock_claim, mock_update):
+    mock_claim.return_value = []
+    statuses = {"t1": ["queued", "processing", "processing", "completed"], "t2": ["error"]}
+    polls = []
+
+    async def fetch_status(transcript_id):
+        polls.append(transcript_id)
+        return {"id": transcript_id, "status": statuses[transcript_id].pop(0)}
+
+    async def on_update(job_id, transcript):
+        return {"_id": job_id, "status": transcript["status"]}
+
+    poller = TranscriptPoller(
+        fetch_status=fetch_status,
+        on_update=on_update,
+        initial_delay=0.01,
+        max_delay=0.05,
+        backoff=2.0,
+        concurrency=4,
+        lease_seconds=60,
+    )
+    poller.track("job1", "t1")
+    poller.track("job2", "t2")
+
+    first, second = await asyncio.gather(poller.wait("job1", timeout=2), poller.wait("job2", timeout=2))
+    await poller.stop()
+
+    assert first["status"] == "completed"
+    assert second["status"] == "error"
+    assert polls.count("t1") == 4
+    assert poller.stats() == {"pending": 0, "polling": 0, "waiters": 0}
+
+
+@pytest.mark.asyncio
+@patch("app.services.transcript_poller.db_service.update_transcription_job", new_callable=AsyncMock)
+@patch("app.services.transcript_poller.db_service.claim_orphaned_transcription_jobs", new_callable=AsyncMock)
+async def test_hung_fetch_does_not_hold_up_other_jobs(mock_claim, mock_update):
+    mock_claim.return_value = []
+    statuses = {"fast": ["queued", "processing", "completed"]}
+
+    async def fetch_status(transcript_id):
+        if transcript_id == "hung":
+            await asyncio.Event().wait()
+        return {"id": transcript_id, "status": statuses[transcript_id].pop(0)}
+
+    async def on_update(job_id, transcript):
+        return {"_id": job_id, "status": transcript["status"]}
+
+    poller = TranscriptPoller(
+        fetch_status=fetch_status,
+        on_update=on_update,
+        initial_delay=0.01,
+        max_delay=0.02,
+        backoff=2.0,
+        concurrency=4,
+        lease_seconds=60,
+    )
+    poller.track("job1", "hung")
+    poller.track("job2", "fast")
+
+    job = await poller.wait("job2", timeout=1)
+    assert job["status"] == "completed"
+    assert poller.stats()["pending"] == 1
+    await poller.stop()
@@ -1,10 +1,122 @@
+import asyncio
+import os
+import struct
 import pytest
-from unittest.mock import patch, MagicMock
-from app.services.tts_service import tts_service
+from unittest.mock import patch, MagicMock, AsyncMock
+from app.core.services import services
+from app.services import tts_service as tts_module
+from app.services.tts_service import tts_service, AudioCache, parse_wav, split_sentences, wav_header
 
 def test_synthesize_speech():
     # Patch the client
-    with patch("app.services.tts_service.client") as mock_client:
-        mock_client.synthesize_speech.return_value.audio_content = b"audio bytes"
-        audio = tts_service.synthesize_speech("Hello World")
+    with services.override("tts", MagicMock()) as mock_client:
+        mock_client.synthesize_speech = AsyncMock(return_value=MagicMock(audio_content=b"audio bytes"))
+        audio = asyncio.run(tts_service.synthesize_speech("Hello World"))
         assert audio == b"audio bytes"
+        voice = mock_client.synthesize_speech.call_args.kwargs["voice"]
+        assert voice.language_code == "en-US"
+
+
+def test_synthesize_to_file_caches_by_content(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=1024 * 1024)
+    synthesize = AsyncMock(return_value=b"RIFF....")
+
+    async def scenario():
+        first = await tts_service.synthesize_to_file("Water the plants", encoding="LINEAR16")
+        second = await tts_service.synthesize_to_file("Water the plants", encoding="LINEAR16")
+        other = await tts_service.synthesize_to_file("Water the plants", encoding="MP3")
+        return first, second, other
+
+    with patch.object(tts_module, "audio_cache", cache), \
+            patch.object(tts_module.TTSService, "synthesize_speech", synthesize):
+        (path, cached), (again, cached_again), (mp3, _) = asyncio.run(scenario())
+
+    assert (cached, cached_again) == (False, True)
+    assert path == again and path.endswith(".wav") and mp3.endswith(".mp3")
+    assert synthesize.await_count == 2
+    with open(path, "rb") as f:
+        assert f.read() == b"RIFF...."
+
+
+def test_audio_cache_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+
+    async def scenario():
+        for name in ("a", "b"):
+            await cache.store(AudioCache.key(name, "v", "MP3"), "MP3", b"x" * 100)
+        old = os.path.getmtime(cache.path(AudioCache.key("a", "v", "MP3"), "MP3")) - 10
+        os.utime(cache.path(AudioCache.key("b", "v", "MP3"), "MP3"), (old, old))  # "b" is now oldest
+        await cache.store(AudioCache.key("c", "v", "MP3"), "MP3", b"x" * 100)
+
+    asyncio.run(scenario())
+    assert cache.lookup(AudioCache.key("b", "v", "MP3"), "MP3") is None
+    assert cache.lookup(AudioCache.key("a", "v", "MP3"), "MP3")
+    assert cache.lookup(AudioCache.key("c", "v", "MP3"), "MP3")
+    assert cache.stats()["total_bytes"] == 200
+
+
+def make_wav(pcm: bytes, rate: int = 24000) -> bytes:
+    fmt = struct.pack("<HHIIHH", 1, 1, rate, rate * 2, 2, 16)
+    return wav_header(fmt, len(pcm)) + pcm
+
+
+def test_split_sentences_packs_within_limit():
+    text = "First one. Second sentence here! Third? " + "word " * 60
+    chunks = split_sentences(text, max_bytes=50)
+    assert chunks[0] == "First one."
+    assert chunks[1] == "Second sentence here! Third?"
+    assert all(len(chunk.encode("utf-8")) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_stream_long_speech_stitches_chunks_in_order():
+    in_flight, peak = 0, 0
+
+    async def fake_chunk(text, voice_name):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 if text.startswith("One") else 0)
+        in_flight -= 1
+        return parse_wav(make_wav(text.encode()))
+
+    async def collect():
+        return b"".join([part async for part in tts_service.stream_long_speech("One. Two. Three. Four. Five. Six.")])
+
+    with patch.object(tts_module.TTSService, "_chunk_pcm", fake_chunk), \
+            patch.object(tts_module.config, "TTS_CHUNK_MAX_BYTES", 5), \
+            patch.object(tts_module.config, "TTS_CHUNK_CONCURRENCY", 2):
+        wav = asyncio.run(collect())
+
+    fmt, pcm = parse_wav(wav)
+    assert pcm.startswith(b"One.Two.Three.Four.Five.Six.")  # streaming size: data runs to EOF
+    assert struct.unpack("<I", wav[40:44])[0] == tts_module.STREAMING_SIZE
+    assert peak == 2
+
+
+def test_audio_evicted_before_it_is_read_is_synthesized_again(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=1024 * 1024)
+    synthesize = AsyncMock(return_value=b"RIFF....")
+    lookup = cache.lookup
+
+    def evicting_lookup(key, encoding):
+        path = lookup(key, encoding)
+        if path and synthesize.await_count == 1:
+            os.remove(path)  # another worker evicts it right after this one found it
+        return path
+
+    async def scenario():
+        await tts_service.synthesize_to_file("Water the plants", encoding="LINEAR16")
+        _, f, cached = await tts_service.open_audio("Water the plants", encoding="LINEAR16")
+        try:
+            return await f.read(), cached
+        finally:
+            await f.close()
+
+    with patch.object(tts_module, "audio_cache", cache), \
+            patch.object(cache, "lookup", evicting_lookup), \
+            patch.object(tts_module.TTSService, "synthesize_speech", synthesize):
+        data, cached = asyncio.run(scenario())
+
+    assert data == b"RIFF...." and cached is False
+    assert synthesize.await_count == 2
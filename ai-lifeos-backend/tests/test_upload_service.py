@@ -0,0 +1,37 @@
+import pytest
+from app.services.upload_service import ChunkPipe, UploadTooLargeError
+
+
+async def pieces(*sizes):
+    for size in sizes:
+        yield b"a" * size
+
+
+async def collect(pipe):
+    return [block async for block in pipe]
+
+
+@pytest.mark.asyncio
+async def test_chunk_pipe_emits_fixed_size_blocks():
+    pipe = ChunkPipe(pieces(3, 5, 9), chunk_size=4, max_bytes=100)
+    blocks = await collect(pipe)
+
+    assert [len(b) for b in blocks] == [4, 4, 4, 4, 1]
+    assert pipe.total_bytes == 17
+    assert pipe.peak_buffered < 4 + 9
+
+
+@pytest.mark.asyncio
+async def test_chunk_pipe_rejects_oversized_uploads():
+    pipe = ChunkPipe(pieces(60, 60), chunk_size=16, max_bytes=100)
+    with pytest.raises(UploadTooLargeError):
+        await collect(pipe)
+
+
+@pytest.mark.asyncio
+async def test_chunk_pipe_hashes_content_incrementally():
+    import hashlib
+
+    pipe = ChunkPipe(pieces(3, 5, 9), chunk_size=4, max_bytes=100)
+    await collect(pipe)
+    assert pipe.sha256 == hashlib.sha256(b"a" * 17).hexdigest()